@@ -1,7 +1,29 @@
 
-from dnac.xauthtoken import XAuthToken
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+from types import MappingProxyType
+from dnac.xauthtoken import XAuthToken, \
+                            DEFAULT_TOKEN_LIFETIME, \
+                            DEFAULT_REFRESH_MARGIN
 from dnac.basicauth import BasicAuth
 from dnac.ctype import CType
+from dnac.connectionpool import ConnectionPool, \
+                               DEFAULT_POOL_SIZE, \
+                               DEFAULT_KEEP_ALIVE, \
+                               DEFAULT_MAX_RETRIES, \
+                               DEFAULT_ASYNC_WORKERS
+from dnac.ratelimiter import RateLimiter
+from dnac.retrypolicy import DEFAULT_RETRY_POLICY
+from dnac.codec import DEFAULT_CODEC
+from dnac.hooks import Hooks
+from dnac.metrics import ClusterMetrics
+from dnac.registry import ApiRegistry
+from dnac.routes import RouteTable, \
+                        SUPPORTED_DNAC_VERSIONS
+from dnac.capabilities import AUTO_VERSION, \
+                              DEFAULT_CAPABILITY_CACHE, \
+                              Capabilities, \
+                              detect_capabilities
 from dnac.dnac_config import DNAC_NAME, \
                              DNAC_IP, \
                              DNAC_VERSION, \
@@ -13,11 +35,15 @@ from dnac.dnac_config import DNAC_NAME, \
 __version__ = '1.3.1.4'
 __author__ = 'Robert Sayle <rsayle@cisco.com>'
 __all__ = [
+    'asynccrud',
     'basicauth',
+    'capabilities',
     'client',
+    'codec',
     'commandrunner',
     'commandrunner_task',
     'config_archive',
+    'connectionpool',
     'crud',
     'ctype',
     'deployment',
@@ -26,21 +52,31 @@ __all__ = [
     'dnac_config',
     'dnacapi',
     'file',
+    'hooks',
+    'inventory',
+    'jsonstream',
     '__init__',
+    'metrics',
     'networkdevice',
     'project',
+    'projection',
+    'ratelimiter',
+    'records',
+    'registry',
+    'retrypolicy',
+    'routes',
     'site',
     'site_hierarchy',
     'task',
     'template',
     'timestamp',
+    'tokencache',
     'version',
     'xauthtoken'
 ]
 
 # globals
 MODULE = 'dnac'
-SUPPORTED_DNAC_VERSIONS = ['1.2.8', '1.2.10', '1.3.0.2', '1.3.0.3', '1.3.1.3', '1.3.1.4']
 
 # Dnac errors
 UNKNOWN_ERROR = 'Unknown error'
@@ -48,6 +84,8 @@ UNSUPPORTED_DNAC_VERSION = 'Unsupported Cisco DNA Center version'
 NO_DNAC_PATH = ''
 NO_DNAC_PATH_ERROR = 'No path to the Cisco DNA Center cluster'
 NO_DNAC_PATH_RESOLUTION = 'Set an FQDN or IP address for Cisco DNA Center in dnac_config.py'
+CONNECT_ALL_FAILED = 'Could not log into Cisco DNA Center'
+NO_HDRS = (None, MappingProxyType({}), {})  # token version, headers, extended headers
 
 # Dnac exception class - all others inherit from this one
 
@@ -84,6 +122,8 @@ class Dnac(object):
 
     Upon instantiation, a Dnac object uses the values in the config file to perform the initial login, retrieve an
     XAuth token from Cisco DNAC, sets the content type for responses, and creates a base URL for issuing API calls.
+    A Dnac object created with lazy=True postpones the login until its first API call, or until connect or
+    connect_all is called.
 
     Dnac objects store DnacApi objects in its api dictionary.  Do not create a DnacApi object.  Instead, instantiate
     the API objects that inherit from the DnacApi class.  When creating a DnacApi child object, give it a friendly name
@@ -95,6 +135,11 @@ class Dnac(object):
             str: The version Cisco DNAC software running on the cluster.
             default: DNAC_VERSION
             scope: protected
+        capabilities:
+            Capabilities object: The cluster's release and which routes
+                                 and features its version has.
+            default: The capabilities of version.
+            scope: protected
         name:
             str: The FQDN used to reach the Cisco DNAC cluster.
             default: DNAC_NAME
@@ -108,6 +153,11 @@ class Dnac(object):
             int: The TCP port for communicating with Cisco DNAC.
             default: DNAC_PORT
             scope: protected
+        routes:
+            RouteTable object: The resource paths and URLs of the APIs
+                               available in the cluster's version.
+            default: The routes for version.
+            scope: protected
         ctype:
             Ctype object: The content type for API responses.
             default: DNAC_CONTENT_TYPE
@@ -128,12 +178,48 @@ class Dnac(object):
         xauth:
             XAuthToken object: The x-auth-token for authorizing API calls
                                after performing a basic authentication.
+                               It is renewed shortly before it expires.
             default: An x-auth-token retrieved from Cisco DNAC when logging
                      in with a basic authentication.
             scope: protected
+        pool:
+            ConnectionPool object: The keep-alive connections shared by the
+                                   XAuthToken and every DnacApi object.
+            default: A ConnectionPool built from pool_size, keep_alive,
+                     max_retries and async_workers.
+            scope: protected
+        limiter:
+            RateLimiter object: Paces the API calls of every DnacApi object
+                                so the cluster's per-endpoint limits hold.
+            default: A RateLimiter using DEFAULT_RATE_LIMITS.
+            scope: protected
+        retry_policy:
+            RetryPolicy object: How DnacApi objects retry API calls that
+                                fail with a transient error.  None disables
+                                retries.
+            default: DEFAULT_RETRY_POLICY
+            scope: protected
+        codec:
+            JsonCodec object: Decodes API responses and encodes request
+                              bodies using the fastest JSON library
+                              installed.
+            default: DEFAULT_CODEC
+            scope: protected
+        hooks:
+            Hooks object: The RequestHooks observing every API call, e.g. a
+                          HistogramCollector.
+            default: No hooks.
+            scope: protected
+        metrics:
+            ClusterMetrics object: Records the cluster's API traffic in a
+                                   MetricsRegistry.
+            default: None
+            scope: protected
         api:
-            dict: The DnacApi store for referencing API calls.
-            default: {}
+            ApiRegistry object: The DnacApi store for referencing API calls.
+                                Task, File and Deployment objects are held
+                                weakly; see registry.py.
+            default: An empty ApiRegistry.
             scope: protected
 
     Usage:
@@ -149,6 +235,11 @@ class Dnac(object):
 
         # That's it!  Now wasn't that easier than constructing the API
         # call yourself?
+
+        # Release the cluster connections when finished, or let a with
+        # statement do it:
+        with Dnac() as d:
+            pprint.PrettyPrint(NetworkDevice(d, 'aNetworkDevice').get_all_devices())
     """
 
     def __init__(self,
@@ -158,7 +249,23 @@ class Dnac(object):
                  port=DNAC_PORT,
                  user=DNAC_USER,
                  passwd=DNAC_PASSWD,
-                 content_type=DNAC_CONTENT_TYPE):
+                 content_type=DNAC_CONTENT_TYPE,
+                 pool_size=DEFAULT_POOL_SIZE,
+                 keep_alive=DEFAULT_KEEP_ALIVE,
+                 max_retries=DEFAULT_MAX_RETRIES,
+                 async_workers=DEFAULT_ASYNC_WORKERS,
+                 rate_limits=None,
+                 retry_policy=DEFAULT_RETRY_POLICY,
+                 token_lifetime=DEFAULT_TOKEN_LIFETIME,
+                 token_refresh_margin=DEFAULT_REFRESH_MARGIN,
+                 auto_refresh_token=True,
+                 token_cache=None,
+                 lazy=False,
+                 codec=DEFAULT_CODEC,
+                 hooks=None,
+                 metrics=None,
+                 api_policies=None,
+                 capability_cache=DEFAULT_CAPABILITY_CACHE):
         """
         Dnac's __init__ method creates a new Dnac object based upon the values of the constants in dnac_config.py.
         This is the preferred way to control Dnac's configuration, but if desired, each one can be overridden using
@@ -167,7 +274,8 @@ class Dnac(object):
         __init__ also performs the initial login to the Cisco DNA Center cluster and gets an authorization token for
         subsequent API calls.
 
-        :param version: The version Cisco DNAC software running on the cluster.
+        :param version: The version Cisco DNAC software running on the cluster, or AUTO_VERSION to ask the cluster.
+                        A detected release that is not supported uses the newest supported version before it.
             type: str
             default: DNAC_VERSION
             required: no
@@ -195,8 +303,83 @@ class Dnac(object):
             type: str
             default: DNAC_CONTENT_TYPE
             required: no
+        :param pool_size: The maximum number of connections kept open to the cluster.
+            type: int
+            default: DEFAULT_POOL_SIZE
+            required: no
+        :param keep_alive: A flag indicating whether or not connections to the cluster are reused between API calls.
+            type: bool
+            default: DEFAULT_KEEP_ALIVE
+            required: no
+        :param max_retries: The number of times to retry a request whose connection to the cluster fails.
+            type: int
+            default: DEFAULT_MAX_RETRIES
+            required: no
+        :param async_workers: The number of threads that run the blocking requests of the *_async methods, and so the
+                              most of their API calls in flight at once.  Raise pool_size along with it.
+            type: int
+            default: DEFAULT_ASYNC_WORKERS
+            required: no
+        :param rate_limits: The requests per minute allowed for each API endpoint family, e.g. {'site': 1000}.
+            type: dict
+            default: DEFAULT_RATE_LIMITS in ratelimiter.py
+            required: no
+        :param retry_policy: The policy new DnacApi objects follow when an API call fails with a transient error, such
+                             as a 503.  Use None to turn retries off.
+            type: RetryPolicy object
+            default: DEFAULT_RETRY_POLICY in retrypolicy.py
+            required: no
+        :param token_lifetime: The number of seconds the cluster's x-auth-tokens remain valid.
+            type: int
+            default: DEFAULT_TOKEN_LIFETIME
+            required: no
+        :param token_refresh_margin: The number of seconds before expiry to renew the x-auth-token.
+            type: int
+            default: DEFAULT_REFRESH_MARGIN
+            required: no
+        :param auto_refresh_token: A flag indicating whether or not to renew the x-auth-token in the background.  When
+                                   False, the token is renewed by the first API call made after it is due.
+            type: bool
+            default: True
+            required: no
+        :param token_cache: A cache of x-auth-tokens shared with other processes.  When given, a valid token cached by
+                            an earlier script is reused instead of logging in again.
+            type: TokenCache object
+            default: None
+            required: no
+        :param lazy: A flag indicating whether or not to put off logging into the cluster until the first API call.
+            type: bool
+            default: False
+            required: no
+        :param codec: The JSON codec for API responses and request bodies, e.g. JsonCodec('json') to use the standard
+                      library even when a faster one is installed.
+            type: JsonCodec object
+            default: DEFAULT_CODEC in codec.py
+            required: no
+        :param hooks: Objects observing every API call, e.g. a HistogramCollector.  More can be added later through
+                      the hooks attribute.
+            type: list of RequestHook objects
+            default: None
+            required: no
+        :param metrics: A registry in which to record the cluster's API traffic for a Prometheus scrape.  Several Dnac
+                        objects may share one registry.
+            type: MetricsRegistry object
+            default: None
+            required: no
+        :param api_policies: How long the api store holds each type of DnacApi object, by class name, e.g.
+                             {'Version': RegistryPolicy(LRU, max_size=500, ttl=3600)}.  These are merged over
+                             DEFAULT_API_POLICIES in registry.py, which holds Task, File and Deployment objects weakly.
+            type: dict of RegistryPolicy objects
+            default: None
+            required: no
+        :param capability_cache: Where to keep the capability maps of clusters whose version is detected, so that the
+                                 cluster is not asked every time.  Use None to always ask.  Detecting the version logs
+                                 into the cluster even if lazy is set, unless its capability map is cached.
+            type: CapabilityCache object
+            default: DEFAULT_CAPABILITY_CACHE in capabilities.py, i.e. ~/.dnac/capabilities.json
+            required: no
         """
-        if version in SUPPORTED_DNAC_VERSIONS:
+        if version in SUPPORTED_DNAC_VERSIONS or version == AUTO_VERSION:
             self.__version = version
         else:
             raise DnacError('%s: %s' % (UNSUPPORTED_DNAC_VERSION, version))
@@ -209,18 +392,71 @@ class Dnac(object):
         self.__user = user
         self.__passwd = passwd
         self.__bauth = BasicAuth(self.__user, self.__passwd)
+        # share one set of keep-alive connections among all API calls
+        self.__pool = ConnectionPool(pool_size=pool_size,
+                                     keep_alive=keep_alive,
+                                     max_retries=max_retries,
+                                     async_workers=async_workers)
+        # pace all API calls to stay within the cluster's limits
+        self.__limiter = RateLimiter(rate_limits)
+        # retry transient failures so long jobs are not cut short
+        self.__retry_policy = retry_policy
+        self.__codec = codec
+        # observe API calls, e.g. to profile bulk jobs
+        self.__hooks = Hooks(hooks)
         self.__xauth = XAuthToken(self.url,
                                   self.__bauth,
-                                  content_type=self.__ctype)
+                                  content_type=self.__ctype,
+                                  pool=self.__pool,
+                                  lifetime=token_lifetime,
+                                  refresh_margin=token_refresh_margin,
+                                  auto_refresh=auto_refresh_token,
+                                  cache=token_cache)
         # get an authorization token for all API calls
-        self.__xauth.get_token()
-        # create the store for all API instances
-        self.__api = {}
+        if not lazy:
+            self.connect()
+        # record the cluster's traffic for scraping
+        if metrics is not None:
+            self.__metrics = ClusterMetrics(metrics, self)
+            self.__hooks.add(self.__metrics)
+        else:
+            self.__metrics = None
+        # create the store for all API instances, letting go of short-lived ones
+        self.__api = ApiRegistry(api_policies)
         # add a placeholder for the site hierarchy
         self.__site_hierarchy = None
+        # the headers for API calls are built once per token
+        self.__hdrs = NO_HDRS
+        # learn which version the cluster runs, and so which APIs it has
+        if version == AUTO_VERSION:
+            self.__capabilities = detect_capabilities(self, capability_cache)
+        else:
+            self.__capabilities = Capabilities(version)
+        self.__version = self.__capabilities.version
+        # look up the version's API routes once rather than every time an API object is made
+        self.__routes = RouteTable(self.__version, self.url)
 
     # end __init__()
 
+    def __enter__(self):
+        """
+        Allows a Dnac object to be used in a with statement so that its connections are closed on exit.
+        :return: Dnac object
+        """
+        return self
+
+    # end __enter__()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """
+        Closes the Dnac object's connections when leaving a with statement.
+        :return: bool
+        """
+        self.close()
+        return False
+
+    # end __exit__()
+
     @property
     def version(self):
         """
@@ -291,11 +527,93 @@ class Dnac(object):
 
     # end xauth getter
 
+    @property
+    def pool(self):
+        """
+        Get method pool returns the value of __pool, the ConnectionPool shared by all of the Dnac object's API calls.
+        :return: ConnectionPool object
+        """
+        return self.__pool
+
+    # end pool getter
+
+    @property
+    def limiter(self):
+        """
+        Get method limiter returns the value of __limiter, the RateLimiter that paces all of the Dnac object's API
+        calls.  Use its metrics to see how long calls have waited on each endpoint family.
+        :return: RateLimiter object
+        """
+        return self.__limiter
+
+    # end limiter getter
+
+    @property
+    def retry_policy(self):
+        """
+        Get method retry_policy returns the value of __retry_policy, the RetryPolicy given to each new DnacApi object.
+        :return: RetryPolicy object
+        """
+        return self.__retry_policy
+
+    # end retry_policy getter
+
+    @property
+    def codec(self):
+        """
+        Get method codec returns the value of __codec, the JsonCodec shared by all of the Dnac object's API calls.
+        :return: JsonCodec object
+        """
+        return self.__codec
+
+    # end codec getter
+
+    @property
+    def hooks(self):
+        """
+        Returns the Hooks that observe every API call made through this Dnac object.  Use its add and remove methods
+        to install or uninstall a RequestHook.
+        :return: Hooks object
+        """
+        return self.__hooks
+
+    # end hooks getter
+
+    @property
+    def metrics(self):
+        """
+        Returns the ClusterMetrics recording this cluster's API traffic, or None if it is not being recorded.
+        :return: ClusterMetrics object
+        """
+        return self.__metrics
+
+    # end metrics getter
+
+    @property
+    def routes(self):
+        """
+        Returns the resource paths and URLs of the APIs available in the cluster's version.
+        :return: RouteTable object
+        """
+        return self.__routes
+
+    # end routes getter
+
+    @property
+    def capabilities(self):
+        """
+        Returns the cluster's release and which routes and features its version has.
+        :return: Capabilities object
+        """
+        return self.__capabilities
+
+    # end capabilities getter
+
     @property
     def api(self):
         """
-        Get method api returns the value of __api, the dict holding all of the instantiated APIs.
-        :return: dict
+        Get method api returns the value of __api, the dictionary holding all of the instantiated APIs.
+        :return: ApiRegistry object
         """
         return self.__api
 
@@ -332,6 +650,39 @@ class Dnac(object):
 
     # end getNewToken()
 
+    @property
+    def connected(self):
+        """
+        Get method connected indicates whether or not the Dnac object has logged into the cluster.
+        :return: bool
+        """
+        return bool(self.__xauth.token)
+
+    # end connected getter
+
+    def connect(self):
+        """
+        Class method connect logs into the cluster and gets the x-auth-token for subsequent API calls.  It does nothing
+        if the Dnac object has already logged in.
+        :return: str
+        """
+        return self.__xauth.connect()
+
+    # end connect()
+
+    def close(self):
+        """
+        Closes all of the connections the Dnac object holds open to the cluster and stops renewing its x-auth-token in
+        the background.  Call this once bulk operations are finished.
+        :return: none
+        """
+        self.__xauth.cancel()
+        self.__pool.close()
+        if self.__metrics is not None:
+            self.__metrics.close()
+
+    # end close()
+
     @property
     def hdrs(self):
         """
@@ -342,15 +693,121 @@ class Dnac(object):
 
         The method is decorated as a property so that it can be used just like any attribute's get method.
 
-        :return: dict
+        If the Dnac object has not logged in yet, hdrs does so first.  Likewise, if the x-auth-token is about to expire
+        and has not been renewed in the background, hdrs renews it.
+
+        The headers are built only when the x-auth-token changes; the content type is fixed for the life of the Dnac
+        object.  Every call in between receives the same read-only mapping, so copy it before adding headers of your
+        own, e.g. h = dict(d.hdrs), or use hdrs_with.  Note that this changes hdrs' earlier behaviour: it used to
+        return a new dict on every call, and code that adds keys to the value returned now raises a TypeError.
+
+        :return: MappingProxyType
         """
-        h = {}
-        h.update(self.__ctype.hdrs)
-        h.update(self.__xauth.hdrs)
-        return h
+        return self.__current_hdrs__()[1]
 
     # end hdrs()
 
+    async def hdrs_async(self):
+        """
+        Coroutine version of hdrs for the wrapper's *_async methods.  Logging in and renewing the x-auth-token block on
+        Cisco DNAC, so when either is needed it runs on one of the connection pool's async workers instead of stalling the
+        event loop.  Otherwise the cached headers are returned at once.
+        :return: MappingProxyType
+        """
+        if not self.__xauth.token or self.__xauth.due:
+            loop = asyncio.get_running_loop()
+            current = await loop.run_in_executor(self.__pool.executor, self.__current_hdrs__)
+            return current[1]
+        return self.__cached_hdrs__()[1]
+
+    # end hdrs_async()
+
+    def __current_hdrs__(self):
+        """
+        A hidden method that returns the cached headers, logging in or renewing the x-auth-token first if need be.
+        :return: tuple of the token's version, the headers, and the extended headers
+        """
+        if not self.__xauth.token:
+            self.connect()
+        self.__xauth.refresh_if_due()
+        return self.__cached_hdrs__()
+
+    # end __current_hdrs__()
+
+    def __cached_hdrs__(self):
+        """
+        A hidden method that returns the cached headers, rebuilding them if the x-auth-token has changed since they
+        were last built.  It never contacts Cisco DNAC.
+        :return: tuple of the token's version, the headers, and the extended headers
+        """
+        current = self.__hdrs
+        version = self.__xauth.version  # read once, so the headers are never filed under a newer token's version
+        if current[0] != version:
+            h = {}
+            h.update(self.__ctype.hdrs)
+            h.update(self.__xauth.hdrs)
+            current = (version, MappingProxyType(h), {})
+            self.__hdrs = current  # a single assignment, so readers never see a partial update
+        return current
+
+    # end __cached_hdrs__()
+
+    def hdrs_with(self, extra):
+        """
+        Class method hdrs_with returns the headers provided by hdrs combined with additional ones, e.g. __runsync for
+        synchronous site calls.  Like hdrs, the combined headers are built once per x-auth-token and shared read-only.
+        :param extra: The additional headers.
+            type: dict
+            required: yes
+            default: none
+        :return: MappingProxyType
+        """
+        version, hdrs, extended = self.__current_hdrs__()
+        key = tuple(sorted(extra.items()))
+        h = extended.get(key)
+        if h is None:
+            h = dict(extra)
+            h.update(hdrs)
+            h = MappingProxyType(h)
+            extended[key] = h
+        return h
+
+    # end hdrs_with()
+
 # end class Dnac()
 
 
+def connect_all(dnacs, max_workers=None):
+    """
+    Logs into several Cisco DNA Center clusters at the same time so that starting up takes only as long as the slowest
+    login.  Create the Dnac objects with lazy=True and then pass them here.  Every login is attempted even if some of
+    them fail.
+    :param dnacs: The Dnac objects to log in.
+        type: list of Dnac objects
+        required: yes
+        default: none
+    :param max_workers: The number of logins to run at once.
+        type: int
+        required: no
+        default: one per Dnac object
+    :return: list of Dnac objects
+    """
+    dnacs = list(dnacs)
+    if not dnacs:
+        return dnacs
+    if max_workers is None:
+        max_workers = len(dnacs)
+    failures = []
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='dnac-connect') as executor:
+        logins = [(dnac, executor.submit(dnac.connect)) for dnac in dnacs]
+        for dnac, login in logins:
+            error = login.exception()
+            if error is not None:
+                failures.append('%s (%s)' % (dnac.name or dnac.ip, error))
+    if failures:
+        raise DnacError('connect_all: %s: %s' % (CONNECT_ALL_FAILED, ', '.join(failures)))
+    return dnacs
+
+# end connect_all()
+
+
@@ -0,0 +1,325 @@
+
+from dnac.codec import DEFAULT_CODEC
+from dnac.crud import Crud, \
+                      CONNECTION_ERRORS, \
+                      _401_
+from dnac.hooks import THROTTLE, \
+                       RETRY_WAIT, \
+                       DECODE
+import asyncio
+import functools
+import time
+
+# globals
+
+MODULE = 'asynccrud.py'
+
+
+class AsyncCrud(object):
+    """
+    Class AsyncCrud provides coroutine versions of Crud's get, put, post and delete methods so that code built on an
+    event loop can make API calls to a Cisco DNA Center cluster without blocking it.  AsyncCrud is not an asynchronous
+    HTTP client: each call is a blocking Crud request handed off to one of the connection pool's async_workers threads,
+    which issues it over a pooled keep-alive connection while the event loop carries on with other coroutines.  The
+    number of requests actually on the wire is therefore bounded by the pool's async_workers, and each of them holds a
+    thread until Cisco DNAC responds.  When given a RateLimiter, AsyncCrud waits for the limiter's permission on the
+    event loop before handing the request to a worker, so paced requests never tie up a worker while they wait.
+    Likewise, when given a RetryPolicy, AsyncCrud sleeps between retries on the event loop rather than on a worker.
+    When given an XAuthToken, a request rejected with a 401 is replayed once with a renewed token; see
+    Crud.reauthorize.  When given Hooks, each call is reported to them on the event loop; see hooks.py.
+
+    Without a pool, AsyncCrud falls back to the event loop's default executor and a new connection per request.
+
+    Attributes:
+        crud: The Crud object that performs the requests.
+            type: Crud object
+            default: Crud(pool=pool, xauth=xauth, keep_results=keep_results, codec=codec)
+            scope: protected
+        pool: The connection pool whose connections and workers carry the requests.
+            type: ConnectionPool object
+            default: None
+            scope: protected
+        limiter: The rate limiter consulted before each request.
+            type: RateLimiter object
+            default: None
+            scope: protected
+        retry_policy: Decides which failed requests to retry and how long to wait before each attempt.
+            type: RetryPolicy object
+            default: None
+            scope: public
+        xauth: The x-auth-token to renew when a request is rejected with a 401.
+            type: XAuthToken object
+            default: None
+            scope: protected
+        hooks: The hooks observing each API call.
+            type: Hooks object
+            default: None
+            scope: protected
+
+    Usage:
+        rest_api = AsyncCrud(pool=ConnectionPool())
+        results, status = await rest_api.get(url, headers=hdrs)
+    """
+
+    def __init__(self,
+                 pool=None,
+                 limiter=None,
+                 retry_policy=None,
+                 xauth=None,
+                 keep_results=True,
+                 codec=DEFAULT_CODEC,
+                 hooks=None):
+        """
+        Creates a new AsyncCrud object.
+        :param pool: The connection pool shared with other Crud objects talking to the same server.
+                type: ConnectionPool object
+                default: None
+                required: no
+        :param limiter: The rate limiter shared with other Crud objects talking to the same server.
+                type: RateLimiter object
+                default: None
+                required: no
+        :param retry_policy: The policy for retrying requests that fail with a transient error.
+                type: RetryPolicy object
+                default: None
+                required: no
+        :param xauth: The x-auth-token shared with other Crud objects talking to the same server.
+                type: XAuthToken object
+                default: None
+                required: no
+        :param keep_results: Flag indicating whether or not to store each response in results after returning it.
+                type: bool
+                default: True
+                required: no
+        :param codec: The JSON codec for decoding responses.
+                type: JsonCodec object
+                default: DEFAULT_CODEC
+                required: no
+        :param hooks: The hooks shared with other Crud objects talking to the same server.
+                type: Hooks object
+                default: None
+                required: no
+        """
+        self.__pool = pool
+        self.__limiter = limiter
+        self.__retry_policy = retry_policy
+        self.__hooks = hooks
+        self.__crud = Crud(pool=pool, xauth=xauth, keep_results=keep_results, codec=codec)
+
+    # end __init__()
+
+    @property
+    def crud(self):
+        """
+        Returns the Crud object that issues AsyncCrud's requests.
+        :return: Crud object
+        """
+        return self.__crud
+
+    # end crud getter
+
+    @property
+    def pool(self):
+        """
+        Returns the ConnectionPool this AsyncCrud object uses, or None if every call opens its own connection.
+        :return: ConnectionPool object
+        """
+        return self.__pool
+
+    # end pool getter
+
+    @property
+    def limiter(self):
+        """
+        Returns the RateLimiter this AsyncCrud object consults, or None if its requests are not paced.
+        :return: RateLimiter object
+        """
+        return self.__limiter
+
+    # end limiter getter
+
+    @property
+    def retry_policy(self):
+        """
+        Returns the RetryPolicy this AsyncCrud object follows, or None if failed requests are not retried.
+        :return: RetryPolicy object
+        """
+        return self.__retry_policy
+
+    # end retry_policy getter
+
+    @retry_policy.setter
+    def retry_policy(self, retry_policy):
+        """
+        Changes the RetryPolicy this AsyncCrud object follows.  Use None to stop retrying failed requests.
+        :param retry_policy: The new retry policy.
+            type: RetryPolicy object
+            required: yes
+            default: none
+        :return: none
+        """
+        self.__retry_policy = retry_policy
+
+    # end retry_policy setter
+
+    @property
+    def hooks(self):
+        """
+        Returns the Hooks observing this AsyncCrud object's calls, or None if its calls are not observed.
+        :return: Hooks object
+        """
+        return self.__hooks
+
+    # end hooks getter
+
+    async def __throttle__(self, url, event=None):
+        """
+        A hidden coroutine that waits for the rate limiter's permission to send a request to the URL.
+        :return: none
+        """
+        if self.__limiter is not None:
+            waited = await self.__limiter.acquire_async(url)
+            if event is not None:
+                event.add(THROTTLE, waited)
+
+    # end __throttle__()
+
+    @property
+    def results(self):
+        """
+        Provides the results of the last completed API call.
+        :return: dict
+        """
+        return self.__crud.results
+
+    # end results getter
+
+    async def call(self, function, *args, **kwargs):
+        """
+        Runs a blocking function, e.g. a DnacApi method that makes several API calls, on one of the pool's workers and
+        waits for its result without blocking the event loop.
+        :param function: The function to run.
+                type: callable
+                default: none
+                required: yes
+        :return: the function's return value
+        """
+        executor = None
+        if self.__pool is not None:
+            executor = self.__pool.executor
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, functools.partial(function, *args, **kwargs))
+
+    # end call()
+
+    async def __send__(self, method, url, headers, body, verify, timeout, event=None):
+        """
+        A hidden coroutine that makes the API call on one of the pool's workers and, following the retry policy,
+        repeats it while the server responds with a transient error.  A request rejected with a 401 is replayed once
+        with a renewed x-auth-token.
+        :return: requests.Response object
+        """
+        started = time.monotonic()
+        attempt = 0
+        reauthorized = False
+        while True:
+            await self.__throttle__(url, event)
+            try:
+                resp = await self.call(self.__crud.request,
+                                       method,
+                                       url,
+                                       headers=headers,
+                                       body=body,
+                                       verify=verify,
+                                       timeout=timeout,
+                                       event=event)
+            except CONNECTION_ERRORS:
+                if self.__retry_policy is None:
+                    raise
+                delay = self.__retry_policy.next_delay(method, None, attempt, started)
+                if delay is None:
+                    raise
+            else:
+                if resp.status_code == _401_ and not reauthorized:
+                    # the renewal may block on another caller's login, so it runs on a worker
+                    hdrs = await self.call(self.__crud.reauthorize, headers)
+                    if hdrs is not None:
+                        resp.close()  # release the connection before replaying the request
+                        headers = hdrs
+                        reauthorized = True
+                        continue
+                if self.__retry_policy is None:
+                    return resp
+                delay = self.__retry_policy.next_delay(method, resp, attempt, started)
+                if delay is None:
+                    return resp
+                resp.close()
+            await asyncio.sleep(delay)
+            if event is not None:
+                event.add(RETRY_WAIT, delay)
+            attempt += 1
+
+    # end __send__()
+
+    async def __call_api__(self, method, url, headers, body, verify, timeout, is_json=True):
+        """
+        A hidden coroutine that sends an API call, decodes its response and, when hooks are installed, reports the call
+        to them.
+        :return: dict, str
+        """
+        hooks = self.__hooks
+        event = hooks.begin(method, url, body) if hooks else None
+        if event is None:
+            resp = await self.__send__(method, url, headers, body, verify, timeout)
+            return self.__crud.decode(resp, is_json=is_json)
+        resp = None
+        try:
+            resp = await self.__send__(method, url, headers, body, verify, timeout, event=event)
+            decoding = time.perf_counter()
+            decoded = self.__crud.decode(resp, is_json=is_json)
+            event.add(DECODE, time.perf_counter() - decoding)
+        except Exception as error:
+            hooks.end(event, resp, error)
+            raise
+        hooks.end(event, resp)
+        return decoded
+
+    # end __call_api__()
+
+    async def get(self, url, headers=None, body="", verify=False, timeout=5, is_json=True):
+        """
+        Coroutine version of Crud.get.  See Crud.get for a description of the parameters.
+        :return: dict, str
+        """
+        return await self.__call_api__('GET', url, headers, body, verify, timeout, is_json=is_json)
+
+    # end get()
+
+    async def put(self, url, headers=None, body="", verify=False, timeout=5):
+        """
+        Coroutine version of Crud.put.  See Crud.put for a description of the parameters.
+        :return: dict, str
+        """
+        return await self.__call_api__('PUT', url, headers, body, verify, timeout)
+
+    # end put()
+
+    async def post(self, url, headers=None, body="", verify=False, timeout=5):
+        """
+        Coroutine version of Crud.post.  See Crud.post for a description of the parameters.
+        :return: dict, str
+        """
+        return await self.__call_api__('POST', url, headers, body, verify, timeout)
+
+    # end post()
+
+    async def delete(self, url, headers=None, body="", verify=False, timeout=5):
+        """
+        Coroutine version of Crud.delete.  See Crud.delete for a description of the parameters.
+        :return: dict, str
+        """
+        return await self.__call_api__('DELETE', url, headers, body, verify, timeout)
+
+    # end delete()
+
+# end class AsyncCrud
@@ -46,6 +46,14 @@ class BasicAuth(object):
         cred64 = b64encode(credstr.encode())
         return cred64.decode()
 
+    @property
+    def user(self):
+        """
+        Getter method to retrieve the username stored in the object instance.
+        :return: str
+        """
+        return self.__user
+
     @property
     def creds(self):
         """
@@ -0,0 +1,459 @@
+
+from dnac.crud import Crud, \
+                      OK
+from dnac.routes import ROUTES, \
+                        SUPPORTED_DNAC_VERSIONS, \
+                        SITE, \
+                        SITE_COUNT, \
+                        DEVICE_DETAIL, \
+                        PROJECT, \
+                        ARCHIVE, \
+                        CLIENT
+import json
+import os
+import tempfile
+import time
+
+# globals
+
+MODULE = 'capabilities.py'
+
+AUTO_VERSION = 'auto'  # use as Dnac's version to detect it from the cluster
+
+RELEASE_PATH = '/api/system/v1/maglev/release/current'
+RELEASE_VERSION_KEYS = ('displayVersion', 'version')  # where the release's version may be found, in order
+INTENT_API_PREFIX = '/dna/intent/'
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.dnac')
+DEFAULT_CACHE_FILE = 'capabilities.json'
+DEFAULT_CAPABILITY_TTL = 86400  # a day; clusters are not upgraded often
+NO_CAPABILITY_CACHE = None
+
+# features and the routes that provide them
+INTENT_API = 'intent_api'
+SITE_PAGINATION = 'site_pagination'
+SITE_COUNT_API = 'site_count'
+DEVICE_DETAIL_API = 'device_detail'
+TEMPLATE_PROJECTS = 'template_projects'
+CONFIG_ARCHIVE = 'config_archive'
+CLIENT_DETAIL_API = 'client_detail'
+
+FEATURE_ROUTES = {
+    SITE_PAGINATION: SITE,
+    SITE_COUNT_API: SITE_COUNT,
+    DEVICE_DETAIL_API: DEVICE_DETAIL,
+    TEMPLATE_PROJECTS: PROJECT,
+    CONFIG_ARCHIVE: ARCHIVE,
+    CLIENT_DETAIL_API: CLIENT
+}
+
+# error messages
+RELEASE_REQUEST_FAILED = 'Could not read the cluster\'s release'
+UNKNOWN_RELEASE = 'The cluster\'s release does not give its version'
+UNSUPPORTED_RELEASE = 'The cluster\'s release is older than every supported Cisco DNA Center version'
+
+
+class CapabilityError(Exception):
+    """
+    The CapabilityError exception class, derived from Exception, indicates that a cluster's version could not be
+    detected.
+
+    Attributes:
+        none
+    """
+
+    def __init__(self, msg):
+        """
+        CapabilityError's __init__ method passes a message to its parent class.
+        :param msg: An error message indicating the problem.
+            type: str
+            required: yes
+            default: none
+        """
+        super(CapabilityError, self).__init__(msg)
+
+# end class CapabilityError
+
+# end exceptions
+
+
+def version_key(version):
+    """
+    Turns a dotted version, e.g. 1.3.1.4, into a tuple that sorts numerically.  Anything after the numbers, such as a
+    build suffix, is ignored.
+    :param version: The version.
+        type: str
+        required: yes
+        default: none
+    :return: tuple of int
+    """
+    key = []
+    for part in version.split('.'):
+        digits = ''
+        for c in part:
+            if not c.isdigit():
+                break
+            digits += c
+        if not digits:
+            break
+        key.append(int(digits))
+    return tuple(key)
+
+# end version_key()
+
+
+def closest_version(release):
+    """
+    Finds the supported version whose routes a cluster running a release should use: the release itself if it is
+    supported, or else the newest supported version older than the release.
+    :param release: The cluster's release, e.g. 1.3.1.4 or 1.3.3.1.
+        type: str
+        required: yes
+        default: none
+    :return: str
+    """
+    if release in SUPPORTED_DNAC_VERSIONS:
+        return release
+    target = version_key(release)
+    candidates = [version for version in SUPPORTED_DNAC_VERSIONS if version_key(version) <= target]
+    if not candidates:
+        raise CapabilityError('%s: %s' % (UNSUPPORTED_RELEASE, release))
+    return max(candidates, key=version_key)
+
+# end closest_version()
+
+
+class Capabilities(object):
+    """
+    The Capabilities class is a cluster's capability map: the Cisco DNA Center release it runs, the supported version
+    whose routes the wrapper uses for it, which routes that version has and which features they provide, e.g. the
+    intent API or paging through sites.  Every Dnac object has one; those created with version=AUTO_VERSION learn the
+    release from the cluster.
+
+    Attributes:
+        release: The cluster's release.
+            type: str
+            default: none
+            scope: protected
+        version: The supported version used for the release.
+            type: str
+            default: none
+            scope: protected
+        routes: The names of the routes the version has.
+            type: frozenset of str
+            default: none
+            scope: protected
+        features: Whether the version has each feature in FEATURE_ROUTES and the intent API.
+            type: dict
+            default: none
+            scope: protected
+
+    Usage:
+        d = Dnac(version=AUTO_VERSION)
+        if d.capabilities.supports(DEVICE_DETAIL_API):
+            ...
+    """
+
+    def __init__(self, release):
+        """
+        Builds the capability map for a release.
+        :param release: The cluster's release.
+            type: str
+            required: yes
+            default: none
+        """
+        self.__release = release
+        self.__version = closest_version(release)
+        paths = ROUTES[self.__version]
+        self.__routes = frozenset(paths)
+        self.__features = {feature: route in paths for feature, route in FEATURE_ROUTES.items()}
+        self.__features[INTENT_API] = any(path.startswith(INTENT_API_PREFIX) for path in paths.values())
+
+    # end __init__()
+
+    @property
+    def release(self):
+        """
+        Returns the cluster's release.
+        :return: str
+        """
+        return self.__release
+
+    # end release getter
+
+    @property
+    def version(self):
+        """
+        Returns the supported version used for the cluster's release.
+        :return: str
+        """
+        return self.__version
+
+    # end version getter
+
+    @property
+    def routes(self):
+        """
+        Returns the names of the routes the version has.
+        :return: frozenset of str
+        """
+        return self.__routes
+
+    # end routes getter
+
+    @property
+    def features(self):
+        """
+        Returns whether the version has each feature.
+        :return: dict
+        """
+        return dict(self.__features)
+
+    # end features getter
+
+    def supports(self, feature):
+        """
+        Indicates whether the cluster has a feature, e.g. SITE_COUNT_API.
+        :param feature: The feature.
+            type: str
+            required: yes
+            default: none
+        :return: bool
+        """
+        return self.__features.get(feature, False)
+
+    # end supports()
+
+    def to_dict(self):
+        """
+        Gives the capability map as a dict.
+        :return: dict
+        """
+        return {
+            'release': self.__release,
+            'version': self.__version,
+            'routes': sorted(self.__routes),
+            'features': dict(self.__features)
+        }
+
+    # end to_dict()
+
+    def __repr__(self):
+        """
+        Shows the release and the version used for it.
+        :return: str
+        """
+        return 'Capabilities(release=%s, version=%s)' % (self.__release, self.__version)
+
+    # end __repr__()
+
+# end class Capabilities
+
+
+class CapabilityCache(object):
+    """
+    The CapabilityCache class remembers each cluster's capability map in a file so that Dnac objects created with
+    version=AUTO_VERSION only ask the cluster for its release once a day rather than every time a script starts.
+    Entries are kept per cluster URL.  Only the release is needed to rebuild a map, but the whole map is written out
+    so it can be read by people, too.
+
+    The cache is replaced atomically, so a reader never sees a partial update.  If two processes update it at once,
+    the last one wins, which at worst costs the other cluster one more release request.
+
+    Attributes:
+        path: The file holding the capability maps.
+            type: str
+            default: ~/.dnac/capabilities.json
+            scope: protected
+        ttl: The seconds a cached map is used before the cluster is asked again.
+            type: float
+            default: DEFAULT_CAPABILITY_TTL
+            scope: protected
+
+    Usage:
+        d = Dnac(version=AUTO_VERSION, capability_cache=CapabilityCache(ttl=3600))
+    """
+
+    def __init__(self, path=None, ttl=DEFAULT_CAPABILITY_TTL):
+        """
+        Creates a new CapabilityCache.  The file itself is not created until a map is stored.
+        :param path: The file holding the capability maps.
+            type: str
+            required: no
+            default: DEFAULT_CACHE_DIR/DEFAULT_CACHE_FILE
+        :param ttl: The seconds a cached map is used.
+            type: float
+            required: no
+            default: DEFAULT_CAPABILITY_TTL
+        """
+        if path is None:
+            path = os.path.join(DEFAULT_CACHE_DIR, DEFAULT_CACHE_FILE)
+        self.__path = path
+        self.__ttl = ttl
+
+    # end __init__()
+
+    @property
+    def path(self):
+        """
+        Returns the path to the file holding the capability maps.
+        :return: str
+        """
+        return self.__path
+
+    # end path getter
+
+    @property
+    def ttl(self):
+        """
+        Returns the seconds a cached map is used.
+        :return: float
+        """
+        return self.__ttl
+
+    # end ttl getter
+
+    def __read__(self):
+        """
+        A hidden method that reads every cached entry.  A missing or corrupt cache reads as empty.
+        :return: dict
+        """
+        try:
+            with open(self.__path, 'r') as cache:
+                entries = json.load(cache)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(entries, dict):
+            return {}
+        return entries
+
+    # end __read__()
+
+    def __write__(self, entries):
+        """
+        A hidden method that atomically replaces the cache with the entries given.
+        :return: none
+        """
+        directory = os.path.dirname(os.path.abspath(self.__path))
+        if not os.path.isdir(directory):
+            os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.capabilities')
+        try:
+            with os.fdopen(fd, 'w') as tmp:
+                json.dump(entries, tmp, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.__path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    # end __write__()
+
+    def load(self, url):
+        """
+        Looks up a cluster's capability map.
+        :param url: The cluster's base URL.
+            type: str
+            required: yes
+            default: none
+        :return: Capabilities object, or None if no map is cached, it has expired or its release is no longer usable
+        """
+        entry = self.__read__().get(url)
+        if not isinstance(entry, dict):
+            return None
+        if time.time() - entry.get('detected', 0) >= self.__ttl:
+            return None
+        try:
+            return Capabilities(entry['release'])
+        except (KeyError, AttributeError, CapabilityError):
+            return None
+
+    # end load()
+
+    def store(self, url, capabilities):
+        """
+        Caches a cluster's capability map, replacing the one cached before.
+        :param url: The cluster's base URL.
+            type: str
+            required: yes
+            default: none
+        :param capabilities: The cluster's capability map.
+            type: Capabilities object
+            required: yes
+            default: none
+        :return: none
+        """
+        entries = self.__read__()
+        entry = capabilities.to_dict()
+        entry['detected'] = time.time()
+        entries[url] = entry
+        self.__write__(entries)
+
+    # end store()
+
+    def invalidate(self, url):
+        """
+        Removes a cluster's capability map, e.g. after the cluster is upgraded.
+        :param url: The cluster's base URL.
+            type: str
+            required: yes
+            default: none
+        :return: none
+        """
+        entries = self.__read__()
+        if entries.pop(url, None) is not None:
+            self.__write__(entries)
+
+    # end invalidate()
+
+# end class CapabilityCache
+
+DEFAULT_CAPABILITY_CACHE = CapabilityCache()
+
+
+def detect_capabilities(dnac, cache=NO_CAPABILITY_CACHE):
+    """
+    Asks a cluster for its release and builds its capability map, unless a map cached for the cluster is still fresh.
+    The request is made with the Dnac object's connection pool, x-auth-token, rate limiter and retry policy, so the
+    Dnac object must be able to log in.  The cache is only an optimisation, so one that cannot be written, e.g. in a
+    read-only home directory, is ignored.
+    :param dnac: The cluster.
+        type: Dnac object
+        required: yes
+        default: none
+    :param cache: Where to look for and keep the cluster's capability map.
+        type: CapabilityCache object
+        required: no
+        default: None, i.e. always ask the cluster
+    :return: Capabilities object
+    """
+    if cache is not NO_CAPABILITY_CACHE:
+        capabilities = cache.load(dnac.url)
+        if capabilities is not None:
+            return capabilities
+    crud = Crud(pool=dnac.pool,
+                limiter=dnac.limiter,
+                retry_policy=dnac.retry_policy,
+                xauth=dnac.xauth,
+                keep_results=False,
+                codec=dnac.codec,
+                hooks=dnac.hooks)
+    url = '%s%s' % (dnac.url, RELEASE_PATH)
+    results, status = crud.get(url, headers=dnac.hdrs)
+    if status != OK:
+        raise CapabilityError('%s: %s: %s' % (RELEASE_REQUEST_FAILED, url, status))
+    release = results.get('response', results) if isinstance(results, dict) else None
+    for key in RELEASE_VERSION_KEYS:
+        if isinstance(release, dict) and release.get(key):
+            capabilities = Capabilities(str(release[key]))
+            break
+    else:
+        raise CapabilityError('%s: %s' % (UNKNOWN_RELEASE, url))
+    if cache is not NO_CAPABILITY_CACHE:
+        try:
+            cache.store(dnac.url, capabilities)
+        except OSError:
+            pass  # the map is still good for this Dnac object
+    return capabilities
+
+# end detect_capabilities()
@@ -1,7 +1,6 @@
 
-from dnac import DnacError, \
-                 SUPPORTED_DNAC_VERSIONS, \
-                 UNSUPPORTED_DNAC_VERSION
+from dnac.routes import CLIENT, \
+                        resource_paths
 from dnac.dnacapi import DnacApi, \
                          DnacApiError
 from dnac.crud import OK, \
@@ -13,13 +12,7 @@ from dnac.timestamp import TimeStamp
 
 MODULE = 'client.py'
 
-CLIENT_RESOURCE_PATH = {
-    '1.2.10': '/dna/intent/api/v1/client-detail',
-    '1.3.0.2': '/dna/intent/api/v1/client-detail',
-    '1.3.0.3': '/dna/intent/api/v1/client-detail',
-    '1.3.1.3': '/dna/intent/api/v1/client-detail',
-    '1.3.1.4': '/dna/intent/api/v1/client-detail'
-}
+CLIENT_RESOURCE_PATH = resource_paths(CLIENT)
 
 NULL_MAC = '00:00:00:00:00:00'
 BCAST_MAC = 'FF:FF:FF:FF:FF:FF'
@@ -100,13 +93,7 @@ class Client(DnacApi):
             required: no
             default: 5
         """
-        if dnac.version in SUPPORTED_DNAC_VERSIONS:
-            path = CLIENT_RESOURCE_PATH[dnac.version]
-        else:
-            raise DnacError(
-                '__init__: %s: %s' %
-                (UNSUPPORTED_DNAC_VERSION, dnac.version)
-                           )
+        path = dnac.routes.path(CLIENT)
         self.__mac = mac
         self.__client_detail = {}
         super(Client, self).__init__(dnac,
@@ -0,0 +1,145 @@
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import ujson
+except ImportError:
+    ujson = None
+
+# globals
+
+MODULE = 'codec.py'
+
+ORJSON = 'orjson'
+UJSON = 'ujson'
+STDLIB_JSON = 'json'
+
+# fastest first; the standard library is always available
+BACKEND_PREFERENCE = [ORJSON, UJSON, STDLIB_JSON]
+
+# error messages
+UNAVAILABLE_BACKEND = 'JSON backend is not installed'
+UNAVAILABLE_BACKEND_RESOLUTION = 'Install the package or choose one of %s' % str(BACKEND_PREFERENCE)
+
+
+class CodecError(Exception):
+    """
+    The CodecError exception class, derived from Exception, indicates that a requested JSON backend cannot be used.
+
+    Attributes:
+        none
+    """
+
+    def __init__(self, msg):
+        """
+        CodecError's __init__ method passes a message to its parent class.
+        :param msg: An error message indicating the problem.
+            type: str
+            required: yes
+            default: none
+        """
+        super(CodecError, self).__init__(msg)
+
+# end class CodecError
+
+# end exceptions
+
+
+def available_backends():
+    """
+    Lists the JSON backends installed on this system from fastest to slowest.
+    :return: list of str
+    """
+    installed = {ORJSON: orjson is not None, UJSON: ujson is not None, STDLIB_JSON: True}
+    return [backend for backend in BACKEND_PREFERENCE if installed[backend]]
+
+# end available_backends()
+
+
+class JsonCodec(object):
+    """
+    The JsonCodec class encodes API request bodies and decodes API responses using the fastest JSON library
+    installed: orjson, then ujson, and finally Python's json module.  It decodes responses directly from their raw
+    bytes so that the text of a large response never needs to be built just to be parsed.
+
+    Whichever backend is in use, loads accepts bytes or str and dumps returns str, so the codecs are interchangeable.
+
+    Each Dnac object holds one JsonCodec that its Crud objects and body builders share.
+
+    Attributes:
+        backend: The name of the JSON library in use.
+            type: str
+            default: the first entry of available_backends()
+            scope: protected
+
+    Usage:
+        codec = JsonCodec()
+        data = codec.loads(resp.content)
+        body = codec.dumps({'name': 'a site'})
+        d = Dnac(codec=JsonCodec(STDLIB_JSON))
+    """
+
+    def __init__(self, backend=None):
+        """
+        Creates a new JsonCodec.
+        :param backend: The JSON library to use: orjson, ujson or json.
+            type: str
+            required: no
+            default: the fastest one installed
+        """
+        if backend is None:
+            backend = available_backends()[0]
+        if backend not in available_backends():
+            raise CodecError('%s: %s: %s' % (UNAVAILABLE_BACKEND, backend, UNAVAILABLE_BACKEND_RESOLUTION))
+        self.__backend = backend
+        if backend == ORJSON:
+            self.loads = orjson.loads
+            self.dumps = self.__orjson_dumps__
+        elif backend == UJSON:
+            self.loads = ujson.loads
+            self.dumps = self.__ujson_dumps__
+        else:
+            self.loads = json.loads
+            self.dumps = json.dumps
+
+    # end __init__()
+
+    @property
+    def backend(self):
+        """
+        Returns the name of the JSON library in use.
+        :return: str
+        """
+        return self.__backend
+
+    # end backend getter
+
+    @staticmethod
+    def __orjson_dumps__(obj):
+        """
+        A hidden method that encodes with orjson, which produces bytes, and returns str like the other backends.
+        :return: str
+        """
+        return orjson.dumps(obj).decode()
+
+    # end __orjson_dumps__()
+
+    @staticmethod
+    def __ujson_dumps__(obj):
+        """
+        A hidden method that encodes with ujson without escaping forward slashes, matching the json module.
+        :return: str
+        """
+        return ujson.dumps(obj, escape_forward_slashes=False)
+
+    # end __ujson_dumps__()
+
+# end class JsonCodec
+
+# the codec every Dnac object uses unless given another one
+DEFAULT_CODEC = JsonCodec()
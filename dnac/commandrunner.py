@@ -1,26 +1,17 @@
 
-from dnac import DnacError, \
-                 SUPPORTED_DNAC_VERSIONS, \
-                 UNSUPPORTED_DNAC_VERSION
+from dnac.routes import COMMANDRUNNER, \
+                        resource_paths
 from dnac.dnacapi import DnacApi, \
                          DnacApiError
 from dnac.crud import ACCEPTED, \
                       REQUEST_NOT_ACCEPTED, \
                       ERROR_MSGS
 from dnac.commandrunner_task import CommandRunnerTask
-import json
 import time
 
 MODULE = 'commandrunner.py'
 
-COMMANDRUNNER_RESOURCE_PATH = {
-    '1.2.8': '/api/v1/network-device-poller/cli/read-request',
-    '1.2.10': '/api/v1/network-device-poller/cli/read-request',
-    '1.3.0.2': '/api/v1/network-device-poller/cli/read-request',
-    '1.3.0.3': '/api/v1/network-device-poller/cli/read-request',
-    '1.3.1.3': '/api/v1/network-device-poller/cli/read-request',
-    '1.3.1.4': '/api/v1/network-device-poller/cli/read-request'
-}
+COMMANDRUNNER_RESOURCE_PATH = resource_paths(COMMANDRUNNER)
 
 
 class CommandRunner(DnacApi):
@@ -109,13 +100,7 @@ class CommandRunner(DnacApi):
         # check Cisco DNA Center's version and set the resourece path
         if cmds is None:
             cmds = {}
-        if dnac.version in SUPPORTED_DNAC_VERSIONS:
-            path = COMMANDRUNNER_RESOURCE_PATH[dnac.version]
-        else:
-            raise DnacError(
-                '__init__: %s: %s' %
-                (UNSUPPORTED_DNAC_VERSION, dnac.version)
-                           )
+        path = dnac.routes.path(COMMANDRUNNER)
         # setup the attributes
         self.__cmds = cmds  # commands to run
         self.__task = None  # CommandRunnerTask object created after running cmds
@@ -179,7 +164,7 @@ class CommandRunner(DnacApi):
         c = [cmd]
         u = [uuid]
         cmds = {'commands': c, 'deviceUuids': u}
-        self.__cmds = json.dumps(cmds)
+        self.__cmds = self.dnac.codec.dumps(cmds)
         return self.__cmds
 
     # end format_cmd()
@@ -200,7 +185,7 @@ class CommandRunner(DnacApi):
         :return:
         """
         cmds = {'commands': cmd_list, 'deviceUuids': uuid_list}
-        self.__cmds = json.dumps(cmds)
+        self.__cmds = self.dnac.codec.dumps(cmds)
         return self.__cmds
 
     # end format_cmds()
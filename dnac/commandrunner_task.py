@@ -101,5 +101,22 @@ class CommandRunnerTask(Task):
 
     # end get_task_results()
 
+    async def get_task_results_async(self, wait=3):
+        """
+        Coroutine version of get_task_results.
+        :param wait: Number of seconds to wait for Cisco DNAC to finish the command.
+            type: int
+            required: no
+            default: 3
+        :return: dict
+        """
+        await super(CommandRunnerTask, self).get_task_results_async(wait)
+        progress = json.loads(self.progress)
+        self.__file_id = progress['fileId']
+        self.__file = File(self.dnac, self.__file_id)
+        return await self.acrud.call(self.__file.get_results)
+
+    # end get_task_results_async()
+
 # end class CommandrunnerTask()
 
@@ -1,22 +1,18 @@
-from dnac import DnacError, \
-                 SUPPORTED_DNAC_VERSIONS, \
-                 UNSUPPORTED_DNAC_VERSION
+from dnac.routes import ARCHIVE, \
+                        resource_paths
 from dnac.dnacapi import DnacApi, \
                          DnacApiError
 from dnac.crud import OK, \
                       REQUEST_NOT_OK, \
                       ERROR_MSGS
 from dnac.device_archive import DeviceArchive
+import asyncio
 
 MODULE = 'config_archive.py'
 
-ARCHIVE_RESOURCE_PATH = {
-    '1.2.10': '/api/v1/archive-config',
-    '1.3.0.2': '/api/v1/archive-config',
-    '1.3.0.3': '/api/v1/archive-config',
-    '1.3.1.3': '/api/v1/archive-config',
-    '1.3.1.4': '/api/v1/archive-config'
-}
+ARCHIVE_LIST_KEY = 'archiveResultlist'
+
+ARCHIVE_RESOURCE_PATH = resource_paths(ARCHIVE)
 
 # globals
 
@@ -86,10 +82,7 @@ class ConfigArchive(DnacApi):
             default: 5
             required: no
         """
-        if dnac.version in SUPPORTED_DNAC_VERSIONS:
-            path = ARCHIVE_RESOURCE_PATH[dnac.version]
-        else:
-            raise DnacError('%s: __init__: %s: %s' % (MODULE, UNSUPPORTED_DNAC_VERSION, dnac.version))
+        path = dnac.routes.path(ARCHIVE)
         self.__archive = {}  # key = deviceId, value = DeviceArchive
         super(ConfigArchive, self).__init__(dnac,
                                             '%s_archive' % name,
@@ -109,30 +102,68 @@ class ConfigArchive(DnacApi):
 
     # end archive getter
 
-    def load_all_archives(self):
+    def load_all_archives(self, stream=False):
         """
         ConfigArchive uses its load_all_archives method to retrieve the entire configuration archive from a Cisco
         DNA Center cluster.
+        :param stream: A flag indicating whether to load each device's archive as soon as it arrives in the listing
+                       rather than after downloading and decoding the entire listing.
+            type: bool
+            required: no
+            default: False
         :return: dict
         """
         url = self.dnac.url + self.resource
-        archives, status = self.crud.get(url,
-                                         headers=self.dnac.hdrs,
-                                         verify=self.verify,
-                                         timeout=self.timeout)
+        if stream:
+            archives, status = self.crud.stream(url,
+                                                headers=self.dnac.hdrs,
+                                                key=ARCHIVE_LIST_KEY,
+                                                verify=self.verify,
+                                                timeout=self.timeout)
+        else:
+            archives, status = self.crud.get(url,
+                                             headers=self.dnac.hdrs,
+                                             verify=self.verify,
+                                             timeout=self.timeout)
         if status != OK:
             raise DnacApiError(
                 MODULE, 'load_all_archives', REQUEST_NOT_OK, url,
                 OK, status, ERROR_MSGS[status], str(archives)
             )
-        for archive in archives['archiveResultlist']:
-            device_archive = DeviceArchive(self.dnac, archive['deviceId'])
+        if not stream:
+            archives = archives[ARCHIVE_LIST_KEY]
+        for archive in archives:
+            device_archive = DeviceArchive(self.dnac, archive['deviceId'], keep_results=False)
             device_archive.load_versions()
             self.__archive[archive['deviceId']] = device_archive
         return self.__archive
 
     # end load_all_archives()
 
+    async def load_all_archives_async(self):
+        """
+        Coroutine version of load_all_archives.  Every device's archive versions are loaded concurrently.
+        :return: dict
+        """
+        url = self.dnac.url + self.resource
+        archives, status = await self.acrud.get(url,
+                                                headers=await self.dnac.hdrs_async(),
+                                                verify=self.verify,
+                                                timeout=self.timeout)
+        if status != OK:
+            raise DnacApiError(
+                MODULE, 'load_all_archives_async', REQUEST_NOT_OK, url,
+                OK, status, ERROR_MSGS[status], str(archives)
+            )
+        device_archives = [DeviceArchive(self.dnac, archive['deviceId'], keep_results=False)
+                           for archive in archives[ARCHIVE_LIST_KEY]]
+        await asyncio.gather(*[self.acrud.call(device_archive.load_versions) for device_archive in device_archives])
+        for device_archive in device_archives:
+            self.__archive[device_archive.device] = device_archive
+        return self.__archive
+
+    # end load_all_archives_async()
+
     def load_device_archive(self, device):
         """
         The load_device_archive instructs a ConfigArchive to pull the configuration archive of a single device.
@@ -146,7 +177,7 @@ class ConfigArchive(DnacApi):
         """
         if device in self.__archive.keys():
             del self.__archive[device]
-        device_archive = DeviceArchive(d, device)
+        device_archive = DeviceArchive(self.dnac, device, keep_results=False)
         device_archive.load_versions()
         self.__archive[device] = device_archive
         return self.__archive[device]
@@ -166,7 +197,7 @@ class ConfigArchive(DnacApi):
         if device in self.__archive.keys():
             raise DnacApiError(MODULE, 'add_new_device_archive', ARCHIVE_ALREADY_EXISTS_ERROR, '',
                                '', device, '', '')
-        new_archive = DeviceArchive(self.dnac, device)
+        new_archive = DeviceArchive(self.dnac, device, keep_results=False)
         self.__archive[device] = new_archive
         return new_archive
 
@@ -1,22 +1,14 @@
-from dnac import DnacError, \
-                 SUPPORTED_DNAC_VERSIONS, \
-                 UNSUPPORTED_DNAC_VERSION
+from dnac.routes import ARCHIVE_SETTINGS, \
+                        resource_paths
 from dnac.dnacapi import DnacApi, \
                          DnacApiError
 from dnac.crud import OK, \
                       REQUEST_NOT_OK, \
                       ERROR_MSGS
-import json
 
 MODULE = 'config_archive_settings.py'
 
-ARCHIVE_SETTINGS_RESOURCE_PATH = {
-    '1.2.10': '/api/v1/archive-config/setting',
-    '1.3.0.2': '/api/v1/archive-config/setting',
-    '1.3.0.3': '/api/v1/archive-config/setting',
-    '1.3.1.3': '/api/v1/archive-config/setting',
-    '1.3.1.4': '/api/v1/archive-config/setting'
-}
+ARCHIVE_SETTINGS_RESOURCE_PATH = resource_paths(ARCHIVE_SETTINGS)
 
 # globals
 
@@ -91,13 +83,7 @@ class ConfigArchiveSettings(DnacApi):
             default: 5
             required: no
         """
-        if dnac.version in SUPPORTED_DNAC_VERSIONS:
-            path = ARCHIVE_SETTINGS_RESOURCE_PATH[dnac.version]
-        else:
-            raise DnacError(
-                '__init__: %s: %s' %
-                (UNSUPPORTED_DNAC_VERSION, dnac.version)
-                           )
+        path = dnac.routes.path(ARCHIVE_SETTINGS)
         self.__settings = {}  # global DNA Center archive settings
         super(ConfigArchiveSettings, self).__init__(dnac,
                                                     '%s_archive_settings' % name,
@@ -115,7 +101,7 @@ class ConfigArchiveSettings(DnacApi):
         :return: dict
         """
         # make a GET call to DNAC for the current settings
-        url = self.dnac.url + ARCHIVE_SETTINGS_RESOURCE_PATH[self.dnac.version]
+        url = self.dnac.routes.url(ARCHIVE_SETTINGS)
         settings, status = self.crud.get(url,
                                          headers=self.dnac.hdrs,
                                          verify=self.verify,
@@ -141,10 +127,10 @@ class ConfigArchiveSettings(DnacApi):
         :return: none
         """
         self.__settings = settings
-        url = self.dnac.url + ARCHIVE_SETTINGS_RESOURCE_PATH[self.dnac.version]
+        url = self.dnac.routes.url(ARCHIVE_SETTINGS)
         result, status = self.crud.post(url,
                                         headers=self.dnac.hdrs,
-                                        body=json.dumps(self.__settings),
+                                        body=self.dnac.codec.dumps(self.__settings),
                                         verify=self.verify,
                                         timeout=self.timeout)
         if status != OK:
@@ -0,0 +1,206 @@
+
+import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+# globals
+
+MODULE = 'connectionpool.py'
+
+DEFAULT_POOL_SIZE = 10  # connections kept open to a single cluster
+DEFAULT_KEEP_ALIVE = True
+DEFAULT_MAX_RETRIES = 0  # connection-level retries only; HTTP status retries are not handled here
+DEFAULT_ASYNC_WORKERS = DEFAULT_POOL_SIZE  # threads running the coroutines' blocking requests
+HOST_POOLS = 1  # a Dnac object only ever talks to one cluster
+
+
+class ConnectionPool(object):
+    """
+    The ConnectionPool class holds the HTTP session that all of a Dnac object's API calls share.  Instead of opening a
+    new TCP connection and repeating the TLS handshake for every request, the pool keeps up to pool_size connections to
+    the cluster open and reuses them for subsequent calls.
+
+    Each Dnac object creates one ConnectionPool and hands it to the Crud objects of its DnacApi instances as well as to
+    its XAuthToken.  Call close() when the Dnac object is no longer needed to release the pool's sockets.
+
+    Attributes:
+        pool_size: The maximum number of connections kept open to the cluster.
+            type: int
+            default: 10
+            scope: protected
+        keep_alive: A flag indicating whether or not connections are held open between requests.  When False, every
+                    request asks the server to close the connection once it responds.
+            type: bool
+            default: True
+            scope: protected
+        max_retries: The number of times a request is retried when the connection to the cluster fails.
+            type: int
+            default: 0
+            scope: protected
+        session: The requests Session that performs the API calls.
+            type: requests.Session object
+            default: a new Session
+            scope: protected
+        async_workers: The number of worker threads that run requests on behalf of coroutines.
+            type: int
+            default: DEFAULT_ASYNC_WORKERS
+            scope: protected
+        executor: The async_workers threads that AsyncCrud hands its blocking requests to so they do not stall the
+                  event loop.  Created the first time it is needed, under a lock so that concurrent first callers
+                  share one.
+            type: ThreadPoolExecutor object
+            default: None
+            scope: protected
+
+    Usage:
+        pool = ConnectionPool(pool_size=20)
+        resp = pool.request('GET', url, headers=hdrs, verify=False, timeout=5)
+        pool.close()
+    """
+
+    def __init__(self,
+                 pool_size=DEFAULT_POOL_SIZE,
+                 keep_alive=DEFAULT_KEEP_ALIVE,
+                 max_retries=DEFAULT_MAX_RETRIES,
+                 async_workers=DEFAULT_ASYNC_WORKERS):
+        """
+        Creates a new ConnectionPool and mounts a pooled HTTP adapter for both HTTP and HTTPS URLs.
+        :param pool_size: The maximum number of connections to keep open to the cluster.
+            type: int
+            required: no
+            default: 10
+        :param keep_alive: Flag indicating whether or not connections should be reused across requests.
+            type: bool
+            required: no
+            default: True
+        :param max_retries: The number of retries to attempt when a connection to the cluster fails.
+            type: int
+            required: no
+            default: 0
+        :param async_workers: The number of worker threads that run requests on behalf of coroutines.  Coroutines
+                              beyond this many wait for a free worker.  Workers beyond pool_size open connections of
+                              their own that are closed after each request, so raise pool_size along with it.
+            type: int
+            required: no
+            default: DEFAULT_ASYNC_WORKERS
+        """
+        self.__pool_size = pool_size
+        self.__keep_alive = keep_alive
+        self.__max_retries = max_retries
+        self.__async_workers = async_workers
+        self.__session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=HOST_POOLS,
+                              pool_maxsize=self.__pool_size,
+                              max_retries=self.__max_retries)
+        self.__session.mount('https://', adapter)
+        self.__session.mount('http://', adapter)
+        if not self.__keep_alive:
+            self.__session.headers['Connection'] = 'close'
+        self.__executor = None
+        self.__executor_lock = threading.Lock()
+
+    # end __init__()
+
+    @property
+    def pool_size(self):
+        """
+        Returns the maximum number of connections the pool keeps open to the cluster.
+        :return: int
+        """
+        return self.__pool_size
+
+    # end pool_size getter
+
+    @property
+    def keep_alive(self):
+        """
+        Indicates whether or not the pool reuses its connections.
+        :return: bool
+        """
+        return self.__keep_alive
+
+    # end keep_alive getter
+
+    @property
+    def max_retries(self):
+        """
+        Returns the number of retries attempted when a connection to the cluster fails.
+        :return: int
+        """
+        return self.__max_retries
+
+    # end max_retries getter
+
+    @property
+    def async_workers(self):
+        """
+        Returns the number of worker threads that run requests on behalf of coroutines.
+        :return: int
+        """
+        return self.__async_workers
+
+    # end async_workers getter
+
+    @property
+    def session(self):
+        """
+        Provides the requests Session used to issue API calls.
+        :return: requests.Session object
+        """
+        return self.__session
+
+    # end session getter
+
+    @property
+    def executor(self):
+        """
+        Provides the worker threads used to run requests on behalf of coroutines.  The requests themselves still
+        block, so each one in flight occupies a worker; the executor is sized by async_workers, independently of the
+        number of pooled connections.
+        :return: ThreadPoolExecutor object
+        """
+        executor = self.__executor
+        if executor is None:
+            with self.__executor_lock:
+                if self.__executor is None:
+                    self.__executor = ThreadPoolExecutor(max_workers=self.__async_workers,
+                                                         thread_name_prefix='dnac-async')
+                executor = self.__executor
+        return executor
+
+    # end executor getter
+
+    def request(self, method, url, **kwargs):
+        """
+        Issues an HTTP request over one of the pool's connections.  The keyword arguments are passed unchanged to
+        requests.Session.request.
+        :param method: The HTTP method, e.g. GET, PUT, POST or DELETE.
+            type: str
+            required: yes
+            default: none
+        :param url: The full path to the server's API resource.
+            type: str
+            required: yes
+            default: none
+        :return: requests.Response object
+        """
+        return self.__session.request(method, url, **kwargs)
+
+    # end request()
+
+    def close(self):
+        """
+        Closes every connection held by the pool and stops its worker threads.  A closed pool may still be used; it
+        simply opens new connections and starts new workers.
+        :return: none
+        """
+        with self.__executor_lock:
+            executor, self.__executor = self.__executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+        self.__session.close()
+
+    # end close()
+
+# end class ConnectionPool()
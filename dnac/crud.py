@@ -1,6 +1,14 @@
 
+from dnac.xauthtoken import X_AUTH_TOKEN
+from dnac.codec import DEFAULT_CODEC
+from dnac.jsonstream import JsonStream, \
+                            RESPONSE_KEY, \
+                            DEFAULT_CHUNK_SIZE
+from dnac.hooks import THROTTLE, \
+                       RETRY_WAIT, \
+                       DECODE
 import requests
-import json
+import time
 
 #
 # request success codes:
@@ -51,6 +59,8 @@ _415_ = 415
 _415_UNSUPPORTED_BODY_FORMAT_ = '415 - API request body is in an unsupported format'
 _417_ = 417
 _417_EXPECTATION_FAILED_ = '417 - The server cannot meet the requirements of the Expect request-header field'
+_429_ = 429
+_429_TOO_MANY_REQUESTS_ = '429 - API request was throttled by the server'
 _500_ = 500
 _500_SERVER_REQUEST_FAILED_ = '500 - Server could not fulfill the API request'
 _501_ = 501
@@ -68,39 +78,403 @@ ERROR_MSGS = {
               _409_: _409_RESOURCE_CONFLICT_,
               _415_: _415_UNSUPPORTED_BODY_FORMAT_,
               _417_: _417_EXPECTATION_FAILED_,
+              _429_: _429_TOO_MANY_REQUESTS_,
               _500_: _500_SERVER_REQUEST_FAILED_,
               _501_: _501_SERVER_NO_FUNCTION_,
               _503_: _503_SERVER_UNAVAILABLE_,
               _504_: _504_SERVER_TIMEOUT_
              }
 
+# failures to reach the server that a RetryPolicy may retry
+CONNECTION_ERRORS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+
 
 class Crud(object):
     """
     Class Crud handles REST API calls (get, put, post and delete) to a
     server.  It converts the JSON formatted response it receives into
     appropriate python data types and then stores it in its __results
-    attribute.
+    attribute.  Responses are decoded straight from their bytes by a
+    JsonCodec, which uses the fastest JSON library installed.  For very
+    large listings, stream yields the items of the response's list as they
+    arrive instead of decoding the whole response at once.
+
+    When given a ConnectionPool, Crud sends its requests over the pool's
+    persistent connections.  Otherwise, each call opens a new connection
+    to the server.  When given a RateLimiter, Crud waits for the limiter's
+    permission before sending each request.  When given a RetryPolicy,
+    Crud retries requests that fail with a transient error, e.g. 503,
+    before returning the final response.  When given an XAuthToken, Crud
+    renews an expired token after a 401 and replays the request once
+    with the new token.  When given Hooks, Crud reports each call to them
+    along with how its time was spent; see hooks.py.
+
+    Bulk loaders, which create thousands of objects that parse their
+    responses into their own attributes, set keep_results to False so
+    that each Crud object lets go of a response as soon as it has been
+    returned.
 
     Attributes:
         results: The results returned by a CRUD API call.
             type: dict
             default: none
             scope: protected
+        keep_results: Flag indicating whether or not results holds on to
+                      the last response.  When False, results is always
+                      empty.
+            type: bool
+            default: True
+            scope: protected
+        codec: The JSON codec that decodes responses.
+            type: JsonCodec object
+            default: DEFAULT_CODEC
+            scope: protected
+        pool: The connection pool used to issue requests.
+            type: ConnectionPool object
+            default: None
+            scope: protected
+        limiter: The rate limiter consulted before each request.
+            type: RateLimiter object
+            default: None
+            scope: protected
+        retry_policy: Decides which failed requests to retry and how long
+                      to wait before each attempt.
+            type: RetryPolicy object
+            default: None
+            scope: public
+        xauth: The x-auth-token to renew when a request is rejected with
+               a 401.
+            type: XAuthToken object
+            default: None
+            scope: protected
+        hooks: The hooks observing each API call.
+            type: Hooks object
+            default: None
+            scope: protected
 
     Usage:
         rest_api = Crud()
+        pooled_rest_api = Crud(pool=ConnectionPool())
     """
 
-    def __init__(self):
+    def __init__(self,
+                 pool=None,
+                 limiter=None,
+                 retry_policy=None,
+                 xauth=None,
+                 keep_results=True,
+                 codec=DEFAULT_CODEC,
+                 hooks=None):
         """
         Crud's __init__ method sets up its results attribute as an empty dictionary and then returns the newly created
         Crud object.
+        :param pool: The connection pool shared with other Crud objects talking to the same server.
+                type: ConnectionPool object
+                default: None
+                required: no
+        :param limiter: The rate limiter shared with other Crud objects talking to the same server.
+                type: RateLimiter object
+                default: None
+                required: no
+        :param retry_policy: The policy for retrying requests that fail with a transient error.
+                type: RetryPolicy object
+                default: None
+                required: no
+        :param xauth: The x-auth-token shared with other Crud objects talking to the same server.
+                type: XAuthToken object
+                default: None
+                required: no
+        :param keep_results: Flag indicating whether or not to store each response in results after returning it.
+                type: bool
+                default: True
+                required: no
+        :param codec: The JSON codec for decoding responses.
+                type: JsonCodec object
+                default: DEFAULT_CODEC
+                required: no
+        :param hooks: The hooks shared with other Crud objects talking to the same server.
+                type: Hooks object
+                default: None
+                required: no
         """
         self.__results = {}
+        self.__keep_results = keep_results
+        self.__codec = codec
+        self.__pool = pool
+        self.__limiter = limiter
+        self.__retry_policy = retry_policy
+        self.__xauth = xauth
+        self.__hooks = hooks
 
     # end __init__
 
+    @property
+    def pool(self):
+        """
+        Returns the ConnectionPool this Crud object uses, or None if every call opens its own connection.
+        :return: ConnectionPool object
+        """
+        return self.__pool
+
+    # end pool getter
+
+    @property
+    def limiter(self):
+        """
+        Returns the RateLimiter this Crud object consults, or None if its requests are not paced.
+        :return: RateLimiter object
+        """
+        return self.__limiter
+
+    # end limiter getter
+
+    @property
+    def retry_policy(self):
+        """
+        Returns the RetryPolicy this Crud object follows, or None if failed requests are not retried.
+        :return: RetryPolicy object
+        """
+        return self.__retry_policy
+
+    # end retry_policy getter
+
+    @retry_policy.setter
+    def retry_policy(self, retry_policy):
+        """
+        Changes the RetryPolicy this Crud object follows.  Use None to stop retrying failed requests.
+        :param retry_policy: The new retry policy.
+            type: RetryPolicy object
+            required: yes
+            default: none
+        :return: none
+        """
+        self.__retry_policy = retry_policy
+
+    # end retry_policy setter
+
+    @property
+    def xauth(self):
+        """
+        Returns the XAuthToken this Crud object renews after a 401, or None if it does not renew tokens.
+        :return: XAuthToken object
+        """
+        return self.__xauth
+
+    # end xauth getter
+
+    @property
+    def keep_results(self):
+        """
+        Indicates whether or not this Crud object stores each response in results.
+        :return: bool
+        """
+        return self.__keep_results
+
+    # end keep_results getter
+
+    @property
+    def codec(self):
+        """
+        Returns the JsonCodec this Crud object decodes responses with.
+        :return: JsonCodec object
+        """
+        return self.__codec
+
+    # end codec getter
+
+    @property
+    def hooks(self):
+        """
+        Returns the Hooks observing this Crud object's calls, or None if its calls are not observed.
+        :return: Hooks object
+        """
+        return self.__hooks
+
+    # end hooks getter
+
+    def reauthorize(self, headers):
+        """
+        Crud's reauthorize method renews the x-auth-token that a rejected request was sent with and returns a copy of
+        the request's headers carrying the new token.  Concurrent callers share a single renewal.  The caller's headers
+        are left untouched.
+        :param headers: The headers of the request rejected with a 401.
+                type: dict
+                default: none
+                required: yes
+        :return: dict, or None if the request cannot be reauthorized
+        """
+        if self.__xauth is None or not headers or X_AUTH_TOKEN not in headers:
+            return None
+        hdrs = dict(headers)
+        hdrs[X_AUTH_TOKEN] = self.__xauth.refresh(headers[X_AUTH_TOKEN])
+        return hdrs
+
+    # end reauthorize()
+
+    def request(self, method, url, headers=None, body="", verify=False, timeout=5, stream=False, event=None):
+        """
+        Crud's request method makes a single attempt at an API call and returns the server's raw response without
+        retrying or decoding it.  It waits for the rate limiter, if any, and sends the request either through the
+        connection pool or, if there is none, through a one-off connection.
+        :param method: The HTTP method, e.g. GET, PUT, POST or DELETE.
+                type: str
+                default: none
+                required: yes
+        :param url: The path to the server's API resource.
+                type: str
+                default: none
+                required: yes
+        :param stream: A flag indicating whether to leave the response's body on the socket until it is read.
+                type: bool
+                default: False
+                required: no
+        :param event: The event recording the call this attempt belongs to.
+                type: RequestEvent object
+                default: None
+                required: no
+        :return: requests.Response object
+        """
+        if headers is None:
+            headers = {}
+        if self.__limiter is not None:
+            waited = self.__limiter.acquire(url)
+            if event is not None:
+                event.add(THROTTLE, waited)
+        if event is None:
+            return self.__transmit__(method, url, headers, body, verify, timeout, stream)
+        resp = None
+        sent = time.perf_counter()
+        try:
+            resp = self.__transmit__(method, url, headers, body, verify, timeout, stream)
+        finally:
+            event.exchanged(resp, time.perf_counter() - sent)
+        return resp
+
+    # end request()
+
+    def __transmit__(self, method, url, headers, body, verify, timeout, stream):
+        """
+        A hidden method that sends a request through the connection pool or, if there is none, a one-off connection.
+        :return: requests.Response object
+        """
+        if self.__pool is not None:
+            return self.__pool.request(method,
+                                       url,
+                                       headers=headers,
+                                       data=body,
+                                       verify=verify,
+                                       timeout=timeout,
+                                       stream=stream)
+        return requests.request(method,
+                                url,
+                                headers=headers,
+                                data=body,
+                                verify=verify,
+                                timeout=timeout,
+                                stream=stream)
+
+    # end __transmit__()
+
+    def decode(self, resp, is_json=True):
+        """
+        Crud's decode method converts a server's response into python data types, stores them in its results unless
+        keep_results is False, and returns them along with the response's status code.  An empty or failed response
+        leaves the results unchanged and returns them, or a new empty dict when keep_results is False.
+        :param resp: The server's response.
+                type: requests.Response object
+                default: none
+                required: yes
+        :param is_json: A flag indicating if the response is given in JSON format.
+                type = bool
+                default: True
+                required: no
+        :return: dict, str
+        """
+        if bool(resp) and is_json is True:  # resp is not empty and is json formatted
+            results = self.__codec.loads(resp.content)
+        elif bool(resp) and is_json is False:  # resp is not empty and is not json formatted
+            results = resp.text
+        elif self.__keep_results:
+            return self.__results, resp.status_code
+        else:
+            return {}, resp.status_code
+        if self.__keep_results:
+            self.__results = results
+        return results, resp.status_code
+
+    # end decode()
+
+    def __send__(self, method, url, headers, body, verify, timeout, stream=False, event=None):
+        """
+        A hidden method that makes the API call and, following the retry policy, repeats it while the server responds
+        with a transient error.  A request rejected with a 401 is replayed once with a renewed x-auth-token.
+        :return: requests.Response object
+        """
+        started = time.monotonic()
+        attempt = 0
+        reauthorized = False
+        while True:
+            try:
+                resp = self.request(method,
+                                    url,
+                                    headers=headers,
+                                    body=body,
+                                    verify=verify,
+                                    timeout=timeout,
+                                    stream=stream,
+                                    event=event)
+            except CONNECTION_ERRORS:
+                if self.__retry_policy is None:
+                    raise
+                delay = self.__retry_policy.next_delay(method, None, attempt, started)
+                if delay is None:
+                    raise
+            else:
+                if resp.status_code == _401_ and not reauthorized:
+                    hdrs = self.reauthorize(headers)
+                    if hdrs is not None:
+                        resp.close()  # release the connection before replaying the request
+                        headers = hdrs
+                        reauthorized = True
+                        continue
+                if self.__retry_policy is None:
+                    return resp
+                delay = self.__retry_policy.next_delay(method, resp, attempt, started)
+                if delay is None:
+                    return resp
+                resp.close()
+            time.sleep(delay)
+            if event is not None:
+                event.add(RETRY_WAIT, delay)
+            attempt += 1
+
+    # end __send__()
+
+    def __call_api__(self, method, url, headers, body, verify, timeout, is_json=True):
+        """
+        A hidden method that sends an API call, decodes its response and, when hooks are installed, reports the call to
+        them.
+        :return: dict, str
+        """
+        hooks = self.__hooks
+        event = hooks.begin(method, url, body) if hooks else None
+        if event is None:
+            resp = self.__send__(method, url, headers, body, verify, timeout)
+            return self.decode(resp, is_json=is_json)
+        resp = None
+        try:
+            resp = self.__send__(method, url, headers, body, verify, timeout, event=event)
+            decoding = time.perf_counter()
+            decoded = self.decode(resp, is_json=is_json)
+            event.add(DECODE, time.perf_counter() - decoding)
+        except Exception as error:
+            hooks.end(event, resp, error)
+            raise
+        hooks.end(event, resp)
+        return decoded
+
+    # end __call_api__()
+
     @property
     def results(self):
         """
@@ -144,17 +518,7 @@ class Crud(object):
         """
         if headers is None:
             headers = {}
-        resp = requests.request('GET',
-                                url,
-                                headers=headers,
-                                data=body,
-                                verify=verify,
-                                timeout=timeout)
-        if bool(resp) and is_json is True:  # resp is not empty and is json formatted
-            self.__results = json.loads(resp.text)
-        elif bool(resp) and is_json is False:  # resp is not empty and is not json formatted
-            self.__results = resp.text
-        return self.__results, resp.status_code
+        return self.__call_api__('GET', url, headers, body, verify, timeout, is_json=is_json)
 
     # end get()
 
@@ -186,15 +550,7 @@ class Crud(object):
         """
         if headers is None:
             headers = {}
-        resp = requests.request('PUT',
-                                url,
-                                headers=headers,
-                                data=body,
-                                verify=verify,
-                                timeout=timeout)
-        if bool(resp):
-            self.__results = json.loads(resp.text)
-        return self.__results, resp.status_code
+        return self.__call_api__('PUT', url, headers, body, verify, timeout)
 
     # end put()
 
@@ -226,15 +582,7 @@ class Crud(object):
         """
         if headers is None:
             headers = {}
-        resp = requests.request('POST',
-                                url,
-                                headers=headers,
-                                data=body,
-                                verify=verify,
-                                timeout=timeout)
-        if bool(resp):
-            self.__results = json.loads(resp.text)
-        return self.__results, resp.status_code
+        return self.__call_api__('POST', url, headers, body, verify, timeout)
 
     # end post()
 
@@ -265,17 +613,84 @@ class Crud(object):
         """
         if headers is None:
             headers = {}
-        resp = requests.request('DELETE',
-                                url,
-                                headers=headers,
-                                data=body,
-                                verify=verify,
-                                timeout=timeout)
-        if bool(resp):
-            self.__results = json.loads(resp.text)
-        return self.__results, resp.status_code
+        return self.__call_api__('DELETE', url, headers, body, verify, timeout)
 
     # end delete()
 
+    def stream(self,
+               url,
+               headers=None,
+               key=RESPONSE_KEY,
+               verify=False,
+               timeout=5,
+               chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Crud's stream method performs a GET API call whose response holds a large list, e.g. every network device,
+        and yields the list's items while the response is still downloading.  Only one item is decoded and held in
+        memory at a time, and nothing is stored in results.  The response is closed once the last item is read or the
+        iterator is discarded.
+
+        If the call fails, the response is decoded as usual and returned in place of the iterator so that it can be
+        reported along with the status code.
+        :param url: The path to the server's API resource.
+                type: str
+                default: none
+                required: yes
+        :param headers: The headers for placing an API call.
+                type: dict
+                default: none
+                required: yes, as a keyword argument
+        :param key: The name of the list in the response, or None if the response is the list itself.
+                type: str
+                default: RESPONSE_KEY
+                required: no
+        :param verify: A flag indicating if the server's certificate should be authenticated.
+                type: bool
+                default: False
+                required: no
+        :param timeout: Time in seconds to wait for the server's response before abandoning the API call.
+                type: int
+                default: 5
+                required: no
+        :param chunk_size: The number of bytes to read from the socket at a time.
+                type: int
+                default: DEFAULT_CHUNK_SIZE
+                required: no
+        :return: iterator or dict, str
+        """
+        if headers is None:
+            headers = {}
+        hooks = self.__hooks
+        event = hooks.begin('GET', url) if hooks else None
+        try:
+            resp = self.__send__('GET', url, headers, '', verify, timeout, stream=True, event=event)
+        except Exception as error:
+            if event is not None:
+                hooks.end(event, error=error)
+            raise
+        if event is not None:
+            hooks.end(event, resp, streamed=bool(resp))
+        if not bool(resp):
+            try:
+                return self.__codec.loads(resp.content), resp.status_code
+            except ValueError:
+                return resp.text, resp.status_code
+        return self.__items__(resp, key, chunk_size), resp.status_code
+
+    # end stream()
+
+    def __items__(self, resp, key, chunk_size):
+        """
+        A hidden generator that yields the items of a streamed response's list and then closes the response.
+        :return: generator
+        """
+        try:
+            for item in JsonStream(resp.iter_content(chunk_size=chunk_size), key=key):
+                yield item
+        finally:
+            resp.close()
+
+    # end __items__()
+
 # end class Crud
 
@@ -1,7 +1,6 @@
 
-from dnac import DnacError, \
-                 SUPPORTED_DNAC_VERSIONS, \
-                 UNSUPPORTED_DNAC_VERSION
+from dnac.routes import DEPLOYMENT, \
+                        resource_paths
 from dnac.dnacapi import DnacApi, \
                          DnacApiError
 from dnac.crud import ACCEPTED, \
@@ -12,14 +11,7 @@ MODULE = 'deployment.py'
 
 # globals
 
-DEPLOYMENT_RESOURCE_PATH = {
-    '1.2.8': '/api/v1/template-programmer/template/deploy/status',
-    '1.2.10': '/api/v1/template-programmer/template/deploy/status',
-    '1.3.0.2': '/api/v1/template-programmer/template/deploy/status',
-    '1.3.0.3': '/api/v1/template-programmer/template/deploy/status',
-    '1.3.1.3': '/api/v1/template-programmer/template/deploy/status',
-    '1.3.1.4': '/dna/intent/api/v1/template-programmer/template/deploy/status/'
-}
+DEPLOYMENT_RESOURCE_PATH = resource_paths(DEPLOYMENT)
 
 STATUS_KEY = 'status'
 
@@ -65,13 +57,7 @@ class Deployment(DnacApi):
             required: no
             default: 5
         """
-        if dnac.version in SUPPORTED_DNAC_VERSIONS:
-            path = DEPLOYMENT_RESOURCE_PATH[dnac.version]
-        else:
-            raise DnacError(
-                '__init__: %s: %s' %
-                (UNSUPPORTED_DNAC_VERSION, dnac.version)
-                           )
+        path = dnac.routes.path(DEPLOYMENT)
         self.__deployment = {}
         self.__deployment_id = deployment_id
         super(Deployment, self).__init__(dnac,
@@ -1,6 +1,6 @@
-from dnac import DnacError, \
-                 SUPPORTED_DNAC_VERSIONS, \
-                 UNSUPPORTED_DNAC_VERSION
+from dnac.routes import ARCHIVE, \
+                        DEVICE_ARCHIVE, \
+                        resource_paths
 from dnac.dnacapi import DnacApi, \
                          DnacApiError
 from dnac.crud import OK, \
@@ -10,27 +10,14 @@ from dnac.crud import OK, \
                       REQUEST_NOT_ACCEPTED
 from dnac.version import Version
 from dnac.device_archive_task import DeviceArchiveTask
-import json
 
 MODULE = 'device_archive.py'
 
 # globals
 
-ARCHIVE_RESOURCE_PATH = {
-    '1.2.10': '/api/v1/archive-config',
-    '1.3.0.2': '/api/v1/archive-config',
-    '1.3.0.3': '/api/v1/archive-config',
-    '1.3.1.3': '/api/v1/archive-config',
-    '1.3.1.4': '/api/v1/archive-config'
-}
-
-DEVICE_ARCHIVE_RESOURCE_PATH = {
-    '1.2.10': '%s/network-device' % ARCHIVE_RESOURCE_PATH['1.2.10'],
-    '1.3.0.2': '%s/network-device' % ARCHIVE_RESOURCE_PATH['1.3.0.2'],
-    '1.3.0.3': '%s/network-device' % ARCHIVE_RESOURCE_PATH['1.3.0.3'],
-    '1.3.1.3': '%s/network-device' % ARCHIVE_RESOURCE_PATH['1.3.1.3'],
-    '1.3.1.4': '%s/network-device' % ARCHIVE_RESOURCE_PATH['1.3.1.4']
-}
+ARCHIVE_RESOURCE_PATH = resource_paths(ARCHIVE)
+
+DEVICE_ARCHIVE_RESOURCE_PATH = resource_paths(DEVICE_ARCHIVE)
 
 # error conditions
 
@@ -69,7 +56,8 @@ class DeviceArchive(DnacApi):
                  dnac,
                  device_id,
                  verify=False,
-                 timeout=5):
+                 timeout=5,
+                 keep_results=True):
         """
         Creates a new DeviceArchive object and sets the target network device's ID.
         :param dnac: Reference to the program's Dnac object.
@@ -88,18 +76,20 @@ class DeviceArchive(DnacApi):
             type: int
             required: no
             default: 5
+        :param keep_results: Flag indicating whether or not to keep the last raw API response in results.
+            type: bool
+            required: no
+            default: True
         """
-        if dnac.version in SUPPORTED_DNAC_VERSIONS:
-            path = DEVICE_ARCHIVE_RESOURCE_PATH[dnac.version]
-        else:
-            raise DnacError('%s: __init__: %s: %s' % (MODULE, UNSUPPORTED_DNAC_VERSION, dnac.version))
+        path = dnac.routes.path(DEVICE_ARCHIVE)
         self.__device = device_id
         self.__versions = []  # list of Version objects that contain the config files
         super(DeviceArchive, self).__init__(dnac,
                                             '%s_archive' % self.__device,
                                             resource=path,
                                             verify=verify,
-                                            timeout=timeout)
+                                            timeout=timeout,
+                                            keep_results=keep_results)
 
     # end __init__()
 
@@ -193,9 +183,9 @@ class DeviceArchive(DnacApi):
                         'deviceIds': device_id_list,
                         'configFileType': requested_configs
                        }
-        body = json.dumps(request_body)
+        body = self.dnac.codec.dumps(request_body)
         # issue the request to add configs to the archive
-        url = self.dnac.url + ARCHIVE_RESOURCE_PATH[self.dnac.version]
+        url = self.dnac.routes.url(ARCHIVE)
         results, status = self.crud.post(url,
                                          headers=self.dnac.hdrs,
                                          body=body,
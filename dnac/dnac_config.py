@@ -13,6 +13,7 @@ DNAC_IP = ''
 #
 # DNAC_VERSION: Used for setting the resource path of API calls based upon
 #               the version of the Cisco DNAC cluster.
+#               Set it to 'auto' to ask the cluster for its version.
 #
 DNAC_VERSION = '1.3.1.4'
 
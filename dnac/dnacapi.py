@@ -1,5 +1,6 @@
 
 from dnac.crud import Crud
+from dnac.asynccrud import AsyncCrud
 
 MODULE = 'dnacapi.py'
 
@@ -107,10 +108,25 @@ class DnacApi(object):
             scope: protected
         crud: A Crud object used to making API calls.  This is a protected
               attribute that is wrapped by the get, put, post and update
-              methods included in this class.
+              methods included in this class.  It sends its requests over
+              the Dnac object's connection pool, paces them with the Dnac
+              object's rate limiter, retries them according to
+              retry_policy and renews the Dnac object's x-auth-token when
+              it expires.
             type: Crud object
             default: Crud object
             scope: protected
+        acrud: An AsyncCrud object used by the coroutine versions of the
+               API calls.  It is created the first time it is needed.
+            type: AsyncCrud object
+            default: None
+            scope: protected
+        retry_policy: How crud and acrud retry API calls that fail with a
+                      transient error.  Set it to None to disable retries
+                      for this API only.
+            type: RetryPolicy object
+            default: the Dnac object's retry_policy
+            scope: public
         verify: A flag indicating whether or not to authenticate Cisco
                 DNAC's certificate when making the API call.
             type: boolean
@@ -121,6 +137,13 @@ class DnacApi(object):
             type: int
             default: 5
             scope: protected
+        keep_results: A flag indicating whether or not results holds on to
+                      the last raw response.  Classes created in bulk,
+                      such as Task, File and Version, turn it off because
+                      they store what they need from each response.
+            type: boolean
+            default: True
+            scope: protected
     """
     
     def __init__(self,
@@ -128,7 +151,8 @@ class DnacApi(object):
                  name,
                  resource='',
                  verify=False,
-                 timeout=5):
+                 timeout=5,
+                 keep_results=True):
         """
         Class method __init__ creates a new DnacApi objects and sets its attribute values.  When instantiating a new
         DnacApi object provide a reference to the Dnac object that holds the APIs, a name used to access this object
@@ -156,6 +180,10 @@ class DnacApi(object):
                 type: int
                 default: 5
                 required: no
+        :param keep_results: A flag indicating whether or not to keep the last raw response in results.
+                type: boolean
+                default: True
+                required: no
         :return: DnacApi object
         """
         self.__dnac = dnac
@@ -163,7 +191,16 @@ class DnacApi(object):
         self.__resource = resource
         self.__verify = verify
         self.__timeout = timeout
-        self.__crud = Crud()
+        self.__keep_results = keep_results
+        self.__retry_policy = self.__dnac.retry_policy
+        self.__crud = Crud(pool=self.__dnac.pool,
+                           limiter=self.__dnac.limiter,
+                           retry_policy=self.__retry_policy,
+                           xauth=self.__dnac.xauth,
+                           keep_results=self.__keep_results,
+                           codec=self.__dnac.codec,
+                           hooks=self.__dnac.hooks)
+        self.__acrud = None
         # place the new API in Dnac's api dictionary
         self.__dnac.api[self.__name] = self
 
@@ -180,11 +217,58 @@ class DnacApi(object):
 
     # end crud getter
 
+    @property
+    def acrud(self):
+        """
+        Get method acrud returns the AsyncCrud object this class uses to make RESTful API calls from coroutines.  It
+        shares the Dnac object's connection pool and rate limiter with crud.
+        :return: AsyncCrud object
+        """
+        if self.__acrud is None:
+            self.__acrud = AsyncCrud(pool=self.__dnac.pool,
+                                     limiter=self.__dnac.limiter,
+                                     retry_policy=self.__retry_policy,
+                                     xauth=self.__dnac.xauth,
+                                     keep_results=self.__keep_results,
+                                     codec=self.__dnac.codec,
+                                     hooks=self.__dnac.hooks)
+        return self.__acrud
+
+    # end acrud getter
+
+    @property
+    def retry_policy(self):
+        """
+        Get method retry_policy returns the RetryPolicy followed by this API's calls.
+        :return: RetryPolicy object
+        """
+        return self.__retry_policy
+
+    # end retry_policy getter
+
+    @retry_policy.setter
+    def retry_policy(self, retry_policy):
+        """
+        Set method retry_policy changes how this API retries failed calls without affecting any other API.
+        :param retry_policy: The new retry policy, or None to disable retries.
+            type: RetryPolicy object
+            required: yes
+            default: none
+        :return: none
+        """
+        self.__retry_policy = retry_policy
+        self.__crud.retry_policy = retry_policy
+        if self.__acrud is not None:
+            self.__acrud.retry_policy = retry_policy
+
+    # end retry_policy setter
+
     @property
     def results(self):
         """
         The results method is decorated as if it was an attribute of this class and can be used accordingly.
-        It returns the raw results stored in the class' Crud object obtained from an API call.
+        It returns the raw results stored in the class' Crud object obtained from an API call, or an empty dict if
+        the object was created with keep_results set to False.
         :return: dict
         """
         return self.__crud.results
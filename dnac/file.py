@@ -1,7 +1,6 @@
 
-from dnac import DnacError, \
-                 SUPPORTED_DNAC_VERSIONS, \
-                 UNSUPPORTED_DNAC_VERSION
+from dnac.routes import FILE, \
+                        resource_paths
 from dnac.dnacapi import DnacApi, \
                          DnacApiError
 from dnac.crud import OK, \
@@ -10,14 +9,7 @@ from dnac.crud import OK, \
 
 MODULE = 'file.py'
 
-FILE_RESOURCE_PATH = {
-    '1.2.8': '/api/v1/file',
-    '1.2.10': '/dna/intent/api/v1/file',
-    '1.3.0.2': '/api/v1/file',
-    '1.3.0.3': '/api/v1/file',
-    '1.3.1.3': '/api/v1/file',
-    '1.3.1.4': '/api/v1/file'
-}
+FILE_RESOURCE_PATH = resource_paths(FILE)
 
 
 class File(DnacApi):
@@ -45,7 +37,8 @@ class File(DnacApi):
                  dnac,
                  id,
                  verify=False,
-                 timeout=5):
+                 timeout=5,
+                 keep_results=False):
         """
         Class method __init__ creates a new File instance.  When making a File object, pass it a Dnac object and the
         UUID of the file in Cisco DNAC that this object represents.
@@ -68,15 +61,14 @@ class File(DnacApi):
             type: int
             default: 5
             required: no
+        :param keep_results: Flag indicating whether or not to keep the last raw API response in the Crud object.  The
+                             file's contents are always kept in results.
+            type: bool
+            default: False
+            required: no
         """
         # check Cisco DNA Center's version and set the resource path
-        if dnac.version in SUPPORTED_DNAC_VERSIONS:
-            path = FILE_RESOURCE_PATH[dnac.version]
-        else:
-            raise DnacError(
-                '__init__: %s: %s' %
-                (UNSUPPORTED_DNAC_VERSION, dnac.version)
-                            )
+        path = dnac.routes.path(FILE)
         # setup the attributes
         self.__id = id  # use the fileId in the task's progress
         self.__results = []  # raw data in case further processing needed
@@ -84,7 +76,8 @@ class File(DnacApi):
                                    ('file_%s' % self.__id),
                                    resource=path,
                                    verify=verify,
-                                   timeout=timeout)
+                                   timeout=timeout,
+                                   keep_results=keep_results)
 
     # end __init__()
 
@@ -0,0 +1,720 @@
+
+from dnac.ratelimiter import RateLimiter
+import bisect
+import re
+import threading
+import time
+
+# globals
+
+MODULE = 'hooks.py'
+
+# the phases an API call's time is divided into; together they add up to TOTAL
+THROTTLE = 'throttle'  # waiting for the rate limiter
+SERVER = 'server'  # from sending the request until the response's headers arrive: latency plus server time
+TRANSFER = 'transfer'  # reading the response's body off the socket
+RETRY_WAIT = 'retry_wait'  # backing off between attempts
+DECODE = 'decode'  # parsing the JSON response
+CLIENT = 'client'  # everything else, i.e. the wrapper's own code, such as waiting for a pool worker
+TOTAL = 'total'
+
+PHASES = (THROTTLE, SERVER, TRANSFER, RETRY_WAIT, DECODE, CLIENT, TOTAL)
+
+NO_STATUS = None  # the call never received a response
+NO_BYTES = 0
+
+# path segments that identify one object rather than a kind of object
+ID_SEGMENT = re.compile(r'/(?:[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}|\d+)(?=/|$)')
+ID_PLACEHOLDER = '/{id}'
+URL_PREFIX = re.compile(r'^[a-z]+://[^/]+')  # scheme, host and port
+
+# upper bounds in seconds of the HistogramCollector's buckets; the last bucket holds everything slower
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+DEFAULT_QUANTILES = (0.5, 0.9, 0.99)
+
+
+def url_template(url):
+    """
+    Reduces a URL to its path with object identifiers, i.e. UUIDs and numbers, replaced by {id} and the query string
+    removed, so that calls to the same endpoint can be grouped together.
+    :param url: The request's URL.
+        type: str
+        required: yes
+        default: none
+    :return: str
+    """
+    path = URL_PREFIX.sub('', url.split('?', 1)[0])
+    return ID_SEGMENT.sub(ID_PLACEHOLDER, path)
+
+# end url_template()
+
+
+class RequestEvent(object):
+    """
+    The RequestEvent class describes one API call as it passes through Crud or AsyncCrud.  The same event is handed
+    to every hook's before_request, before the first attempt is made, and then to after_response, once the final
+    response has been decoded or the call has failed.  Retries and 401 replays are part of the one call, so an event
+    may span several attempts.
+
+    phases divides the call's time in seconds among THROTTLE, SERVER, TRANSFER, RETRY_WAIT, DECODE and CLIENT, which
+    add up to TOTAL.  A streamed call ends when its response's headers arrive; the time spent reading and parsing its
+    items belongs to the caller's loop and is not included.
+
+    Attributes:
+        method: The HTTP method.
+            type: str
+            scope: public
+        url: The request's URL.
+            type: str
+            scope: public
+        template: The URL's path with object identifiers replaced by {id}.
+            type: str
+            scope: public
+        family: The endpoint family, e.g. site or network-device.
+            type: str
+            scope: public
+        status: The final response's status code, or None if no response was received.
+            type: int
+            scope: public
+        attempts: The number of times the request was sent.
+            type: int
+            scope: public
+        request_bytes: The size of the request's body.
+            type: int
+            scope: public
+        response_bytes: The size of the final response's body, if known.
+            type: int
+            scope: public
+        error: The exception that ended the call, if any.
+            type: Exception
+            scope: public
+        phases: Seconds spent in each phase of the call.
+            type: dict
+            scope: public
+        started: When the call began in seconds since the epoch.
+            type: float
+            scope: public
+    """
+
+    __slots__ = ('method', 'url', 'template', 'family', 'status', 'attempts', 'request_bytes', 'response_bytes',
+                 'error', 'phases', 'started', '__clock')
+
+    def __init__(self, method, url, body=''):
+        """
+        Creates a new RequestEvent for a call that is about to begin.
+        :param method: The HTTP method.
+            type: str
+            required: yes
+            default: none
+        :param url: The request's URL.
+            type: str
+            required: yes
+            default: none
+        :param body: The request's body.
+            type: str or bytes
+            required: no
+            default: ''
+        """
+        self.method = method
+        self.url = url
+        self.template = url_template(url)
+        self.family = RateLimiter.family(url)
+        self.status = NO_STATUS
+        self.attempts = 0
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        self.request_bytes = len(body) if body else NO_BYTES
+        self.response_bytes = NO_BYTES
+        self.error = None
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.started = time.time()
+        self.__clock = time.perf_counter()
+
+    # end __init__()
+
+    def add(self, phase, seconds):
+        """
+        Adds time to one of the call's phases.
+        :param phase: The phase, e.g. THROTTLE.
+            type: str
+            required: yes
+            default: none
+        :param seconds: The time spent.
+            type: float
+            required: yes
+            default: none
+        :return: none
+        """
+        self.phases[phase] += seconds
+
+    # end add()
+
+    def exchanged(self, resp, seconds):
+        """
+        Records one attempt at sending the request.  The time is split between SERVER and TRANSFER using the
+        response's elapsed time, which ends when its headers arrive.
+        :param resp: The server's response, or None if the attempt failed to get one.
+            type: requests.Response object
+            required: yes
+            default: none
+        :param seconds: The time the attempt took.
+            type: float
+            required: yes
+            default: none
+        :return: none
+        """
+        self.attempts += 1
+        elapsed = getattr(resp, 'elapsed', None)
+        if elapsed is None:
+            self.phases[SERVER] += seconds
+            return
+        server = min(seconds, elapsed.total_seconds())
+        self.phases[SERVER] += server
+        self.phases[TRANSFER] += seconds - server
+
+    # end exchanged()
+
+    def finish(self, resp=None, error=None, streamed=False):
+        """
+        Completes the event with the final response or the error that ended the call, and works out the time spent
+        in the wrapper's own code.
+        :param resp: The final response.
+            type: requests.Response object
+            required: no
+            default: None
+        :param error: The exception that ended the call.
+            type: Exception
+            required: no
+            default: None
+        :param streamed: A flag indicating that the response's body has been left on the socket, in which case its
+                         size is taken from its Content-Length header, if any.
+            type: bool
+            required: no
+            default: False
+        :return: RequestEvent object
+        """
+        self.error = error
+        if resp is not None:
+            self.status = resp.status_code
+            if streamed:
+                self.response_bytes = int(resp.headers.get('Content-Length', NO_BYTES))
+            else:
+                self.response_bytes = len(resp.content or b'')
+        total = time.perf_counter() - self.__clock
+        self.phases[TOTAL] = total
+        measured = sum(self.phases[phase] for phase in PHASES if phase not in (CLIENT, TOTAL))
+        self.phases[CLIENT] = max(0.0, total - measured)
+        return self
+
+    # end finish()
+
+    def __repr__(self):
+        """
+        Summarizes the event.
+        :return: str
+        """
+        return 'RequestEvent(%s %s -> %s in %.3fs, %i attempt(s))' % (self.method, self.template, self.status,
+                                                                      self.phases[TOTAL], self.attempts)
+
+    # end __repr__()
+
+# end class RequestEvent
+
+
+class RequestHook(object):
+    """
+    The RequestHook class is a base for objects that observe API calls.  Subclasses override either or both of its
+    methods, which do nothing by default.  Hooks run on the thread making the call, or for coroutines, on the event
+    loop, so they should return quickly.  An exception raised by a hook propagates to the caller.
+
+    Usage:
+        class SlowCallLogger(RequestHook):
+            def after_response(self, event):
+                if event.phases[TOTAL] > 2:
+                    print(event)
+
+        d = Dnac(hooks=[SlowCallLogger()])
+    """
+
+    def before_request(self, event):
+        """
+        Called before the first attempt at an API call.
+        :param event: The call's event.  Only method, url, template, family, request_bytes and started are set.
+            type: RequestEvent object
+            required: yes
+            default: none
+        :return: none
+        """
+        pass
+
+    # end before_request()
+
+    def after_response(self, event):
+        """
+        Called once an API call is complete, whether it succeeded, failed with an error status or raised.
+        :param event: The call's event.
+            type: RequestEvent object
+            required: yes
+            default: none
+        :return: none
+        """
+        pass
+
+    # end after_response()
+
+# end class RequestHook
+
+
+class Hooks(object):
+    """
+    The Hooks class holds the RequestHooks a Dnac object shares with all of its Crud and AsyncCrud objects.  Hooks
+    may be added or removed at any time; calls already in progress finish with the hooks they started with.  When no
+    hooks are installed, Crud skips creating events entirely, so instrumentation costs nothing unless it is used.
+
+    Attributes:
+        hooks: The installed hooks in the order they are called.
+            type: tuple of RequestHook objects
+            default: ()
+            scope: protected
+
+    Usage:
+        collector = HistogramCollector()
+        d.hooks.add(collector)
+    """
+
+    def __init__(self, hooks=None):
+        """
+        Creates a new Hooks container.
+        :param hooks: The hooks to install.
+            type: list of RequestHook objects
+            required: no
+            default: None
+        """
+        self.__lock = threading.Lock()
+        self.__hooks = tuple(hooks or ())
+
+    # end __init__()
+
+    @property
+    def hooks(self):
+        """
+        Returns the installed hooks.
+        :return: tuple
+        """
+        return self.__hooks
+
+    # end hooks getter
+
+    def add(self, hook):
+        """
+        Installs a hook after those already installed.
+        :param hook: The hook to install.
+            type: RequestHook object
+            required: yes
+            default: none
+        :return: none
+        """
+        with self.__lock:
+            self.__hooks = self.__hooks + (hook,)
+
+    # end add()
+
+    def remove(self, hook):
+        """
+        Uninstalls a hook.  Raises a ValueError if the hook is not installed.
+        :param hook: The hook to remove.
+            type: RequestHook object
+            required: yes
+            default: none
+        :return: none
+        """
+        with self.__lock:
+            hooks = list(self.__hooks)
+            hooks.remove(hook)
+            self.__hooks = tuple(hooks)
+
+    # end remove()
+
+    def __bool__(self):
+        """
+        Indicates whether any hooks are installed.
+        :return: bool
+        """
+        return bool(self.__hooks)
+
+    # end __bool__()
+
+    def __len__(self):
+        """
+        Gives the number of hooks installed.
+        :return: int
+        """
+        return len(self.__hooks)
+
+    # end __len__()
+
+    def __iter__(self):
+        """
+        Iterates over the installed hooks.
+        :return: iterator
+        """
+        return iter(self.__hooks)
+
+    # end __iter__()
+
+    def begin(self, method, url, body=''):
+        """
+        Starts an event for a new API call and passes it to every hook's before_request.
+        :param method: The HTTP method.
+            type: str
+            required: yes
+            default: none
+        :param url: The request's URL.
+            type: str
+            required: yes
+            default: none
+        :param body: The request's body.
+            type: str
+            required: no
+            default: ''
+        :return: RequestEvent object, or None if no hooks are installed
+        """
+        if not self.__hooks:
+            return None
+        event = RequestEvent(method, url, body)
+        for hook in self.__hooks:
+            hook.before_request(event)
+        return event
+
+    # end begin()
+
+    def end(self, event, resp=None, error=None, streamed=False):
+        """
+        Completes an event and passes it to every hook's after_response.
+        :param event: The call's event, or None if the call was not being observed.
+            type: RequestEvent object
+            required: yes
+            default: none
+        :param resp: The final response.
+            type: requests.Response object
+            required: no
+            default: None
+        :param error: The exception that ended the call.
+            type: Exception
+            required: no
+            default: None
+        :param streamed: A flag indicating that the response's body has not been read.
+            type: bool
+            required: no
+            default: False
+        :return: none
+        """
+        if event is None:
+            return
+        event.finish(resp, error, streamed)
+        for hook in self.__hooks:
+            hook.after_response(event)
+
+    # end end()
+
+# end class Hooks
+
+
+class Histogram(object):
+    """
+    The Histogram class counts observations, e.g. call durations, into fixed buckets so that their distribution can
+    be summarized in constant memory no matter how many calls are made.  Quantiles are estimated by interpolating
+    within the bucket they fall in.
+
+    Histogram is not thread safe by itself; HistogramCollector serializes access to its histograms.
+
+    Attributes:
+        bounds: The buckets' upper bounds in ascending order.
+            type: tuple of float
+            default: DEFAULT_BUCKETS
+            scope: protected
+        counts: The number of observations in each bucket, the last being those above every bound.
+            type: list of int
+            default: zeros
+            scope: protected
+        count: The number of observations.
+            type: int
+            default: 0
+            scope: protected
+        sum: The total of all observations.
+            type: float
+            default: 0.0
+            scope: protected
+        max: The largest observation.
+            type: float
+            default: 0.0
+            scope: protected
+    """
+
+    def __init__(self, bounds=DEFAULT_BUCKETS):
+        """
+        Creates an empty Histogram.
+        :param bounds: The buckets' upper bounds in ascending order.
+            type: tuple of float
+            required: no
+            default: DEFAULT_BUCKETS
+        """
+        self.__bounds = tuple(bounds)
+        self.__counts = [0] * (len(self.__bounds) + 1)
+        self.__count = 0
+        self.__sum = 0.0
+        self.__max = 0.0
+
+    # end __init__()
+
+    @property
+    def bounds(self):
+        """
+        Returns the buckets' upper bounds.
+        :return: tuple
+        """
+        return self.__bounds
+
+    # end bounds getter
+
+    @property
+    def counts(self):
+        """
+        Returns the number of observations in each bucket.
+        :return: list
+        """
+        return list(self.__counts)
+
+    # end counts getter
+
+    @property
+    def count(self):
+        """
+        Returns the number of observations.
+        :return: int
+        """
+        return self.__count
+
+    # end count getter
+
+    @property
+    def sum(self):
+        """
+        Returns the total of all observations.
+        :return: float
+        """
+        return self.__sum
+
+    # end sum getter
+
+    @property
+    def max(self):
+        """
+        Returns the largest observation.
+        :return: float
+        """
+        return self.__max
+
+    # end max getter
+
+    def observe(self, value):
+        """
+        Counts an observation.
+        :param value: The observation.
+            type: float
+            required: yes
+            default: none
+        :return: none
+        """
+        self.__counts[bisect.bisect_left(self.__bounds, value)] += 1
+        self.__count += 1
+        self.__sum += value
+        if value > self.__max:
+            self.__max = value
+
+    # end observe()
+
+    def quantile(self, q):
+        """
+        Estimates a quantile of the observations.
+        :param q: The quantile, between 0 and 1, e.g. 0.99.
+            type: float
+            required: yes
+            default: none
+        :return: float
+        """
+        if self.__count == 0:
+            return 0.0
+        rank = q * self.__count
+        seen = 0
+        for index, count in enumerate(self.__counts):
+            if count and seen + count >= rank:
+                lower = self.__bounds[index - 1] if index > 0 else 0.0
+                upper = self.__bounds[index] if index < len(self.__bounds) else self.__max
+                return min(self.__max, lower + (upper - lower) * (rank - seen) / count)
+            seen += count
+        return self.__max
+
+    # end quantile()
+
+    def summary(self, quantiles=DEFAULT_QUANTILES):
+        """
+        Summarizes the observations.
+        :param quantiles: The quantiles to estimate.
+            type: tuple of float
+            required: no
+            default: DEFAULT_QUANTILES
+        :return: dict
+        """
+        summary = {
+            'count': self.__count,
+            'sum': self.__sum,
+            'mean': self.__sum / self.__count if self.__count else 0.0,
+            'max': self.__max
+        }
+        for q in quantiles:
+            summary['p%g' % (q * 100)] = self.quantile(q)
+        return summary
+
+    # end summary()
+
+# end class Histogram
+
+
+class HistogramCollector(RequestHook):
+    """
+    The HistogramCollector class is a RequestHook that keeps a Histogram of each phase's time for every endpoint
+    family, along with counts of calls, attempts, errors and bytes.  It holds no per-call data, so it can stay
+    installed for the whole of a long bulk job in production.
+
+    Attributes:
+        bounds: The buckets' upper bounds in seconds.
+            type: tuple of float
+            default: DEFAULT_BUCKETS
+            scope: protected
+
+    Usage:
+        collector = HistogramCollector()
+        d = Dnac(hooks=[collector])
+        SiteHierarchy(d)
+        pprint.pprint(collector.summary())
+        print(collector.histogram('site', SERVER).quantile(0.99))
+    """
+
+    def __init__(self, bounds=DEFAULT_BUCKETS):
+        """
+        Creates a new HistogramCollector.
+        :param bounds: The buckets' upper bounds in seconds.
+            type: tuple of float
+            required: no
+            default: DEFAULT_BUCKETS
+        """
+        self.__bounds = tuple(bounds)
+        self.__lock = threading.Lock()
+        self.__families = {}
+
+    # end __init__()
+
+    def __family__(self, family):
+        """
+        A hidden method that finds or creates the statistics for an endpoint family.  The caller must hold the lock.
+        :return: dict
+        """
+        stats = self.__families.get(family)
+        if stats is None:
+            stats = {
+                'calls': 0,
+                'attempts': 0,
+                'errors': 0,
+                'request_bytes': 0,
+                'response_bytes': 0,
+                'phases': {phase: Histogram(self.__bounds) for phase in PHASES}
+            }
+            self.__families[family] = stats
+        return stats
+
+    # end __family__()
+
+    def after_response(self, event):
+        """
+        Records a completed call.
+        :param event: The call's event.
+            type: RequestEvent object
+            required: yes
+            default: none
+        :return: none
+        """
+        with self.__lock:
+            stats = self.__family__(event.family)
+            stats['calls'] += 1
+            stats['attempts'] += event.attempts
+            if event.error is not None or event.status is NO_STATUS or event.status >= 400:
+                stats['errors'] += 1
+            stats['request_bytes'] += event.request_bytes
+            stats['response_bytes'] += event.response_bytes
+            for phase, seconds in event.phases.items():
+                stats['phases'][phase].observe(seconds)
+
+    # end after_response()
+
+    @property
+    def families(self):
+        """
+        Lists the endpoint families observed so far.
+        :return: list of str
+        """
+        with self.__lock:
+            return sorted(self.__families)
+
+    # end families getter
+
+    def histogram(self, family, phase=TOTAL):
+        """
+        Returns the Histogram of one phase for an endpoint family.  Raises a KeyError if the family has not been
+        observed.
+        :param family: The endpoint family, e.g. site.
+            type: str
+            required: yes
+            default: none
+        :param phase: The phase, e.g. SERVER.
+            type: str
+            required: no
+            default: TOTAL
+        :return: Histogram object
+        """
+        with self.__lock:
+            return self.__families[family]['phases'][phase]
+
+    # end histogram()
+
+    def summary(self, quantiles=DEFAULT_QUANTILES):
+        """
+        Summarizes every endpoint family's calls and the distribution of each phase's time.
+        :param quantiles: The quantiles to estimate.
+            type: tuple of float
+            required: no
+            default: DEFAULT_QUANTILES
+        :return: dict
+        """
+        with self.__lock:
+            summary = {}
+            for family, stats in self.__families.items():
+                family_summary = {key: value for key, value in stats.items() if key != 'phases'}
+                family_summary['phases'] = {phase: histogram.summary(quantiles)
+                                            for phase, histogram in stats['phases'].items()}
+                summary[family] = family_summary
+            return summary
+
+    # end summary()
+
+    def reset(self):
+        """
+        Discards everything collected so far.
+        :return: none
+        """
+        with self.__lock:
+            self.__families = {}
+
+    # end reset()
+
+# end class HistogramCollector
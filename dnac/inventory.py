@@ -0,0 +1,670 @@
+
+from dnac.dnacapi import DnacApiError
+from dnac.networkdevice import NetworkDevice, \
+                               DEFAULT_DEVICE_PAGE_SIZE, \
+                               NO_DEVICES, \
+                               CHECK_REGEX
+from dnac.projection import NO_PROJECTION, \
+                            projector, \
+                            project
+import bisect
+import fnmatch
+import functools
+import ipaddress
+import re
+import threading
+import time
+
+# globals
+
+MODULE = 'inventory.py'
+
+INVENTORY_CACHE = 'inventory'  # the cache's name in Dnac.metrics
+
+DEFAULT_INVENTORY_TTL = 300  # seconds between checks of Cisco DNAC's device count
+DEFAULT_INVENTORY_MAX_AGE = 3600  # seconds before the copy is reloaded even if the device count has not changed
+NEVER_LOADED = None
+
+# the identifiers indexed, by their keys in Cisco DNAC's device records
+ID = 'id'
+HOSTNAME = 'hostname'
+IP = 'managementIpAddress'
+MAC = 'macAddress'
+SERIAL = 'serialNumber'
+INDEXED_KEYS = (ID, HOSTNAME, IP, MAC, SERIAL)
+
+PATTERN_CACHE_SIZE = 256  # compiled regular expressions and globs kept for reuse
+
+# error messages
+UNKNOWN_IDENTIFIER = 'Devices are not indexed by'
+CHECK_MAC = 'Check the MAC address'
+CHECK_SERIAL = 'Check the serial number'
+ILLEGAL_NETWORK = 'Illegal network'
+CHECK_NETWORK = 'Use a CIDR block, e.g. 10.4.0.0/16'
+
+
+def normalize_mac(mac):
+    """
+    Puts a MAC address in the form Cisco DNAC's inventory uses, i.e. lower case and colon separated, so that, e.g.,
+    00:1A:2B:3C:4D:5E, 00-1a-2b-3c-4d-5e and 001a.2b3c.4d5e are all found.
+    :param mac: The MAC address.
+        type: str
+        required: yes
+        default: none
+    :return: str
+    """
+    digits = ''.join(c for c in mac.lower() if c in '0123456789abcdef')
+    if len(digits) != 12:
+        return mac.lower()
+    return ':'.join(digits[i:i + 2] for i in range(0, 12, 2))
+
+# end normalize_mac()
+
+
+@functools.lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def __compile_regex__(regex):
+    """
+    A hidden function that compiles a regular expression once, however many searches reuse it.
+    :return: compiled regular expression
+    """
+    return re.compile(regex)
+
+# end __compile_regex__()
+
+
+def compile_regex(regex):
+    """
+    Compiles a regular expression for searching an InventoryIndex.  Expressions already compiled are returned as they
+    are, and strings are compiled only the first time they are seen.
+    :param regex: The regular expression.
+        type: str or compiled regular expression
+        required: yes
+        default: none
+    :return: compiled regular expression
+    """
+    if isinstance(regex, str):
+        return __compile_regex__(regex)
+    return regex
+
+# end compile_regex()
+
+
+@functools.lru_cache(maxsize=PATTERN_CACHE_SIZE)
+def compile_glob(glob):
+    """
+    Compiles a shell-style wildcard pattern, e.g. sw-*-core-?, into a regular expression, once per pattern.
+    :param glob: The wildcard pattern.
+        type: str
+        required: yes
+        default: none
+    :return: compiled regular expression
+    """
+    return re.compile(fnmatch.translate(glob))
+
+# end compile_glob()
+
+
+class InventoryIndex(NetworkDevice):
+    """
+    The InventoryIndex class is a NetworkDevice that keeps a local copy of Cisco DNA Center's inventory.  It loads the
+    whole inventory with a single paged scan and indexes every device by its UUID, hostname, management IP address,
+    MAC address and serial number.  Lookups by any of them are then answered from the index rather than with an API
+    call each, so a loop over N devices costs one bulk fetch instead of N round trips.
+
+    Cisco DNAC cannot list only the devices changed since a given time, so the copy is never patched; it is either
+    used as it is or reloaded whole.  The first time it is used after ttl seconds, Cisco DNAC's device count is
+    checked, which costs a few bytes rather than the whole inventory, and the copy is reloaded only if the count no
+    longer matches it or the copy is older than max_age.  Changes to devices already in the copy therefore show up
+    within max_age seconds, or at once after load is called.  A device that is not in the index, e.g. one added to
+    Cisco DNAC since the last load, is looked up with the API as NetworkDevice would and then added to the index.
+    When the Dnac object records metrics, each lookup counts as a hit or a miss of the inventory cache.
+
+    The regular expression searches are answered from the local copy too, as are searches by wildcard pattern,
+    hostname prefix and subnet, so audit jobs running many patterns never make Cisco DNAC scan its inventory.
+
+    The devices returned are the index's own dicts, shared with every other caller, so treat them as read-only or use
+    a projection to get a copy.
+
+    Attributes:
+        ttl: The seconds the local copy is used before Cisco DNAC's device count is checked again.
+            type: float
+            default: DEFAULT_INVENTORY_TTL
+            scope: public
+        max_age: The seconds the local copy is used before it is reloaded, whatever the device count.
+            type: float
+            default: DEFAULT_INVENTORY_MAX_AGE
+            scope: public
+        page_size: The number of devices requested per call when loading.
+            type: int
+            default: DEFAULT_DEVICE_PAGE_SIZE
+            scope: protected
+        loaded: When the copy was last loaded in seconds since the epoch, or None if it has not been.
+            type: float
+            default: None
+            scope: protected
+
+    Usage:
+        d = Dnac()
+        inventory = InventoryIndex(d, 'inventory', ttl=600)
+        for device_id in config_archive.archive:
+            print(inventory.get_device_by_id(device_id)['hostname'])
+        device = inventory.lookup(MAC, '00:1a:2b:3c:4d:5e')
+        branch_switches = inventory.find_devices_in_network('10.4.0.0/16')
+    """
+
+    def __init__(self,
+                 dnac,
+                 name,
+                 ttl=DEFAULT_INVENTORY_TTL,
+                 max_age=DEFAULT_INVENTORY_MAX_AGE,
+                 page_size=DEFAULT_DEVICE_PAGE_SIZE,
+                 verify=False,
+                 timeout=5):
+        """
+        Creates a new InventoryIndex.  The inventory is not loaded until the first lookup, or until load is called.
+        :param dnac: A reference to the containing Dnac object.
+            type: Dnac object
+            default: none
+            required: yes
+        :param name: A user friendly name for finding this object in a Dnac instance.
+            type: str
+            default: none
+            required: yes
+        :param ttl: The seconds the local copy is used before Cisco DNAC's device count is checked again.
+            type: float
+            default: DEFAULT_INVENTORY_TTL
+            required: no
+        :param max_age: The seconds the local copy is used before it is reloaded, whatever the device count.
+            type: float
+            default: DEFAULT_INVENTORY_MAX_AGE
+            required: no
+        :param page_size: The number of devices requested per call when loading.
+            type: int
+            default: DEFAULT_DEVICE_PAGE_SIZE
+            required: no
+        :param verify: A flag used to check Cisco DNAC's certificate.
+            type: boolean
+            default: False
+            required: no
+        :param timeout: The number of seconds to wait for Cisco DNAC's response.
+            type: int
+            default: 5
+            required: no
+        """
+        self.ttl = ttl
+        self.max_age = max_age
+        self.__page_size = page_size
+        self.__lock = threading.Lock()
+        self.__loaded = NEVER_LOADED
+        self.__loaded_at = 0.0  # when the copy was loaded, on the monotonic clock
+        self.__expires = 0.0  # when to check the device count, on the monotonic clock
+        self.__stale = False
+        self.__indexes = {key: {} for key in INDEXED_KEYS}
+        self.__hostnames = None  # sorted hostnames, built when first searched by prefix
+        self.__addresses = None  # sorted (IP version, address, IP), built when first searched by network
+        super(InventoryIndex, self).__init__(dnac,
+                                             name,
+                                             verify=verify,
+                                             timeout=timeout)
+
+    # end __init__()
+
+    @property
+    def page_size(self):
+        """
+        Returns the number of devices requested per call when loading.
+        :return: int
+        """
+        return self.__page_size
+
+    # end page_size getter
+
+    @property
+    def loaded(self):
+        """
+        Returns when the copy was last loaded in seconds since the epoch, or None if it has not been.
+        :return: float
+        """
+        return self.__loaded
+
+    # end loaded getter
+
+    def __len__(self):
+        """
+        Gives the number of devices in the local copy.
+        :return: int
+        """
+        return len(self.__indexes[ID])
+
+    # end __len__()
+
+    @staticmethod
+    def __key__(key, value):
+        """
+        A hidden method that puts an identifier in the form it is indexed under.
+        :return: str
+        """
+        if key == MAC and value:
+            return normalize_mac(value)
+        return value
+
+    # end __key__()
+
+    def __index_device__(self, indexes, device):
+        """
+        A hidden method that indexes a device under each of its identifiers.
+        :return: none
+        """
+        for key, index in indexes.items():
+            value = device.get(key)
+            if value:
+                index[self.__key__(key, value)] = device
+
+    # end __index_device__()
+
+    def load(self):
+        """
+        Loads the whole inventory and rebuilds the indexes.  The new indexes replace the old ones at once, so lookups
+        made from other threads meanwhile are answered from the old copy.
+        :return: int, the number of devices loaded
+        """
+        with self.__lock:
+            return self.__load__()
+
+    # end load()
+
+    def __load__(self):
+        """
+        A hidden method behind load that expects the lock to be held.
+        :return: int, the number of devices loaded
+        """
+        indexes = {key: {} for key in INDEXED_KEYS}
+        for device in self.iter_all_devices(page_size=self.__page_size):
+            self.__index_device__(indexes, device)
+        self.__indexes = indexes
+        self.__hostnames = None
+        self.__addresses = None
+        self.__loaded = time.time()
+        self.__loaded_at = time.monotonic()
+        self.__expires = self.__loaded_at + self.ttl
+        self.__stale = False
+        return len(indexes[ID])
+
+    # end __load__()
+
+    def refresh(self):
+        """
+        Reloads the local copy if it may be out of date.  Cisco DNAC's device count is checked first, and the whole
+        inventory is only downloaded again if the count differs from the copy's, if the copy is older than max_age or
+        was invalidated, or if it has not been loaded yet.  Otherwise the copy is used for another ttl seconds.
+        :return: bool, True if the copy was reloaded
+        """
+        with self.__lock:
+            return self.__refresh__()
+
+    # end refresh()
+
+    def __refresh__(self):
+        """
+        A hidden method behind refresh that expects the lock to be held.
+        :return: bool, True if the copy was reloaded
+        """
+        if self.__loaded is NEVER_LOADED or self.__stale or time.monotonic() - self.__loaded_at >= self.max_age:
+            self.__load__()
+            return True
+        if self.get_device_count() != len(self.__indexes[ID]):
+            self.__load__()
+            return True
+        self.__expires = time.monotonic() + self.ttl
+        return False
+
+    # end __refresh__()
+
+    def invalidate(self):
+        """
+        Marks the local copy as stale so that the next lookup reloads it.
+        :return: none
+        """
+        self.__stale = True
+        self.__expires = 0.0
+
+    # end invalidate()
+
+    def __current__(self):
+        """
+        A hidden method that returns the indexes, refreshing them first if they have expired.
+        :return: dict
+        """
+        if time.monotonic() >= self.__expires:
+            with self.__lock:
+                if time.monotonic() >= self.__expires:  # unless another thread refreshed them meanwhile
+                    self.__refresh__()
+        return self.__indexes
+
+    # end __current__()
+
+    def __count__(self, hit):
+        """
+        A hidden method that records a lookup in the Dnac object's metrics, if it keeps any.
+        :return: none
+        """
+        if self.dnac.metrics is not None:
+            self.dnac.metrics.cache_lookup(INVENTORY_CACHE, hit)
+
+    # end __count__()
+
+    def lookup(self, key, value, projection=NO_PROJECTION):
+        """
+        Finds a device in the local copy without ever calling the API.
+        :param key: The identifier to search by: ID, HOSTNAME, IP, MAC or SERIAL.
+            type: str
+            required: yes
+            default: none
+        :param value: The identifier's value.
+            type: str
+            required: yes
+            default: none
+        :param projection: The fields to keep from the device: a list of keys or a callable.  See dnac.projection.
+            type: list of str or callable
+            required: no
+            default: None, which keeps every field
+        :return: dict, or whatever the projection returns, or None if the device is not in the local copy
+        """
+        indexes = self.__current__()
+        if key not in indexes:
+            raise DnacApiError(MODULE, 'lookup', '%s %s' % (UNKNOWN_IDENTIFIER, key), '',
+                               str(INDEXED_KEYS), key, '', '')
+        reduce = projector(projection)
+        device = indexes[key].get(self.__key__(key, value))
+        self.__count__(device is not None)
+        if device is None:
+            return None
+        return reduce(device)
+
+    # end lookup()
+
+    def __found__(self, device, projection):
+        """
+        A hidden method that adds a device found with the API to the local copy and projects it.
+        :return: dict, or whatever the projection returns
+        """
+        if isinstance(device, dict):
+            with self.__lock:
+                self.__index_device__(self.__indexes, device)
+                self.__hostnames = None
+                self.__addresses = None
+        return project(device, projection)
+
+    # end __found__()
+
+    def get_device_by_id(self, id, projection=NO_PROJECTION):
+        """
+        Finds a device by its UUID, from the local copy if it holds the device or else with the API.
+        :param id: The network device's UUID.
+            type: str
+            default: none
+            required: yes
+        :param projection: The fields to keep from the device: a list of keys or a callable.  See dnac.projection.
+            type: list of str or callable
+            default: None, which keeps every field
+            required: no
+        :return: dict
+        """
+        device = self.lookup(ID, id, projection=projection)
+        if device is None:
+            device = self.__found__(super(InventoryIndex, self).get_device_by_id(id), projection)
+        return device
+
+    # end get_device_by_id()
+
+    def get_device_by_name(self, name, projection=NO_PROJECTION):
+        """
+        Finds a device by its hostname, from the local copy if it holds the device or else with the API.
+        :param name: The device's hostname.
+            type: str
+            default: none
+            required: yes
+        :param projection: The fields to keep from the device: a list of keys or a callable.  See dnac.projection.
+            type: list of str or callable
+            default: None, which keeps every field
+            required: no
+        :return: dict
+        """
+        device = self.lookup(HOSTNAME, name, projection=projection)
+        if device is None:
+            device = self.__found__(super(InventoryIndex, self).get_device_by_name(name), projection)
+        return device
+
+    # end get_device_by_name()
+
+    def get_device_by_ip(self, ip, projection=NO_PROJECTION):
+        """
+        Finds a device by its management IP address, from the local copy if it holds the device or else with the API.
+        :param ip: The device's IP address.
+            type: str
+            default: none
+            required: yes
+        :param projection: The fields to keep from the device: a list of keys or a callable.  See dnac.projection.
+            type: list of str or callable
+            default: None, which keeps every field
+            required: no
+        :return: dict
+        """
+        device = self.lookup(IP, ip, projection=projection)
+        if device is None:
+            device = self.__found__(super(InventoryIndex, self).get_device_by_ip(ip), projection)
+        return device
+
+    # end get_device_by_ip()
+
+    def get_device_by_mac(self, mac, projection=NO_PROJECTION):
+        """
+        Finds a device in the local copy by its MAC address.  Cisco DNAC's inventory cannot be searched by MAC address,
+        so a device missing from the local copy is only found after the next reload.
+        :param mac: The device's MAC address in any common format.
+            type: str
+            default: none
+            required: yes
+        :param projection: The fields to keep from the device: a list of keys or a callable.  See dnac.projection.
+            type: list of str or callable
+            default: None, which keeps every field
+            required: no
+        :return: dict
+        """
+        device = self.lookup(MAC, mac, projection=projection)
+        if device is None:
+            raise DnacApiError(MODULE, 'get_device_by_mac', NO_DEVICES, '', '', mac, '', CHECK_MAC)
+        return device
+
+    # end get_device_by_mac()
+
+    def get_device_by_serial(self, serial, projection=NO_PROJECTION):
+        """
+        Finds a device in the local copy by its serial number.  A device missing from the local copy is only found
+        after the next reload.
+        :param serial: The device's serial number.
+            type: str
+            default: none
+            required: yes
+        :param projection: The fields to keep from the device: a list of keys or a callable.  See dnac.projection.
+            type: list of str or callable
+            default: None, which keeps every field
+            required: no
+        :return: dict
+        """
+        device = self.lookup(SERIAL, serial, projection=projection)
+        if device is None:
+            raise DnacApiError(MODULE, 'get_device_by_serial', NO_DEVICES, '', '', serial, '', CHECK_SERIAL)
+        return device
+
+    # end get_device_by_serial()
+
+    def __search__(self, key, pattern, projection):
+        """
+        A hidden method that finds every device whose identifier fully matches a compiled regular expression.
+        :return: list of dict, or of whatever the projection returns
+        """
+        reduce = projector(projection)
+        index = self.__current__()[key]
+        return [reduce(device) for value, device in list(index.items()) if pattern.fullmatch(value)]
+
+    # end __search__()
+
+    def get_devices_by_name_with_regex(self, regex, projection=NO_PROJECTION):
+        """
+        Searches the local copy for all devices whose hostname matches a regular expression.  Unlike NetworkDevice's
+        version, no API call is made, and the expression is compiled only once however often it is used.  As with
+        Cisco DNAC, the expression must match the whole hostname, e.g. .*core.* rather than core.
+        :param regex: A regular expression to find a device or set of network devices.
+            type: str or compiled regular expression
+            default: none
+            required: yes
+        :param projection: The fields to keep from each device: a list of keys or a callable.  See dnac.projection.
+            type: list of str or callable
+            default: None, which keeps every field
+            required: no
+        :return: list of dict
+        """
+        devices = self.__search__(HOSTNAME, compile_regex(regex), projection)
+        if not devices:
+            raise DnacApiError(MODULE, 'get_devices_by_name_with_regex', NO_DEVICES, '', '', str(regex), '',
+                               CHECK_REGEX)
+        return devices
+
+    # end get_devices_by_name_with_regex()
+
+    def get_devices_by_ip_with_regex(self, regex, projection=NO_PROJECTION):
+        """
+        Searches the local copy for all devices whose management IP address matches a regular expression.  No API
+        call is made.  Use find_devices_in_network to search by subnet instead.
+        :param regex: A regular expression of the IP addresses to search.
+            type: str or compiled regular expression
+            default: none
+            required: yes
+        :param projection: The fields to keep from each device: a list of keys or a callable.  See dnac.projection.
+            type: list of str or callable
+            default: None, which keeps every field
+            required: no
+        :return: list of dict
+        """
+        devices = self.__search__(IP, compile_regex(regex), projection)
+        if not devices:
+            raise DnacApiError(MODULE, 'get_devices_by_ip_with_regex', NO_DEVICES, '', '', str(regex), '',
+                               CHECK_REGEX)
+        return devices
+
+    # end get_devices_by_ip_with_regex()
+
+    def find_devices_by_glob(self, glob, key=HOSTNAME, projection=NO_PROJECTION):
+        """
+        Searches the local copy for all devices with an identifier matching a shell-style wildcard pattern, e.g.
+        find_devices_by_glob('sw-*-core-?').
+        :param glob: The wildcard pattern.
+            type: str
+            default: none
+            required: yes
+        :param key: The identifier to search: ID, HOSTNAME, IP or SERIAL.
+            type: str
+            default: HOSTNAME
+            required: no
+        :param projection: The fields to keep from each device: a list of keys or a callable.  See dnac.projection.
+            type: list of str or callable
+            default: None, which keeps every field
+            required: no
+        :return: list of dict, empty if none match
+        """
+        return self.__search__(key, compile_glob(glob), projection)
+
+    # end find_devices_by_glob()
+
+    def find_devices_by_prefix(self, prefix, projection=NO_PROJECTION):
+        """
+        Finds every device in the local copy whose hostname starts with a prefix, in hostname order.  The hostnames are
+        kept sorted, so the search takes time in proportion to the number of devices found rather than the size of
+        the inventory.
+        :param prefix: The start of the hostnames.
+            type: str
+            default: none
+            required: yes
+        :param projection: The fields to keep from each device: a list of keys or a callable.  See dnac.projection.
+            type: list of str or callable
+            default: None, which keeps every field
+            required: no
+        :return: list of dict, empty if none match
+        """
+        reduce = projector(projection)
+        index = self.__current__()[HOSTNAME]
+        hostnames = self.__hostnames
+        if hostnames is None:
+            with self.__lock:  # wait out any load so the sort sees the current index
+                index = self.__indexes[HOSTNAME]
+                hostnames = self.__hostnames = sorted(index)
+        devices = []
+        for hostname in hostnames[bisect.bisect_left(hostnames, prefix):]:
+            if not hostname.startswith(prefix):
+                break
+            if hostname in index:
+                devices.append(reduce(index[hostname]))
+        return devices
+
+    # end find_devices_by_prefix()
+
+    def find_devices_in_network(self, network, projection=NO_PROJECTION):
+        """
+        Finds every device in the local copy whose management IP address is in a subnet, in address order, e.g.
+        find_devices_in_network('10.4.0.0/16').  The addresses are kept sorted, so the search takes time in proportion
+        to the number of devices found rather than the size of the inventory.
+        :param network: The subnet in CIDR notation.  Host bits are ignored.
+            type: str
+            default: none
+            required: yes
+        :param projection: The fields to keep from each device: a list of keys or a callable.  See dnac.projection.
+            type: list of str or callable
+            default: None, which keeps every field
+            required: no
+        :return: list of dict, empty if none match
+        """
+        try:
+            network = ipaddress.ip_network(network, strict=False)
+        except ValueError:
+            raise DnacApiError(MODULE, 'find_devices_in_network', ILLEGAL_NETWORK, '', '', str(network), '',
+                               CHECK_NETWORK)
+        reduce = projector(projection)
+        index = self.__current__()[IP]
+        addresses = self.__addresses
+        if addresses is None:
+            with self.__lock:
+                index = self.__indexes[IP]
+                addresses = self.__addresses = self.__sort_addresses__(index)
+        first = (network.version, int(network.network_address), '')
+        last = int(network.broadcast_address)
+        devices = []
+        for version, address, ip in addresses[bisect.bisect_left(addresses, first):]:
+            if version != network.version or address > last:
+                break
+            if ip in index:
+                devices.append(reduce(index[ip]))
+        return devices
+
+    # end find_devices_in_network()
+
+    @staticmethod
+    def __sort_addresses__(index):
+        """
+        A hidden method that sorts the management IP addresses for searching by subnet, skipping any that are not IP
+        addresses.
+        :return: list of tuple
+        """
+        addresses = []
+        for ip in index:
+            try:
+                address = ipaddress.ip_address(ip)
+            except ValueError:
+                continue
+            addresses.append((address.version, int(address), ip))
+        addresses.sort()
+        return addresses
+
+    # end __sort_addresses__()
+
+# end class InventoryIndex
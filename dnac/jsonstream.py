@@ -0,0 +1,202 @@
+
+import codecs
+import json
+
+# globals
+
+MODULE = 'jsonstream.py'
+
+DEFAULT_CHUNK_SIZE = 65536  # bytes read from the socket at a time
+RESPONSE_KEY = 'response'  # the list most Cisco DNAC APIs return
+TOP_LEVEL = None  # the document itself is the list, e.g. the template listing
+WHITESPACE = ' \t\n\r'
+COMPACT_THRESHOLD = 65536  # drop consumed text once this many characters have been parsed
+
+# error messages
+MALFORMED_JSON = 'Malformed JSON in streamed response'
+LIST_NOT_FOUND = 'Streamed response does not contain the requested list'
+
+
+class JsonStreamError(ValueError):
+    """
+    The JsonStreamError exception class, derived from ValueError, indicates that a streamed response could not be
+    parsed or did not contain the list requested.
+
+    Attributes:
+        none
+    """
+
+    def __init__(self, msg):
+        """
+        JsonStreamError's __init__ method passes a message to its parent class.
+        :param msg: An error message indicating the problem.
+            type: str
+            required: yes
+            default: none
+        """
+        super(JsonStreamError, self).__init__(msg)
+
+# end class JsonStreamError
+
+# end exceptions
+
+
+class JsonStream(object):
+    """
+    The JsonStream class parses a JSON document as it arrives in chunks and yields the items of one of its lists, one
+    at a time.  Only the item being parsed is held in memory, so even an inventory of many thousands of devices can be
+    processed in constant space, starting before the download completes.
+
+    The list is either a member of the top-level object, e.g. 'response' or 'archiveResultlist', or the top-level
+    document itself.  Every other member of the top-level object is parsed and discarded.  Parsing stops at the end of
+    the list; anything after it is never read.
+
+    Attributes:
+        chunks: The document's raw bytes, in order.
+            type: iterable of bytes
+            default: none
+            scope: protected
+        key: The name of the list to stream, or TOP_LEVEL if the document is the list.
+            type: str
+            default: RESPONSE_KEY
+            scope: protected
+
+    Usage:
+        for device in JsonStream(resp.iter_content(DEFAULT_CHUNK_SIZE)):
+            print(device['hostname'])
+    """
+
+    def __init__(self, chunks, key=RESPONSE_KEY):
+        """
+        Creates a new JsonStream.
+        :param chunks: The document's raw bytes.
+            type: iterable of bytes
+            required: yes
+            default: none
+        :param key: The name of the list to stream, or TOP_LEVEL if the document is the list.
+            type: str
+            required: no
+            default: RESPONSE_KEY
+        """
+        self.__chunks = iter(chunks)
+        self.__key = key
+        self.__decoder = json.JSONDecoder()
+        self.__utf8 = codecs.getincrementaldecoder('utf-8')()
+        self.__buffer = ''
+        self.__pos = 0
+        self.__eof = False
+
+    # end __init__()
+
+    def __more__(self):
+        """
+        A hidden method that appends the next chunk to the buffer.
+        :return: bool, False once the document has been read completely
+        """
+        if self.__eof:
+            return False
+        if self.__pos > COMPACT_THRESHOLD:
+            self.__buffer = self.__buffer[self.__pos:]
+            self.__pos = 0
+        for chunk in self.__chunks:
+            if chunk:
+                self.__buffer += self.__utf8.decode(chunk)
+                return True
+        self.__buffer += self.__utf8.decode(b'', final=True)
+        self.__eof = True
+        return False
+
+    # end __more__()
+
+    def __peek__(self):
+        """
+        A hidden method that skips whitespace and returns the next character without consuming it.
+        :return: str, or an empty string at the end of the document
+        """
+        while True:
+            while self.__pos < len(self.__buffer) and self.__buffer[self.__pos] in WHITESPACE:
+                self.__pos += 1
+            if self.__pos < len(self.__buffer):
+                return self.__buffer[self.__pos]
+            if not self.__more__():
+                return ''
+
+    # end __peek__()
+
+    def __expect__(self, characters):
+        """
+        A hidden method that consumes the next character, which must be one of those given.
+        :return: str
+        """
+        character = self.__peek__()
+        if not character or character not in characters:
+            raise JsonStreamError('%s: expected one of %s at offset %i' % (MALFORMED_JSON, characters, self.__pos))
+        self.__pos += 1
+        return character
+
+    # end __expect__()
+
+    def __value__(self):
+        """
+        A hidden method that parses the next complete JSON value, reading more of the document as needed.  A value
+        that ends exactly at the end of the buffer could be a truncated number, so it is only accepted once more of
+        the document has been read or the document has ended.
+        :return: the decoded value
+        """
+        self.__peek__()
+        while True:
+            try:
+                value, end = self.__decoder.raw_decode(self.__buffer, self.__pos)
+                if end < len(self.__buffer) or self.__eof:
+                    self.__pos = end
+                    return value
+            except json.JSONDecodeError as error:
+                if self.__eof:
+                    raise JsonStreamError('%s: %s' % (MALFORMED_JSON, error))
+            self.__more__()
+
+    # end __value__()
+
+    def __find_list__(self):
+        """
+        A hidden method that advances to the opening bracket of the list to be streamed.
+        :return: bool, False if the document holds no such list
+        """
+        if self.__key is TOP_LEVEL:
+            self.__expect__('[')
+            return True
+        self.__expect__('{')
+        while True:
+            if self.__peek__() == '}':
+                return False
+            name = self.__value__()
+            self.__expect__(':')
+            if name == self.__key:
+                if self.__peek__() == '[':
+                    self.__pos += 1
+                    return True
+                self.__value__()  # the member is not a list, e.g. null
+                return False
+            self.__value__()  # skip members that are not being streamed
+            if self.__expect__(',}') == '}':
+                return False
+
+    # end __find_list__()
+
+    def __iter__(self):
+        """
+        Yields the list's items as they are parsed.  Raises a JsonStreamError if the document has no such list.
+        :return: generator
+        """
+        if not self.__find_list__():
+            raise JsonStreamError('%s: %s' % (LIST_NOT_FOUND, self.__key))
+        if self.__peek__() == ']':
+            return
+        while True:
+            yield self.__value__()
+            if self.__expect__(',]') == ']':
+                return
+
+    # end __iter__()
+
+# end class JsonStream
@@ -0,0 +1,724 @@
+
+from dnac.hooks import RequestHook, \
+                       Histogram, \
+                       DEFAULT_BUCKETS, \
+                       NO_STATUS, \
+                       TOTAL
+import threading
+
+# globals
+
+MODULE = 'metrics.py'
+
+# the Prometheus text exposition format
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+COUNTER = 'counter'
+GAUGE = 'gauge'
+HISTOGRAM = 'histogram'
+
+INFINITY = '+Inf'
+NO_LABELS = ()
+
+# label values for requests that never received a response and for cache lookups
+NO_RESPONSE = 'none'
+HIT = 'hit'
+MISS = 'miss'
+TOKEN_CACHE = 'token'
+
+# error messages
+METRIC_TYPE_CONFLICT = 'Metric is already registered with a different type or labels'
+WRONG_LABELS = 'Metric requires exactly the labels'
+
+
+class MetricsError(Exception):
+    """
+    The MetricsError exception class, derived from Exception, indicates that a metric was registered twice with
+    different definitions or was given the wrong labels.
+
+    Attributes:
+        none
+    """
+
+    def __init__(self, msg):
+        """
+        MetricsError's __init__ method passes a message to its parent class.
+        :param msg: An error message indicating the problem.
+            type: str
+            required: yes
+            default: none
+        """
+        super(MetricsError, self).__init__(msg)
+
+# end class MetricsError
+
+# end exceptions
+
+
+def escape(value):
+    """
+    Escapes a label value for the Prometheus text format.
+    :param value: The label's value.
+        type: str
+        required: yes
+        default: none
+    :return: str
+    """
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+# end escape()
+
+
+def format_labels(names, values, extra=NO_LABELS):
+    """
+    Formats a sample's labels, e.g. {cluster="dnac1",status="200"}.
+    :param names: The label names.
+        type: tuple of str
+        required: yes
+        default: none
+    :param values: The label values in the same order.
+        type: tuple
+        required: yes
+        default: none
+    :param extra: Additional (name, value) pairs, such as a histogram bucket's le.
+        type: tuple
+        required: no
+        default: ()
+    :return: str, empty if there are no labels
+    """
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ''
+    return '{%s}' % ','.join('%s="%s"' % (name, escape(value)) for name, value in pairs)
+
+# end format_labels()
+
+
+def format_value(value):
+    """
+    Formats a sample's value the way Prometheus expects.
+    :param value: The value.
+        type: float
+        required: yes
+        default: none
+    :return: str
+    """
+    if value == float('inf'):
+        return INFINITY
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+# end format_value()
+
+
+class Metric(object):
+    """
+    The Metric class is the base for the counters, gauges and histograms kept in a MetricsRegistry.  A metric has a
+    fixed set of label names, and it keeps one value for each combination of label values it is given.  Metrics are
+    safe to update from many threads.
+
+    Attributes:
+        name: The metric's name, e.g. dnac_requests_total.
+            type: str
+            scope: protected
+        help: A description of the metric.
+            type: str
+            scope: protected
+        labels: The metric's label names.
+            type: tuple of str
+            scope: protected
+    """
+
+    TYPE = None
+
+    def __init__(self, name, help, labels=NO_LABELS):
+        """
+        Creates a new metric.
+        :param name: The metric's name.
+            type: str
+            required: yes
+            default: none
+        :param help: A description of the metric.
+            type: str
+            required: yes
+            default: none
+        :param labels: The metric's label names.
+            type: tuple of str
+            required: no
+            default: ()
+        """
+        self.__name = name
+        self.__help = help
+        self.__labels = tuple(labels)
+        self._lock = threading.Lock()
+        self._values = {}
+
+    # end __init__()
+
+    @property
+    def name(self):
+        """
+        Returns the metric's name.
+        :return: str
+        """
+        return self.__name
+
+    # end name getter
+
+    @property
+    def help(self):
+        """
+        Returns the metric's description.
+        :return: str
+        """
+        return self.__help
+
+    # end help getter
+
+    @property
+    def labels(self):
+        """
+        Returns the metric's label names.
+        :return: tuple
+        """
+        return self.__labels
+
+    # end labels getter
+
+    def key(self, labels):
+        """
+        Orders a sample's label values to match the metric's label names.  Raises a MetricsError if any are missing
+        or unexpected.
+        :param labels: The label values by name.
+            type: dict
+            required: yes
+            default: none
+        :return: tuple
+        """
+        if len(labels) != len(self.__labels):
+            raise MetricsError('%s: %s: %s' % (WRONG_LABELS, self.__name, str(self.__labels)))
+        try:
+            return tuple(str(labels[name]) for name in self.__labels)
+        except KeyError:
+            raise MetricsError('%s: %s: %s' % (WRONG_LABELS, self.__name, str(self.__labels)))
+
+    # end key()
+
+    def value(self, **labels):
+        """
+        Returns the current value for a combination of labels, or zero if it has not been set.
+        :return: float
+        """
+        with self._lock:
+            return self._values.get(self.key(labels), 0)
+
+    # end value()
+
+    def samples(self):
+        """
+        Renders the metric's samples, one line each, in the Prometheus text format.
+        :return: list of str
+        """
+        with self._lock:
+            values = sorted(self._values.items())
+        return ['%s%s %s' % (self.__name, format_labels(self.__labels, key), format_value(value))
+                for key, value in values]
+
+    # end samples()
+
+    def render(self):
+        """
+        Renders the metric, including its HELP and TYPE lines, in the Prometheus text format.
+        :return: str
+        """
+        lines = ['# HELP %s %s' % (self.__name, self.__help.replace('\\', '\\\\').replace('\n', '\\n')),
+                 '# TYPE %s %s' % (self.__name, self.TYPE)]
+        lines.extend(self.samples())
+        return '\n'.join(lines)
+
+    # end render()
+
+# end class Metric
+
+
+class Counter(Metric):
+    """
+    A Counter is a value that only ever goes up, such as the number of requests sent.
+
+    Usage:
+        requests = registry.counter('dnac_requests_total', 'API calls made', ('cluster', 'status'))
+        requests.inc(cluster='dnac1', status=200)
+    """
+
+    TYPE = COUNTER
+
+    def inc(self, amount=1, **labels):
+        """
+        Increases the counter.
+        :param amount: How much to add.
+            type: float
+            required: no
+            default: 1
+        :param labels: The sample's label values by name.
+            type: dict
+            required: as many as the metric has
+            default: none
+        :return: none
+        """
+        key = self.key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    # end inc()
+
+    def set(self, value, **labels):
+        """
+        Sets the counter to a total kept elsewhere, e.g. XAuthToken.refreshes.  Use this only from a collector that
+        mirrors such a total.
+        :param value: The total.
+            type: float
+            required: yes
+            default: none
+        :return: none
+        """
+        key = self.key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    # end set()
+
+# end class Counter
+
+
+class Gauge(Counter):
+    """
+    A Gauge is a value that may go up and down, such as the number of calls in progress.
+
+    Usage:
+        in_flight = registry.gauge('dnac_requests_in_flight', 'API calls in progress', ('cluster',))
+        in_flight.inc(cluster='dnac1')
+        in_flight.dec(cluster='dnac1')
+    """
+
+    TYPE = GAUGE
+
+    def dec(self, amount=1, **labels):
+        """
+        Decreases the gauge.
+        :param amount: How much to subtract.
+            type: float
+            required: no
+            default: 1
+        :return: none
+        """
+        self.inc(-amount, **labels)
+
+    # end dec()
+
+# end class Gauge
+
+
+class HistogramMetric(Metric):
+    """
+    A HistogramMetric counts observations, such as request durations, into buckets, keeping a Histogram for each
+    combination of labels.  Buckets are rendered cumulatively, as Prometheus expects.
+
+    Usage:
+        latency = registry.histogram('dnac_request_duration_seconds', 'API call latency', ('cluster',))
+        latency.observe(0.42, cluster='dnac1')
+    """
+
+    TYPE = HISTOGRAM
+
+    def __init__(self, name, help, labels=NO_LABELS, buckets=DEFAULT_BUCKETS):
+        """
+        Creates a new HistogramMetric.
+        :param buckets: The buckets' upper bounds.
+            type: tuple of float
+            required: no
+            default: DEFAULT_BUCKETS
+        """
+        super(HistogramMetric, self).__init__(name, help, labels)
+        self.__buckets = tuple(buckets)
+
+    # end __init__()
+
+    @property
+    def buckets(self):
+        """
+        Returns the buckets' upper bounds.
+        :return: tuple
+        """
+        return self.__buckets
+
+    # end buckets getter
+
+    def observe(self, value, **labels):
+        """
+        Counts an observation.
+        :param value: The observation.
+            type: float
+            required: yes
+            default: none
+        :return: none
+        """
+        key = self.key(labels)
+        with self._lock:
+            histogram = self._values.get(key)
+            if histogram is None:
+                histogram = Histogram(self.__buckets)
+                self._values[key] = histogram
+            histogram.observe(value)
+
+    # end observe()
+
+    def value(self, **labels):
+        """
+        Returns the Histogram for a combination of labels, or None if nothing has been observed for them.
+        :return: Histogram object
+        """
+        with self._lock:
+            return self._values.get(self.key(labels))
+
+    # end value()
+
+    def samples(self):
+        """
+        Renders each histogram's cumulative buckets, sum and count.
+        :return: list of str
+        """
+        with self._lock:
+            values = sorted((key, (histogram.counts, histogram.sum, histogram.count))
+                            for key, histogram in self._values.items())
+        lines = []
+        for key, (counts, total, count) in values:
+            cumulative = 0
+            for bound, bucket in zip(self.__buckets + (float('inf'),), counts):
+                cumulative += bucket
+                le = (('le', format_value(bound)),)
+                lines.append('%s_bucket%s %i' % (self.name, format_labels(self.labels, key, le), cumulative))
+            labels = format_labels(self.labels, key)
+            lines.append('%s_sum%s %s' % (self.name, labels, format_value(total)))
+            lines.append('%s_count%s %i' % (self.name, labels, count))
+        return lines
+
+    # end samples()
+
+# end class HistogramMetric
+
+
+class MetricsRegistry(object):
+    """
+    The MetricsRegistry class holds a process's metrics and renders them in the Prometheus text format so that a
+    service built on the wrapper can expose them for scraping, e.g. from a /metrics route.  It needs no packages
+    beyond the standard library.
+
+    Registering a metric that already exists returns the existing one, so several Dnac objects can share one
+    registry and tell their series apart by the cluster label.  Collectors are called just before rendering to copy
+    in totals that other objects keep, e.g. the rate limiter's wait time.
+
+    Usage:
+        registry = MetricsRegistry()
+        d = Dnac(metrics=registry)
+
+        @app.route('/metrics')
+        def metrics():
+            response.content_type = CONTENT_TYPE
+            return registry.render()
+    """
+
+    def __init__(self):
+        """
+        Creates an empty MetricsRegistry.
+        """
+        self.__lock = threading.Lock()
+        self.__metrics = {}
+        self.__collectors = []
+
+    # end __init__()
+
+    @property
+    def metrics(self):
+        """
+        Returns the registered metrics by name.
+        :return: dict
+        """
+        with self.__lock:
+            return dict(self.__metrics)
+
+    # end metrics getter
+
+    def __register__(self, cls, name, help, labels, **kwargs):
+        """
+        A hidden method that returns the metric with the name given, creating it if need be.  Raises a MetricsError if
+        the name is taken by a metric of another type or with other labels.
+        :return: Metric object
+        """
+        with self.__lock:
+            metric = self.__metrics.get(name)
+            if metric is None:
+                metric = cls(name, help, labels, **kwargs)
+                self.__metrics[name] = metric
+            elif type(metric) is not cls or metric.labels != tuple(labels):
+                raise MetricsError('%s: %s' % (METRIC_TYPE_CONFLICT, name))
+            return metric
+
+    # end __register__()
+
+    def counter(self, name, help, labels=NO_LABELS):
+        """
+        Registers a Counter, or returns the one already registered under the name.
+        :param name: The metric's name, which by convention ends in _total.
+            type: str
+            required: yes
+            default: none
+        :param help: A description of the metric.
+            type: str
+            required: yes
+            default: none
+        :param labels: The metric's label names.
+            type: tuple of str
+            required: no
+            default: ()
+        :return: Counter object
+        """
+        return self.__register__(Counter, name, help, labels)
+
+    # end counter()
+
+    def gauge(self, name, help, labels=NO_LABELS):
+        """
+        Registers a Gauge, or returns the one already registered under the name.  See counter for the parameters.
+        :return: Gauge object
+        """
+        return self.__register__(Gauge, name, help, labels)
+
+    # end gauge()
+
+    def histogram(self, name, help, labels=NO_LABELS, buckets=DEFAULT_BUCKETS):
+        """
+        Registers a HistogramMetric, or returns the one already registered under the name.  See counter for the other
+        parameters.
+        :param buckets: The buckets' upper bounds.
+            type: tuple of float
+            required: no
+            default: DEFAULT_BUCKETS
+        :return: HistogramMetric object
+        """
+        return self.__register__(HistogramMetric, name, help, labels, buckets=buckets)
+
+    # end histogram()
+
+    def add_collector(self, collector):
+        """
+        Adds a function that is called without arguments before each rendering to bring metrics up to date.
+        :param collector: The function.
+            type: callable
+            required: yes
+            default: none
+        :return: none
+        """
+        with self.__lock:
+            self.__collectors.append(collector)
+
+    # end add_collector()
+
+    def remove_collector(self, collector):
+        """
+        Removes a collector added earlier.  Removing a collector that is not registered does nothing.
+        :param collector: The function.
+            type: callable
+            required: yes
+            default: none
+        :return: none
+        """
+        with self.__lock:
+            if collector in self.__collectors:
+                self.__collectors.remove(collector)
+
+    # end remove_collector()
+
+    def render(self):
+        """
+        Brings the collected metrics up to date and renders every metric in the Prometheus text format.
+        :return: str
+        """
+        with self.__lock:
+            collectors = list(self.__collectors)
+            metrics = [self.__metrics[name] for name in sorted(self.__metrics)]
+        for collector in collectors:
+            collector()
+        return ''.join('%s\n' % metric.render() for metric in metrics)
+
+    # end render()
+
+# end class MetricsRegistry
+
+
+class ClusterMetrics(RequestHook):
+    """
+    The ClusterMetrics class records a Dnac object's API traffic in a MetricsRegistry under the cluster's name.  A
+    Dnac object given a registry creates one and installs it as a RequestHook.  It maintains:
+
+        dnac_requests_total: API calls by method, endpoint and final status ("none" if no response arrived).
+        dnac_request_duration_seconds: API call latency by method and endpoint, including retries.
+        dnac_request_retries_total: Attempts beyond the first by method and endpoint.
+        dnac_response_bytes_total: Bytes received by endpoint.
+        dnac_rate_limiter_wait_seconds_total and dnac_rate_limiter_throttled_total: Pacing by endpoint family.
+        dnac_token_refreshes_total: Renewals of the x-auth-token.
+        dnac_task_polls_total: Checks on the progress of Cisco DNAC tasks.
+        dnac_cache_requests_total: Cache lookups by cache and result, i.e. hit or miss.
+
+    Endpoints are URL templates, e.g. /api/v1/network-device/{id}, so the number of series stays bounded.
+
+    Attributes:
+        registry: The registry the metrics are kept in.
+            type: MetricsRegistry object
+            scope: protected
+        cluster: The value of the cluster label.
+            type: str
+            scope: protected
+    """
+
+    def __init__(self, registry, dnac):
+        """
+        Creates a new ClusterMetrics object and registers its metrics and collector.
+        :param registry: The registry to keep the metrics in.
+            type: MetricsRegistry object
+            required: yes
+            default: none
+        :param dnac: The cluster whose traffic is measured.
+            type: Dnac object
+            required: yes
+            default: none
+        """
+        self.__registry = registry
+        self.__dnac = dnac
+        self.__cluster = dnac.name or dnac.ip
+        endpoint = ('cluster', 'method', 'endpoint')
+        self.__requests = registry.counter('dnac_requests_total',
+                                           'API calls made to Cisco DNA Center.',
+                                           endpoint + ('status',))
+        self.__latency = registry.histogram('dnac_request_duration_seconds',
+                                            'API call latency in seconds, including retries.',
+                                            endpoint)
+        self.__retries = registry.counter('dnac_request_retries_total',
+                                          'API call attempts beyond the first.',
+                                          endpoint)
+        self.__bytes = registry.counter('dnac_response_bytes_total',
+                                        'Response bytes received from Cisco DNA Center.',
+                                        ('cluster', 'endpoint'))
+        self.__limiter_wait = registry.counter('dnac_rate_limiter_wait_seconds_total',
+                                               'Seconds API calls waited for the rate limiter.',
+                                               ('cluster', 'family'))
+        self.__limiter_throttled = registry.counter('dnac_rate_limiter_throttled_total',
+                                                    'API calls the rate limiter made wait.',
+                                                    ('cluster', 'family'))
+        self.__token_refreshes = registry.counter('dnac_token_refreshes_total',
+                                                  'Renewals of the x-auth-token.',
+                                                  ('cluster',))
+        self.__task_polls = registry.counter('dnac_task_polls_total',
+                                             'Checks on the progress of Cisco DNA Center tasks.',
+                                             ('cluster',))
+        self.__cache = registry.counter('dnac_cache_requests_total',
+                                        'Cache lookups by cache and result.',
+                                        ('cluster', 'cache', 'result'))
+        registry.add_collector(self.collect)
+
+    # end __init__()
+
+    @property
+    def registry(self):
+        """
+        Returns the registry the metrics are kept in.
+        :return: MetricsRegistry object
+        """
+        return self.__registry
+
+    # end registry getter
+
+    @property
+    def cluster(self):
+        """
+        Returns the value of the cluster label.
+        :return: str
+        """
+        return self.__cluster
+
+    # end cluster getter
+
+    def after_response(self, event):
+        """
+        Records a completed API call.
+        :param event: The call's event.
+            type: RequestEvent object
+            required: yes
+            default: none
+        :return: none
+        """
+        status = NO_RESPONSE if event.status is NO_STATUS else event.status
+        self.__requests.inc(cluster=self.__cluster, method=event.method, endpoint=event.template, status=status)
+        self.__latency.observe(event.phases[TOTAL], cluster=self.__cluster, method=event.method,
+                               endpoint=event.template)
+        if event.attempts > 1:
+            self.__retries.inc(event.attempts - 1, cluster=self.__cluster, method=event.method,
+                               endpoint=event.template)
+        if event.response_bytes:
+            self.__bytes.inc(event.response_bytes, cluster=self.__cluster, endpoint=event.template)
+
+    # end after_response()
+
+    def task_polled(self):
+        """
+        Counts a check on a task's progress.
+        :return: none
+        """
+        self.__task_polls.inc(cluster=self.__cluster)
+
+    # end task_polled()
+
+    def cache_lookup(self, cache, hit):
+        """
+        Counts a cache lookup.
+        :param cache: The cache's name, e.g. token.
+            type: str
+            required: yes
+            default: none
+        :param hit: A flag indicating whether the lookup found what it was looking for.
+            type: bool
+            required: yes
+            default: none
+        :return: none
+        """
+        self.__cache.inc(cluster=self.__cluster, cache=cache, result=HIT if hit else MISS)
+
+    # end cache_lookup()
+
+    def collect(self):
+        """
+        Copies the totals kept by the cluster's XAuthToken and RateLimiter into the registry.  The registry calls this
+        before rendering.
+        :return: none
+        """
+        xauth = self.__dnac.xauth
+        self.__token_refreshes.set(xauth.refreshes, cluster=self.__cluster)
+        if xauth.cache is not None:
+            self.__cache.set(xauth.cache_hits, cluster=self.__cluster, cache=TOKEN_CACHE, result=HIT)
+            self.__cache.set(xauth.cache_misses, cluster=self.__cluster, cache=TOKEN_CACHE, result=MISS)
+        for family, bucket in self.__dnac.limiter.metrics.items():
+            self.__limiter_wait.set(bucket['total_wait'], cluster=self.__cluster, family=family)
+            self.__limiter_throttled.set(bucket['throttled'], cluster=self.__cluster, family=family)
+
+    # end collect()
+
+    def close(self):
+        """
+        Stops copying the cluster's totals into the registry.  The series already recorded remain.
+        :return: none
+        """
+        self.__registry.remove_collector(self.collect)
+
+    # end close()
+
+# end class ClusterMetrics
@@ -1,32 +1,35 @@
 
 from dnac import DnacError, \
-                 SUPPORTED_DNAC_VERSIONS, \
                  UNSUPPORTED_DNAC_VERSION
+from dnac.routes import NETWORK_DEVICE, \
+                        DEVICE_DETAIL, \
+                        resource_paths
 from dnac.dnacapi import DnacApi, \
                          DnacApiError
 from dnac.crud import OK, \
                       REQUEST_NOT_OK, \
                       ERROR_MSGS
 from dnac.timestamp import TimeStamp
+from dnac.projection import NO_PROJECTION, \
+                            projector, \
+                            project
+from concurrent.futures import ThreadPoolExecutor, \
+                               as_completed
 
 MODULE = 'networkdevice.py'
 
-NETWORK_DEVICE_RESOURCE_PATH = {
-    '1.2.8': '/dna/intent/api/v1/network-device',
-    '1.2.10': '/dna/intent/api/v1/network-device',
-    '1.3.0.2': '/api/v1/network-device',
-    '1.3.0.3': '/api/v1/network-device',
-    '1.3.1.3': '/api/v1/network-device',
-    '1.3.1.4': '/api/v1/network-device'
-}
+NETWORK_DEVICE_RESOURCE_PATH = resource_paths(NETWORK_DEVICE)
 
-DEVICE_DETAIL_RESOURCE_PATH = {
-    '1.2.10': '/dna/intent/api/v1/device-detail',
-    '1.3.0.2': '/api/v1/device-detail',
-    '1.3.0.3': '/api/v1/device-detail',
-    '1.3.1.3': '/api/v1/device-detail',
-    '1.3.1.4': '/api/v1/device-detail'
-}
+DEVICE_DETAIL_RESOURCE_PATH = resource_paths(DEVICE_DETAIL)
+
+# the inventory is paged with /network-device/<start index>/<records to return>, indexed from one
+DEVICE_PAGE_SUB_RESOURCE_PATH = '/%i/%i'
+FIRST_DEVICE_INDEX = 1
+DEFAULT_DEVICE_PAGE_SIZE = 500
+MAX_DEVICE_PAGE_SIZE = 500  # Cisco DNAC returns no more than this many devices per call
+DEVICE_COUNT_SUB_RESOURCE_PATH = '/count'
+
+DEFAULT_DETAIL_WORKERS = 10  # threads fetching device details at once for get_device_details_bulk
 
 DEVICE_DETAIL_IDENTIFIERS = {
     'mac': 'macAddress',
@@ -39,6 +42,10 @@ NO_DEVICES = 'API response list is empty'
 CHECK_HOSTNAME = 'Check the hostname'
 CHECK_IP = 'Check the management IP address'
 CHECK_REGEX = 'Check the regular expression'
+ILLEGAL_PAGE_SIZE = 'Illegal page size'
+CHECK_PAGE_SIZE = 'Use a page size from 1 to %i' % MAX_DEVICE_PAGE_SIZE
+ILLEGAL_IDENTIFIER = 'Illegal device detail identifier'
+CHECK_IDENTIFIER = 'Use one of %s' % ', '.join(sorted(DEVICE_DETAIL_IDENTIFIERS))
 
 
 class NetworkDevice(DnacApi):
@@ -125,12 +132,9 @@ class NetworkDevice(DnacApi):
             default: 5
             required: no
         """
-        if dnac.version in SUPPORTED_DNAC_VERSIONS:
-            path = NETWORK_DEVICE_RESOURCE_PATH[dnac.version]
-        else:
-            raise DnacError('%s: __init__: %s: %s' % (MODULE, UNSUPPORTED_DNAC_VERSION, dnac.version))
-        if dnac.version in DEVICE_DETAIL_RESOURCE_PATH:
-            self.__detail_resource = DEVICE_DETAIL_RESOURCE_PATH[dnac.version]
+        path = dnac.routes.path(NETWORK_DEVICE)
+        if DEVICE_DETAIL in dnac.routes:
+            self.__detail_resource = dnac.routes.path(DEVICE_DETAIL)
         else:
             self.__detail_resource = None
         self.__devices = None  # API returns list or dict based on the call
@@ -174,33 +178,197 @@ class NetworkDevice(DnacApi):
 
     # end device_detail getter
 
-    def get_all_devices(self):
+    def get_all_devices(self, projection=NO_PROJECTION):
+        """
+        The get_all_devices method returns every network device managed by Cisco DNA Center.  A single call to Cisco
+        DNAC returns no more than MAX_DEVICE_PAGE_SIZE devices, so the inventory is retrieved a page at a time with
+        iter_all_devices, and each page is streamed rather than decoded whole.  When given a projection, each device
+        is reduced to the fields requested as soon as it is parsed, so the full device records are never held in
+        memory together.
+        :param projection: The fields to keep from each device: a list of keys or a callable, e.g. a record class's
+                           from_dict.  See dnac.projection.
+            type: list of str or callable
+            default: None, which keeps every field
+            required: no
+        :return: list of dict, or of whatever the projection returns
         """
-        The get_all_devices method returns every network device managed by Cisco DNA Center.
-        :return: list of dict
+        self.__devices = list(self.iter_all_devices(projection=projection))
+        return self.__devices
+
+    # end get_all_devices()
+
+    async def get_all_devices_async(self, projection=NO_PROJECTION):
         """
-        url = self.dnac.url + self.resource
-        devices, status = self.crud.get(url,
-                                        headers=self.dnac.hdrs,
-                                        verify=self.verify,
-                                        timeout=self.timeout)
+        Coroutine version of get_all_devices.  The pages are requested one after another, and each is decoded whole
+        and then projected.
+        :param projection: The fields to keep from each device: a list of keys or a callable, e.g. a record class's
+                           from_dict.  See dnac.projection.
+            type: list of str or callable
+            default: None, which keeps every field
+            required: no
+        :return: list of dict, or of whatever the projection returns
+        """
+        reduce = projector(projection)  # reject a bad projection before placing the first call
+        all_devices = []
+        start = FIRST_DEVICE_INDEX
+        while True:
+            url = '%s%s%s' % (self.dnac.url,
+                              self.resource,
+                              DEVICE_PAGE_SUB_RESOURCE_PATH % (start, MAX_DEVICE_PAGE_SIZE))
+            devices, status = await self.acrud.get(url,
+                                                   headers=await self.dnac.hdrs_async(),
+                                                   verify=self.verify,
+                                                   timeout=self.timeout)
+            if status != OK:
+                raise DnacApiError(
+                    MODULE, 'get_all_devices_async', REQUEST_NOT_OK, url,
+                    OK, status, ERROR_MSGS[status], str(devices)
+                                  )
+            page = devices['response']
+            all_devices.extend(reduce(device) for device in page)
+            if len(page) < MAX_DEVICE_PAGE_SIZE:
+                break
+            start += MAX_DEVICE_PAGE_SIZE
+        self.__devices = all_devices
+        return self.__devices
+
+    # end get_all_devices_async()
+
+    def stream_all_devices(self, projection=NO_PROJECTION):
+        """
+        The stream_all_devices method yields every network device managed by Cisco DNA Center one at a time as the
+        inventory downloads.  It pages through the inventory with iter_all_devices, so no more than two pages are
+        held in memory at once.  Unlike get_all_devices, the devices are not saved in the devices attribute, which
+        makes it suitable for very large networks.
+        :param projection: The fields to keep from each device: a list of keys or a callable, e.g. a record class's
+                           from_dict.  See dnac.projection.
+            type: list of str or callable
+            default: None, which keeps every field
+            required: no
+        :return: generator of dict, or of whatever the projection returns
+        """
+        return self.iter_all_devices(projection=projection)
+
+    # end stream_all_devices()
+
+    def iter_all_devices(self, page_size=DEFAULT_DEVICE_PAGE_SIZE, prefetch=True, projection=NO_PROJECTION):
+        """
+        The iter_all_devices method yields every network device managed by Cisco DNA Center one at a time, walking the
+        inventory a page at a time.  A single call to Cisco DNAC returns no more than MAX_DEVICE_PAGE_SIZE devices,
+        but this returns the whole inventory however large, and only holds one or two pages in memory.  Each page is
+        streamed and its devices projected as they are parsed, so a page's raw response is never decoded whole.  With
+        prefetch set, the next page is requested on a worker thread of the iterator's own while the caller works
+        through the current one; the thread is not one of the connection pool's, so iterating from one of those
+        workers cannot wait on a request queued behind itself.  The devices are not saved in the devices attribute.
+        :param page_size: The number of devices requested per call.
+            type: int
+            default: DEFAULT_DEVICE_PAGE_SIZE
+            required: no
+        :param prefetch: A flag indicating whether or not to request the next page while the current one is used.
+            type: bool
+            default: True
+            required: no
+        :param projection: The fields to keep from each device: a list of keys or a callable, e.g. a record class's
+                           from_dict.  See dnac.projection.
+            type: list of str or callable
+            default: None, which keeps every field
+            required: no
+        :return: generator of dict, or of whatever the projection returns
+        """
+        if not FIRST_DEVICE_INDEX <= page_size <= MAX_DEVICE_PAGE_SIZE:
+            raise DnacApiError(MODULE, 'iter_all_devices', ILLEGAL_PAGE_SIZE, '', '', page_size, '', CHECK_PAGE_SIZE)
+        reduce = projector(projection)  # reject a bad projection before placing the first call
+        return self.__iter_device_pages__(page_size, prefetch, reduce)
+
+    # end iter_all_devices()
+
+    def __get_device_page__(self, start, page_size, reduce):
+        """
+        A hidden method that streams one page of the inventory, projecting each device as it is parsed.
+        :param start: The index of the page's first device, counting from FIRST_DEVICE_INDEX.
+        :param page_size: The number of devices to request.
+        :param reduce: The function that projects each device.
+        :return: list of dict, or of whatever the projection returns
+        """
+        url = '%s%s%s' % (self.dnac.url, self.resource, DEVICE_PAGE_SUB_RESOURCE_PATH % (start, page_size))
+        devices, status = self.crud.stream(url,
+                                           headers=self.dnac.hdrs,
+                                           verify=self.verify,
+                                           timeout=self.timeout)
         if status != OK:
             raise DnacApiError(
-                MODULE, 'get_all_devices', REQUEST_NOT_OK, url,
+                MODULE, 'iter_all_devices', REQUEST_NOT_OK, url,
                 OK, status, ERROR_MSGS[status], str(devices)
                               )
-        self.__devices = devices['response']
-        return self.__devices
+        return [reduce(device) for device in devices]
+
+    # end __get_device_page__()
+
+    def __iter_device_pages__(self, page_size, prefetch, reduce):
+        """
+        A hidden generator behind iter_all_devices.  A page shorter than page_size is the last one.
+        :return: generator
+        """
+        start = FIRST_DEVICE_INDEX
+        page = self.__get_device_page__(start, page_size, reduce)
+        next_page = None
+        prefetcher = None
+        try:
+            while True:
+                start += page_size
+                if prefetch and len(page) == page_size:
+                    if prefetcher is None:
+                        prefetcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix='dnac-prefetch')
+                    next_page = prefetcher.submit(self.__get_device_page__, start, page_size, reduce)
+                for device in page:
+                    yield device
+                if len(page) < page_size:
+                    return
+                if next_page is not None:
+                    page = next_page.result()
+                    next_page = None
+                else:
+                    page = self.__get_device_page__(start, page_size, reduce)
+        finally:
+            if next_page is not None:  # the caller stopped early
+                next_page.cancel()
+            if prefetcher is not None:
+                prefetcher.shutdown(wait=False)
+
+    # end __iter_device_pages__()
+
+    def get_device_count(self):
+        """
+        The get_device_count method gives the number of network devices managed by Cisco DNA Center without
+        retrieving them.
+        :return: int
+        """
+        url = '%s%s%s' % (self.dnac.url, self.resource, DEVICE_COUNT_SUB_RESOURCE_PATH)
+        count, status = self.crud.get(url,
+                                      headers=self.dnac.hdrs,
+                                      verify=self.verify,
+                                      timeout=self.timeout)
+        if status != OK:
+            raise DnacApiError(
+                MODULE, 'get_device_count', REQUEST_NOT_OK, url,
+                OK, status, ERROR_MSGS[status], str(count)
+                              )
+        return count['response']
 
-    # end get_all_devices()
+    # end get_device_count()
 
-    def get_device_by_id(self, id):
+    def get_device_by_id(self, id, projection=NO_PROJECTION):
         """
         get_device_by_id finds a device in Cisco DNAC using its UUID.
         :param id: The network device's UUID.
             type: str
             default: none
             required: yes
+        :param projection: The fields to keep from each device: a list of keys or a callable, e.g. a record class's
+                           from_dict.  See dnac.projection.
+            type: list of str or callable
+            default: None, which keeps every field
+            required: no
         :return: list with a single dict
         """
         url = self.dnac.url + self.resource + ('/%s' % id)
@@ -213,18 +381,23 @@ class NetworkDevice(DnacApi):
                 MODULE, 'get_device_by_id', REQUEST_NOT_OK, url,
                 OK, status, ERROR_MSGS[status], str(devices)
                               )
-        self.__devices = devices['response']
+        self.__devices = project(devices['response'], projection)
         return self.__devices
 
     # end det_device_by_id()
 
-    def get_device_by_name(self, name):
+    def get_device_by_name(self, name, projection=NO_PROJECTION):
         """
         get_device_by_name finds a device in Cisco DNAC using its hostname.
         :param name: The device's hostname.
             type : str
             default: none
             required: yes
+        :param projection: The fields to keep from each device: a list of keys or a callable, e.g. a record class's
+                           from_dict.  See dnac.projection.
+            type: list of str or callable
+            default: None, which keeps every field
+            required: no
         :return: list with a single dict
         """
         host_filter = '?hostname=' + name
@@ -243,12 +416,12 @@ class NetworkDevice(DnacApi):
                 MODULE, 'get_device_by_name', NO_DEVICES, url,
                 '', str(devices['response']), '', CHECK_HOSTNAME
                               )
-        self.__devices = devices['response'][0]
+        self.__devices = project(devices['response'][0], projection)
         return self.__devices
 
     # end get_device_by_name()
 
-    def get_devices_by_name_with_regex(self, regex):
+    def get_devices_by_name_with_regex(self, regex, projection=NO_PROJECTION):
         """
         The get_devices_by_name_with_regex searches through Cisco DNA Center's inventory for all devices whose hostname
         matches the regular expression it is given.
@@ -256,6 +429,11 @@ class NetworkDevice(DnacApi):
             type: str
             default: none
             required: yes
+        :param projection: The fields to keep from each device: a list of keys or a callable, e.g. a record class's
+                           from_dict.  See dnac.projection.
+            type: list of str or callable
+            default: None, which keeps every field
+            required: no
         :return: list of dict
         """
         host_filter = '?hostname=' + regex
@@ -274,7 +452,7 @@ class NetworkDevice(DnacApi):
                 MODULE, 'get_devices_by_name_with_regex(', NO_DEVICES, url,
                 '', str(devices['response']), '', CHECK_REGEX
             )
-        self.__devices = devices['response']
+        self.__devices = project(devices['response'], projection)
         return self.__devices
 
     # end get_device_by_name_with_regex
@@ -293,13 +471,18 @@ class NetworkDevice(DnacApi):
 
     # end get_id_by_device_name()
 
-    def get_device_by_ip(self, ip):
+    def get_device_by_ip(self, ip, projection=NO_PROJECTION):
         """
         get_device_by_ip finds a device in Cisco DNAC using its managed IP address.
         :param ip: The device's IP address.
             type: str
             default: none
             required: yest
+        :param projection: The fields to keep from each device: a list of keys or a callable, e.g. a record class's
+                           from_dict.  See dnac.projection.
+            type: list of str or callable
+            default: None, which keeps every field
+            required: no
         :return:
         """
         url = self.dnac.url + self.resource + \
@@ -318,12 +501,12 @@ class NetworkDevice(DnacApi):
                 MODULE, 'get_device_by_ip', NO_DEVICES, url,
                 '', str(devices['response']), '', CHECK_IP
                               )
-        self.__devices = devices['response'][0]
+        self.__devices = project(devices['response'][0], projection)
         return self.__devices
 
     # end get_device_by_ip()
 
-    def get_devices_by_ip_with_regex(self, regex):
+    def get_devices_by_ip_with_regex(self, regex, projection=NO_PROJECTION):
         """
         The get_devices_by_ip_with_regex searches through Cisco DNA Center's inventory for all devices whose
         management IP address matches the regular expression passed.
@@ -331,6 +514,11 @@ class NetworkDevice(DnacApi):
             type: str
             default: none
             required: yes
+        :param projection: The fields to keep from each device: a list of keys or a callable, e.g. a record class's
+                           from_dict.  See dnac.projection.
+            type: list of str or callable
+            default: None, which keeps every field
+            required: no
         :return: list of dict
         """
         url = self.dnac.url + self.resource + \
@@ -349,7 +537,7 @@ class NetworkDevice(DnacApi):
                 MODULE, 'get_devices_by_ip_with_regex', NO_DEVICES, url,
                 '', str(devices['response']), '', CHECK_REGEX
             )
-        self.__devices = devices['response']
+        self.__devices = project(devices['response'], projection)
         return self.__devices
 
 
@@ -530,5 +718,108 @@ class NetworkDevice(DnacApi):
 
     # end get_device_detail_by_mac()
 
+    def __get_device_detail__(self, search_by, identifier, time):
+        """
+        A hidden method that retrieves one device's detail as of a given time for get_device_details_bulk.
+        :return: dict
+        """
+        query = '?timestamp=%s&searchBy=%s&identifier=%s' % (time, search_by, identifier)
+        url = self.dnac.url + self.__detail_resource + query
+        detail, status = self.crud.get(url,
+                                       headers=self.dnac.hdrs,
+                                       verify=self.verify,
+                                       timeout=self.timeout)
+        if status != OK:
+            raise DnacApiError(
+                MODULE, 'get_device_details_bulk', REQUEST_NOT_OK, url,
+                OK, status, ERROR_MSGS[status], str(detail)
+                              )
+        return detail['response']
+
+    # end __get_device_detail__()
+
+    def get_device_details_bulk(self,
+                                identifiers,
+                                identifier='id',
+                                ordered=True,
+                                time=None,
+                                workers=DEFAULT_DETAIL_WORKERS):
+        """
+        get_device_details_bulk retrieves the detailed configuration state and health of many devices at once.  The
+        requests run concurrently on up to workers threads started for the call, paced by the Dnac object's rate
+        limiter's device-detail limit (DEVICE_DETAIL_API_THROTTLE requests per minute by default; see Dnac's
+        rate_limits), and all ask for the devices' state at the same moment so that the results form one consistent
+        view of the network.  The threads are not the connection pool's, so the method may be called from one of
+        the pool's workers, e.g. through AsyncCrud.call, without waiting on requests queued behind itself.  If any
+        request fails, the requests not yet started are cancelled and its DnacApiError is raised.
+        :param identifiers: The devices' UUIDs, hostnames or MAC addresses.
+            type: list of str
+            default: none
+            required: yes
+        :param identifier: What the identifiers are: 'id', 'name' or 'mac'.
+            type: str
+            default: 'id'
+            required: no
+        :param ordered: A flag indicating whether to return the details in the order of identifiers, once all have
+                        arrived, or to yield them as they arrive.
+            type: bool
+            default: True
+            required: no
+        :param time: The moment the devices' state is requested for.
+            type: TimeStamp object
+            default: None, meaning now
+            required: no
+        :param workers: The most requests in flight at once.
+            type: int
+            default: DEFAULT_DETAIL_WORKERS
+            required: no
+        :return: list of dict if ordered, otherwise a generator of (identifier, dict) tuples
+        """
+        if not self.__detail_resource:
+            raise DnacError(
+                'get_device_details_bulk: %s: %s' %
+                (UNSUPPORTED_DNAC_VERSION, self.dnac.version)
+            )
+        if identifier not in DEVICE_DETAIL_IDENTIFIERS:
+            raise DnacApiError(MODULE, 'get_device_details_bulk', ILLEGAL_IDENTIFIER, '', '', identifier, '',
+                               CHECK_IDENTIFIER)
+        if time is None:
+            time = TimeStamp()
+        identifiers = list(identifiers)
+        executor = ThreadPoolExecutor(max_workers=max(1, min(workers, len(identifiers))),
+                                      thread_name_prefix='dnac-detail')
+        futures = [(search_by, executor.submit(self.__get_device_detail__, search_by,
+                                               DEVICE_DETAIL_IDENTIFIERS[identifier], time))
+                   for search_by in identifiers]
+        if ordered:
+            try:
+                return [future.result() for search_by, future in futures]
+            finally:
+                for search_by, future in futures:
+                    future.cancel()
+                executor.shutdown(wait=False)
+        return self.__iter_device_details__(executor, futures)
+
+    # end get_device_details_bulk()
+
+    @staticmethod
+    def __iter_device_details__(executor, futures):
+        """
+        A hidden generator behind get_device_details_bulk that yields each device's detail as it arrives.  Requests
+        not yet started are cancelled if the caller stops early or one of them fails, and the executor's threads are
+        released once the generator finishes.
+        :return: generator of (identifier, dict) tuples
+        """
+        identifiers = {future: search_by for search_by, future in futures}
+        try:
+            for future in as_completed(identifiers):
+                yield identifiers[future], future.result()
+        finally:
+            for future in identifiers:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    # end __iter_device_details__()
+
 # end class NetworkDevice()
 
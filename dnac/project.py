@@ -1,6 +1,5 @@
-from dnac import DnacError, \
-                 SUPPORTED_DNAC_VERSIONS, \
-                 UNSUPPORTED_DNAC_VERSION
+from dnac.routes import PROJECT, \
+                        resource_paths
 from dnac.dnacapi import DnacApi, \
                          DnacApiError
 from dnac.crud import OK, \
@@ -13,10 +12,7 @@ import json
 
 MODULE = 'project.py'
 
-PROJECT_RESOURCE_PATH = {
-    '1.3.1.3': '/api/v2/template-programmer/project',
-    '1.3.1.4': '/api/v2/template-programmer/project'
-}
+PROJECT_RESOURCE_PATH = resource_paths(PROJECT)
 
 # globals
 
@@ -78,10 +74,7 @@ class Project(DnacApi):
             default: 5
             required: no
         """
-        if dnac.version in SUPPORTED_DNAC_VERSIONS:
-            path = PROJECT_RESOURCE_PATH[dnac.version]
-        else:
-            raise DnacError('%s: __init__: %s: %s' % (MODULE, UNSUPPORTED_DNAC_VERSION, dnac.version))
+        path = dnac.routes.path(PROJECT)
 
         # initialize attributes
         self.__project = {}
@@ -207,7 +200,7 @@ class Project(DnacApi):
         # add the project to Cisco DNA Center
         url = '%s%s' % (self.dnac.url, self.resource)
         self.__clean_project__(project)
-        body = json.dumps(project)
+        body = self.dnac.codec.dumps(project)
         results, status = self.crud.post(url,
                                          headers=self.dnac.hdrs,
                                          body=body,
@@ -303,6 +296,8 @@ class Project(DnacApi):
                     MODULE, 'get_project_by_name', ILLEGAL_PROJECT_LIST, '', '1', str(len(self.__project)), '', ''
                 )
             self.__project = project[0]
+            # now that its UUID is known, let Dnac.api find the project by it
+            self.dnac.api.reindex(self.name, Project)
         return self
 
 # end class Project
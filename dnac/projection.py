@@ -0,0 +1,82 @@
+
+# globals
+
+MODULE = 'projection.py'
+
+NO_PROJECTION = None  # keep every field
+
+# error messages
+INVALID_PROJECTION = 'A projection must be None, a list of keys or a callable'
+
+
+class ProjectionError(TypeError):
+    """
+    The ProjectionError exception class, derived from TypeError, indicates that a projection is neither a list of
+    keys nor a callable.
+
+    Attributes:
+        none
+    """
+
+    def __init__(self, msg):
+        """
+        ProjectionError's __init__ method passes a message to its parent class.
+        :param msg: An error message indicating the problem.
+            type: str
+            required: yes
+            default: none
+        """
+        super(ProjectionError, self).__init__(msg)
+
+# end class ProjectionError
+
+# end exceptions
+
+
+def projector(projection):
+    """
+    Turns a projection into a function that reduces one record, i.e. one dict from an API response, to the fields the
+    caller wants.  A projection is one of:
+        None: the record is kept whole.
+        a list, tuple or set of keys: the record is replaced by a dict holding only those keys; keys the record does
+            not have are left out.
+        a callable: the record is replaced by whatever the callable returns, e.g. a compact record object or a tuple.
+    :param projection: The fields to keep.
+        type: None, list of str or callable
+        required: yes
+        default: none
+    :return: callable
+    """
+    if projection is NO_PROJECTION:
+        return lambda record: record
+    if callable(projection):
+        return projection
+    if isinstance(projection, (list, tuple, set, frozenset)):
+        keys = tuple(projection)
+        return lambda record: {key: record[key] for key in keys if key in record}
+    raise ProjectionError('%s: %s' % (INVALID_PROJECTION, type(projection).__name__))
+
+# end projector()
+
+
+def project(data, projection):
+    """
+    Applies a projection to a single record or to every record in a list.
+    :param data: A record or list of records from an API response.
+        type: dict or list of dict
+        required: yes
+        default: none
+    :param projection: The fields to keep.  See projector for the choices.
+        type: None, list of str or callable
+        required: yes
+        default: none
+    :return: the projected record or list of records
+    """
+    if projection is NO_PROJECTION:
+        return data
+    reduce = projector(projection)
+    if isinstance(data, list):
+        return [reduce(record) for record in data]
+    return reduce(data)
+
+# end project()
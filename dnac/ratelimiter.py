@@ -0,0 +1,301 @@
+
+import asyncio
+import re
+import threading
+import time
+
+# globals
+
+MODULE = 'ratelimiter.py'
+
+SECONDS_PER_MINUTE = 60
+SITE_API_THROTTLE = 1000  # DNAC throttles the site API to 1000 requests/min
+DEVICE_DETAIL_API_THROTTLE = 100  # a conservative pace so bulk device-detail calls stay within DNAC's limits
+DEFAULT_BURST_SECONDS = 1  # how many seconds' worth of requests may be sent back to back
+
+# requests per minute allowed for each endpoint family; families not listed here are not throttled
+DEFAULT_RATE_LIMITS = {
+    'site': SITE_API_THROTTLE,
+    'device-detail': DEVICE_DETAIL_API_THROTTLE
+}
+
+NO_FAMILY = ''
+NO_WAIT = 0
+
+# the endpoint family is the first path segment after the API version, e.g. /dna/intent/api/v1/site?name=x -> site
+FAMILY_PATTERN = re.compile(r'/api/v\d+/([^/?]+)')
+
+
+class TokenBucket(object):
+    """
+    The TokenBucket class paces requests so that no more than rate requests are issued per minute.  The bucket holds
+    up to capacity tokens and refills continuously.  Each request takes one token; when the bucket is empty, the
+    request waits for its turn.
+
+    Waiting happens outside of the bucket's lock: a caller reserves its slot and then sleeps until the slot arrives.
+    This makes a TokenBucket safe to share between threads and between coroutines on an event loop, which use
+    acquire() and acquire_async() respectively.
+
+    Attributes:
+        rate: The number of requests allowed per minute.
+            type: int
+            default: none
+            scope: protected
+        capacity: The number of requests that may be sent back to back.
+            type: float
+            default: DEFAULT_BURST_SECONDS worth of requests, at least one
+            scope: protected
+        metrics: Counters on how many requests were paced and how long they waited.
+            type: dict
+            default: zeroed counters
+            scope: protected
+
+    Usage:
+        bucket = TokenBucket(1000)
+        bucket.acquire()
+        # make the API call
+    """
+
+    def __init__(self, rate, capacity=None):
+        """
+        Creates a new TokenBucket that starts full.
+        :param rate: The number of requests allowed per minute.
+            type: int
+            required: yes
+            default: none
+        :param capacity: The number of requests that may be sent back to back.
+            type: int
+            required: no
+            default: DEFAULT_BURST_SECONDS worth of requests, at least one
+        """
+        self.__rate = rate
+        if capacity is None:
+            capacity = max(1.0, float(rate) * DEFAULT_BURST_SECONDS / SECONDS_PER_MINUTE)
+        self.__capacity = float(capacity)
+        self.__tokens = self.__capacity
+        self.__last = time.monotonic()
+        self.__lock = threading.Lock()
+        self.__requests = 0
+        self.__throttled = 0
+        self.__total_wait = 0.0
+        self.__max_wait = 0.0
+
+    # end __init__()
+
+    @property
+    def rate(self):
+        """
+        Returns the number of requests allowed per minute.
+        :return: int
+        """
+        return self.__rate
+
+    # end rate getter
+
+    @property
+    def capacity(self):
+        """
+        Returns the number of requests that may be sent back to back.
+        :return: float
+        """
+        return self.__capacity
+
+    # end capacity getter
+
+    @property
+    def metrics(self):
+        """
+        Provides the number of requests paced by the bucket, how many of them had to wait, and the total and longest
+        wait in seconds.
+        :return: dict
+        """
+        with self.__lock:
+            return {
+                'requests': self.__requests,
+                'throttled': self.__throttled,
+                'total_wait': self.__total_wait,
+                'max_wait': self.__max_wait
+            }
+
+    # end metrics getter
+
+    def __reserve__(self):
+        """
+        A hidden method that takes a token from the bucket and returns how long the caller must wait before using it.
+        :return: float
+        """
+        with self.__lock:
+            now = time.monotonic()
+            refill = (now - self.__last) * self.__rate / SECONDS_PER_MINUTE
+            self.__tokens = min(self.__capacity, self.__tokens + refill)
+            self.__last = now
+            self.__tokens -= 1
+            if self.__tokens >= 0:
+                wait = NO_WAIT
+            else:
+                wait = -self.__tokens * SECONDS_PER_MINUTE / self.__rate
+                self.__throttled += 1
+            self.__requests += 1
+            self.__total_wait += wait
+            self.__max_wait = max(self.__max_wait, wait)
+            return wait
+
+    # end __reserve__()
+
+    def acquire(self):
+        """
+        Waits, by sleeping in the calling thread, until the next request may be sent.
+        :return: The number of seconds waited.
+        """
+        wait = self.__reserve__()
+        if wait > NO_WAIT:
+            time.sleep(wait)
+        return wait
+
+    # end acquire()
+
+    async def acquire_async(self):
+        """
+        Coroutine version of acquire that yields to the event loop while waiting.
+        :return: The number of seconds waited.
+        """
+        wait = self.__reserve__()
+        if wait > NO_WAIT:
+            await asyncio.sleep(wait)
+        return wait
+
+    # end acquire_async()
+
+# end class TokenBucket
+
+
+class RateLimiter(object):
+    """
+    The RateLimiter class keeps a TokenBucket for each endpoint family of the Cisco DNA Center API, e.g. site or
+    network-device, so that requests to one family are paced without slowing down any other.  A Dnac object holds one
+    RateLimiter, and all of its DnacApi objects consult it before each API call, so the limit holds for the cluster as
+    a whole no matter how many objects or threads are making calls.
+
+    Attributes:
+        buckets: The TokenBucket for each throttled endpoint family.
+            type: dict
+            default: one bucket per entry in DEFAULT_RATE_LIMITS
+            scope: protected
+
+    Usage:
+        limiter = RateLimiter({'site': 1000, 'network-device': 500})
+        limiter.acquire(url)
+        # make the API call
+        pprint.PrettyPrint(limiter.metrics)
+    """
+
+    def __init__(self, limits=None):
+        """
+        Creates a new RateLimiter.
+        :param limits: The number of requests per minute allowed for each endpoint family.
+            type: dict
+            required: no
+            default: DEFAULT_RATE_LIMITS
+        """
+        if limits is None:
+            limits = DEFAULT_RATE_LIMITS
+        self.__buckets = {}
+        for family, rate in limits.items():
+            self.set_limit(family, rate)
+
+    # end __init__()
+
+    @property
+    def buckets(self):
+        """
+        Returns the TokenBucket of every throttled endpoint family.
+        :return: dict
+        """
+        return self.__buckets
+
+    # end buckets getter
+
+    @property
+    def metrics(self):
+        """
+        Provides the metrics of each throttled endpoint family's TokenBucket.
+        :return: dict
+        """
+        return {family: bucket.metrics for family, bucket in self.__buckets.items()}
+
+    # end metrics getter
+
+    @staticmethod
+    def family(url):
+        """
+        Finds the endpoint family that a URL belongs to.
+        :param url: The request's URL.
+            type: str
+            required: yes
+            default: none
+        :return: str
+        """
+        match = FAMILY_PATTERN.search(url)
+        if match is None:
+            return NO_FAMILY
+        return match.group(1)
+
+    # end family()
+
+    def set_limit(self, family, rate, capacity=None):
+        """
+        Sets or replaces the limit for an endpoint family.  Use None as the rate to stop throttling the family.
+        :param family: The endpoint family, e.g. site.
+            type: str
+            required: yes
+            default: none
+        :param rate: The number of requests allowed per minute.
+            type: int
+            required: yes
+            default: none
+        :param capacity: The number of requests that may be sent back to back.
+            type: int
+            required: no
+            default: TokenBucket's default
+        :return: none
+        """
+        if rate is None:
+            self.__buckets.pop(family, None)
+        else:
+            self.__buckets[family] = TokenBucket(rate, capacity=capacity)
+
+    # end set_limit()
+
+    def acquire(self, url):
+        """
+        Waits until a request to the URL given may be sent.
+        :param url: The request's URL.
+            type: str
+            required: yes
+            default: none
+        :return: The number of seconds waited.
+        """
+        bucket = self.__buckets.get(self.family(url))
+        if bucket is None:
+            return NO_WAIT
+        return bucket.acquire()
+
+    # end acquire()
+
+    async def acquire_async(self, url):
+        """
+        Coroutine version of acquire.
+        :param url: The request's URL.
+            type: str
+            required: yes
+            default: none
+        :return: The number of seconds waited.
+        """
+        bucket = self.__buckets.get(self.family(url))
+        if bucket is None:
+            return NO_WAIT
+        return await bucket.acquire_async()
+
+    # end acquire_async()
+
+# end class RateLimiter
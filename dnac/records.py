@@ -0,0 +1,290 @@
+
+# globals
+
+MODULE = 'records.py'
+
+
+class Record(object):
+    """
+    The Record class is the base for compact, read-mostly representations of the objects Cisco DNA Center returns.
+    A record keeps only the fields its class names, in __slots__ rather than a per-instance dict, so holding tens of
+    thousands of them costs a fraction of the memory the raw API dicts do.
+
+    Each subclass lists its fields in FIELDS as (attribute, API key) pairs.  Attributes use snake case, e.g.
+    management_ip_address, while the API keys keep Cisco DNAC's camel case, e.g. managementIpAddress.  A field absent
+    from the API payload is set to None.  Records may also be read like the dicts they replace, e.g.
+    device['hostname'], and to_dict converts one back into a plain dict.
+
+    from_dict takes a single API record, which makes it usable as a projection for the getters that accept one.
+
+    Attributes:
+        FIELDS: The record's fields as (attribute, API key) pairs.
+            type: tuple of tuple
+            default: ()
+            scope: public
+
+    Usage:
+        devices = d.api['network-device'].get_all_devices(projection=DeviceRecord.from_dict)
+        print(devices[0].hostname, devices[0]['managementIpAddress'])
+        raw = devices[0].to_dict()
+    """
+
+    __slots__ = ()
+
+    FIELDS = ()
+    KEYS = {}  # API key to attribute, built from FIELDS for each subclass
+
+    def __init_subclass__(cls, **kwargs):
+        """
+        Indexes a new subclass's fields by their API keys.
+        :return: none
+        """
+        super(Record, cls).__init_subclass__(**kwargs)
+        cls.KEYS = {key: attribute for attribute, key in cls.FIELDS}
+
+    # end __init_subclass__()
+
+    def __init__(self, **kwargs):
+        """
+        Creates a new record from its attributes.  Attributes not given are set to None.
+        :param kwargs: The record's attributes by their snake case names.
+            type: dict
+            required: no
+            default: none
+        """
+        for attribute, key in self.FIELDS:
+            setattr(self, attribute, kwargs.pop(attribute, None))
+        if kwargs:
+            raise TypeError('%s: unexpected fields: %s' % (type(self).__name__, ', '.join(sorted(kwargs))))
+
+    # end __init__()
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Builds a record from one of Cisco DNA Center's API records.  Keys the record does not name are discarded.
+        :param data: The API record.
+            type: dict
+            required: yes
+            default: none
+        :return: Record object
+        """
+        record = cls.__new__(cls)
+        for attribute, key in cls.FIELDS:
+            setattr(record, attribute, data.get(key))
+        return record
+
+    # end from_dict()
+
+    @classmethod
+    def from_list(cls, data):
+        """
+        Builds a record for each of a list of API records.
+        :param data: The API records.
+            type: list of dict
+            required: yes
+            default: none
+        :return: list of Record objects
+        """
+        return [cls.from_dict(item) for item in data]
+
+    # end from_list()
+
+    def to_dict(self):
+        """
+        Converts the record back into a dict keyed by Cisco DNAC's field names.
+        :return: dict
+        """
+        return {key: getattr(self, attribute) for attribute, key in self.FIELDS}
+
+    # end to_dict()
+
+    def __getitem__(self, key):
+        """
+        Reads a field by its API key, as if the record were the API's dict.
+        :param key: The field's API key, e.g. 'hostname'.
+            type: str
+            required: yes
+            default: none
+        :return: the field's value
+        """
+        return getattr(self, self.KEYS[key])
+
+    # end __getitem__()
+
+    def __contains__(self, key):
+        """
+        Indicates whether the record holds the API key given.
+        :return: bool
+        """
+        return key in self.KEYS
+
+    # end __contains__()
+
+    def get(self, key, default=None):
+        """
+        Reads a field by its API key like dict.get.
+        :param key: The field's API key.
+            type: str
+            required: yes
+            default: none
+        :param default: The value returned when the record does not hold the key.
+            type: any
+            required: no
+            default: None
+        :return: the field's value or the default
+        """
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    # end get()
+
+    def __eq__(self, other):
+        """
+        Two records are equal when they are of the same class and all of their fields match.
+        :return: bool
+        """
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(getattr(self, attribute) == getattr(other, attribute) for attribute, key in self.FIELDS)
+
+    # end __eq__()
+
+    __hash__ = None  # records are mutable
+
+    def __repr__(self):
+        """
+        Shows the record's class and fields.
+        :return: str
+        """
+        fields = ', '.join('%s=%r' % (attribute, getattr(self, attribute)) for attribute, key in self.FIELDS)
+        return '%s(%s)' % (type(self).__name__, fields)
+
+    # end __repr__()
+
+    def __getstate__(self):
+        """
+        Gives the record's fields for pickling, since slotted objects have no __dict__.
+        :return: tuple
+        """
+        return tuple(getattr(self, attribute) for attribute, key in self.FIELDS)
+
+    # end __getstate__()
+
+    def __setstate__(self, state):
+        """
+        Restores a pickled record's fields.
+        :return: none
+        """
+        for (attribute, key), value in zip(self.FIELDS, state):
+            setattr(self, attribute, value)
+
+    # end __setstate__()
+
+# end class Record
+
+
+class DeviceRecord(Record):
+    """
+    A compact network device as listed by NetworkDevice's getters.
+
+    Usage:
+        devices = d.api['network-device'].get_all_devices(projection=DeviceRecord.from_dict)
+    """
+
+    FIELDS = (
+        ('id', 'id'),
+        ('hostname', 'hostname'),
+        ('management_ip_address', 'managementIpAddress'),
+        ('mac_address', 'macAddress'),
+        ('serial_number', 'serialNumber'),
+        ('platform_id', 'platformId'),
+        ('family', 'family'),
+        ('type', 'type'),
+        ('series', 'series'),
+        ('role', 'role'),
+        ('software_type', 'softwareType'),
+        ('software_version', 'softwareVersion'),
+        ('reachability_status', 'reachabilityStatus'),
+        ('collection_status', 'collectionStatus'),
+        ('up_time', 'upTime'),
+        ('last_update_time', 'lastUpdateTime'),
+        ('location', 'location')
+    )
+
+    __slots__ = tuple(attribute for attribute, key in FIELDS)
+
+# end class DeviceRecord
+
+
+class SiteRecord(Record):
+    """
+    A compact site from Cisco DNAC's design hierarchy.
+
+    Usage:
+        sites = hierarchy.get_all_sites(projection=SiteRecord.from_dict)
+    """
+
+    FIELDS = (
+        ('id', 'id'),
+        ('name', 'name'),
+        ('parent_id', 'parentId'),
+        ('site_name_hierarchy', 'siteNameHierarchy'),
+        ('site_hierarchy', 'siteHierarchy'),
+        ('additional_info', 'additionalInfo')
+    )
+
+    __slots__ = tuple(attribute for attribute, key in FIELDS)
+
+# end class SiteRecord
+
+
+class TemplateVersionRecord(Record):
+    """
+    A compact template or template version as returned by Template.get_template_by_id.
+
+    Usage:
+        version = TemplateVersionRecord.from_dict(template.get_versioned_template(1))
+    """
+
+    FIELDS = (
+        ('id', 'id'),
+        ('name', 'name'),
+        ('version', 'version'),
+        ('parent_template_id', 'parentTemplateId'),
+        ('project_id', 'projectId'),
+        ('project_name', 'projectName'),
+        ('software_type', 'softwareType'),
+        ('device_types', 'deviceTypes'),
+        ('template_content', 'templateContent'),
+        ('template_params', 'templateParams'),
+        ('create_time', 'createTime'),
+        ('last_update_time', 'lastUpdateTime')
+    )
+
+    __slots__ = tuple(attribute for attribute, key in FIELDS)
+
+# end class TemplateVersionRecord
+
+
+class ArchiveVersionRecord(Record):
+    """
+    A compact configuration archive version, i.e. one entry of a device archive's versions list.
+
+    Usage:
+        versions = ArchiveVersionRecord.from_list(archive['versions'])
+    """
+
+    FIELDS = (
+        ('id', 'id'),
+        ('created_by', 'createdBy'),
+        ('created_time', 'createdTime'),
+        ('startup_running_status', 'startupRunningStatus'),
+        ('files', 'files')
+    )
+
+    __slots__ = tuple(attribute for attribute, key in FIELDS)
+
+# end class ArchiveVersionRecord
@@ -0,0 +1,777 @@
+
+from collections import OrderedDict
+from collections.abc import MutableMapping
+import threading
+import time
+import weakref
+
+# globals
+
+MODULE = 'registry.py'
+
+STRONG = 'strong'  # kept until removed, the original behavior of Dnac.api
+WEAK = 'weak'  # kept only while something else refers to the object
+LRU = 'lru'  # kept up to a maximum count and, optionally, for a limited idle time
+
+POLICY_KINDS = (STRONG, WEAK, LRU)
+
+DEFAULT_LRU_SIZE = 1000
+NO_TTL = None
+
+# error messages
+INVALID_POLICY = 'Registry policy must be one of'
+INVALID_LRU_SIZE = 'An LRU registry policy needs a max_size of at least 1'
+
+
+class RegistryError(Exception):
+    """
+    The RegistryError exception class, derived from Exception, indicates that a registry policy is invalid.
+
+    Attributes:
+        none
+    """
+
+    def __init__(self, msg):
+        """
+        RegistryError's __init__ method passes a message to its parent class.
+        :param msg: An error message indicating the problem.
+            type: str
+            required: yes
+            default: none
+        """
+        super(RegistryError, self).__init__(msg)
+
+# end class RegistryError
+
+# end exceptions
+
+
+class RegistryPolicy(object):
+    """
+    The RegistryPolicy class describes how long an ApiRegistry holds on to the objects of a given type:
+
+        STRONG: until they are deleted from the registry.
+        WEAK: for as long as the program refers to them elsewhere, e.g. a Task held by a CommandRunner.
+        LRU: the max_size most recently used objects, each for at most ttl seconds since it was last looked up.
+
+    Each LRU policy keeps its own list of objects, so types sharing a policy object share its max_size.
+
+    Attributes:
+        kind: STRONG, WEAK or LRU.
+            type: str
+            default: STRONG
+            scope: protected
+        max_size: The number of objects an LRU policy holds.
+            type: int
+            default: DEFAULT_LRU_SIZE
+            scope: protected
+        ttl: The seconds an LRU policy holds an object that is not looked up, or None to hold it indefinitely.
+            type: float
+            default: None
+            scope: protected
+
+    Usage:
+        d = Dnac(api_policies={'Version': RegistryPolicy(LRU, max_size=500, ttl=3600)})
+    """
+
+    def __init__(self, kind=STRONG, max_size=DEFAULT_LRU_SIZE, ttl=NO_TTL):
+        """
+        Creates a new RegistryPolicy.
+        :param kind: STRONG, WEAK or LRU.
+            type: str
+            required: no
+            default: STRONG
+        :param max_size: The number of objects an LRU policy holds.
+            type: int
+            required: no
+            default: DEFAULT_LRU_SIZE
+        :param ttl: The seconds an LRU policy holds an object that is not looked up.
+            type: float
+            required: no
+            default: None
+        """
+        if kind not in POLICY_KINDS:
+            raise RegistryError('%s %s: %s' % (INVALID_POLICY, str(POLICY_KINDS), kind))
+        if kind == LRU and max_size < 1:
+            raise RegistryError('%s: %s' % (INVALID_LRU_SIZE, max_size))
+        self.__kind = kind
+        self.__max_size = max_size
+        self.__ttl = ttl
+
+    # end __init__()
+
+    @property
+    def kind(self):
+        """
+        Returns the policy's kind.
+        :return: str
+        """
+        return self.__kind
+
+    # end kind getter
+
+    @property
+    def max_size(self):
+        """
+        Returns the number of objects an LRU policy holds.
+        :return: int
+        """
+        return self.__max_size
+
+    # end max_size getter
+
+    @property
+    def ttl(self):
+        """
+        Returns the seconds an LRU policy holds an idle object, or None if there is no limit.
+        :return: float
+        """
+        return self.__ttl
+
+    # end ttl getter
+
+    def __repr__(self):
+        """
+        Describes the policy.
+        :return: str
+        """
+        if self.__kind == LRU:
+            return 'RegistryPolicy(%s, max_size=%i, ttl=%s)' % (self.__kind, self.__max_size, self.__ttl)
+        return 'RegistryPolicy(%s)' % self.__kind
+
+    # end __repr__()
+
+# end class RegistryPolicy
+
+STRONG_POLICY = RegistryPolicy(STRONG)
+WEAK_POLICY = RegistryPolicy(WEAK)
+
+# objects created by the thousand and owned by whatever created them
+DEFAULT_API_POLICIES = {
+    'Task': WEAK_POLICY,
+    'File': WEAK_POLICY,
+    'Deployment': WEAK_POLICY
+}
+
+
+# the attribute holding each class's UUID; classes not listed, e.g. NetworkDevice, are not indexed by UUID
+ID_ATTRIBUTES = {
+    'Task': 'id',
+    'File': 'id',
+    'Version': 'id',
+    'Site': 'id',
+    'Project': 'project_id',
+    'Template': 'template_id',
+    'Deployment': 'deployment_id'
+}
+
+NO_ID = None
+
+
+class ApiRegistry(MutableMapping):
+    """
+    The ApiRegistry class is the dictionary behind Dnac.api.  It maps each DnacApi object's name to the object, just
+    like the plain dict it replaces, but how long it holds an object depends on the object's type.  By default, Task,
+    File and Deployment objects, including subclasses such as CommandRunnerTask, are held weakly: they remain
+    reachable by name for as long as the object that created them, e.g. a CommandRunner or a Version, keeps them, and
+    they are released along with it.  Everything else is held until deleted, as before.
+
+    A policy applies to the class named and to its subclasses; the most specific class listed wins.  Policies can
+    be changed at any time and apply to objects added from then on.
+
+    Because names are free-form, a site, a template and a project may share one.  Each class therefore has its own
+    namespace: adding a Template named like a Site held already keeps both, and only an object of the same class
+    replaces one by the same name.  A plain name looks up the object most recently added under it, as before, while
+    a (class, name) key, e.g. d.api[Site, 'Global/Austin'], picks the object of that class or one of its
+    subclasses.  The registry also indexes its objects by class and, for the classes in ID_ATTRIBUTES, by UUID:
+    of_type and the sites, templates, projects, tasks, files, versions and deployments properties give the objects
+    of one class, find looks up a name within a class and by_id finds an object by its UUID without scanning.
+    Objects whose UUID is only known once they are loaded from Cisco DNAC, e.g. Site, Project and Template, call
+    reindex when they load.
+
+    Iterating over the registry gives each name once, however many classes use it, and len counts those names.
+
+    ApiRegistry is safe to use from several threads.
+
+    Attributes:
+        policies: The registry policy for each class name.
+            type: dict
+            default: DEFAULT_API_POLICIES
+            scope: protected
+        default_policy: The policy for classes not listed in policies.
+            type: RegistryPolicy object
+            default: STRONG_POLICY
+            scope: protected
+
+    Usage:
+        d = Dnac(api_policies={'Site': RegistryPolicy(LRU, max_size=5000)})
+        d.api.set_policy('Version', WEAK_POLICY)
+        task = d.api['task_%s' % task_id]
+        site = d.api.by_id(site_id, Site)
+        project = d.api.find(Project, 'Onboarding Configuration')
+        template = d.api[Template, 'Onboarding Configuration']
+    """
+
+    def __init__(self, policies=None, default_policy=STRONG_POLICY):
+        """
+        Creates an empty ApiRegistry.
+        :param policies: Registry policies by class name, used in place of DEFAULT_API_POLICIES for the classes given.
+            type: dict
+            required: no
+            default: None
+        :param default_policy: The policy for classes without one.
+            type: RegistryPolicy object
+            required: no
+            default: STRONG_POLICY
+        """
+        self.__lock = threading.RLock()
+        self.__policies = dict(DEFAULT_API_POLICIES)
+        for cls, policy in (policies or {}).items():
+            self.__policies[self.__class_name__(cls)] = policy
+        self.__default_policy = default_policy
+        # every store and index below is keyed by (class name, name), so each class has its own namespace
+        self.__strong = {}
+        self.__weak = {}  # key -> weakref.KeyedRef
+        self.__dead = []  # (key, weakref.KeyedRef) of collected objects, removed on the next call
+        self.__lru = {}  # policy id -> (policy, OrderedDict of key -> [object, last used])
+        self.__resolved = {}  # class -> policy, so each class's MRO is walked once
+        self.__types = {}  # class name -> {key: None}, including every ancestor class
+        self.__classes = {}  # key -> the class names it is indexed under
+        self.__names = {}  # name -> {key: None} in the order added, so a plain name finds the newest
+        self.__ids = {}  # UUID -> key
+        self.__uuids = {}  # key -> UUID
+
+    # end __init__()
+
+    @staticmethod
+    def __class_name__(cls):
+        """
+        A hidden method that accepts either a class or its name.
+        :return: str
+        """
+        return cls if isinstance(cls, str) else cls.__name__
+
+    # end __class_name__()
+
+    @property
+    def policies(self):
+        """
+        Returns the registry policy for each class name.
+        :return: dict
+        """
+        with self.__lock:
+            return dict(self.__policies)
+
+    # end policies getter
+
+    @property
+    def default_policy(self):
+        """
+        Returns the policy for classes without one.
+        :return: RegistryPolicy object
+        """
+        return self.__default_policy
+
+    # end default_policy getter
+
+    def set_policy(self, cls, policy):
+        """
+        Sets the policy for a class and its subclasses.  Objects already in the registry keep their current policy.
+        :param cls: The class or its name, e.g. 'Version'.
+            type: class or str
+            required: yes
+            default: none
+        :param policy: The policy.  Use None to fall back to the default policy.
+            type: RegistryPolicy object
+            required: yes
+            default: none
+        :return: none
+        """
+        with self.__lock:
+            name = self.__class_name__(cls)
+            if policy is None:
+                self.__policies.pop(name, None)
+            else:
+                self.__policies[name] = policy
+            self.__resolved = {}
+
+    # end set_policy()
+
+    def policy_for(self, obj):
+        """
+        Finds the policy that applies to an object: that of its class or of the nearest ancestor that has one.
+        :param obj: The object.
+            type: any
+            required: yes
+            default: none
+        :return: RegistryPolicy object
+        """
+        cls = type(obj)
+        with self.__lock:
+            policy = self.__resolved.get(cls)
+            if policy is None:
+                policy = self.__default_policy
+                for ancestor in cls.__mro__:
+                    if ancestor.__name__ in self.__policies:
+                        policy = self.__policies[ancestor.__name__]
+                        break
+                self.__resolved[cls] = policy
+            return policy
+
+    # end policy_for()
+
+    @staticmethod
+    def __uuid__(obj):
+        """
+        A hidden method that reads an object's UUID using the ID_ATTRIBUTES entry of its class or nearest ancestor.
+        Objects that have not been loaded yet have no UUID.
+        :return: str or NO_ID
+        """
+        for ancestor in type(obj).__mro__:
+            attribute = ID_ATTRIBUTES.get(ancestor.__name__)
+            if attribute is not None:
+                try:
+                    return getattr(obj, attribute) or NO_ID
+                except (KeyError, TypeError, AttributeError):  # the object's data is not loaded
+                    return NO_ID
+        return NO_ID
+
+    # end __uuid__()
+
+    def __resolve__(self, key, cls=None):
+        """
+        A hidden method that turns a name, or a (class, name) pair, into the key of the object it refers to: the
+        newest object by that name, of the class or one of its subclasses if one is given.  The caller must hold the
+        lock.
+        :return: tuple of (class name, name), or None if no such object is held
+        """
+        if isinstance(key, tuple):
+            cls, key = key
+        keys = self.__names.get(key)
+        if not keys:
+            return None
+        if cls is None:
+            return next(reversed(keys))
+        cls = self.__class_name__(cls)
+        for candidate in reversed(keys):
+            if cls in self.__classes[candidate]:
+                return candidate
+        return None
+
+    # end __resolve__()
+
+    def __index_key__(self, key, value):
+        """
+        A hidden method that adds a key to the name, class and UUID indexes.  The caller must hold the lock.
+        :return: none
+        """
+        classes = tuple(ancestor.__name__ for ancestor in type(value).__mro__ if ancestor is not object)
+        for cls in classes:
+            self.__types.setdefault(cls, {})[key] = None
+        self.__classes[key] = classes
+        self.__names.setdefault(key[1], {})[key] = None
+        uuid = self.__uuid__(value)
+        if uuid is not NO_ID:
+            self.__ids[uuid] = key
+            self.__uuids[key] = uuid
+
+    # end __index_key__()
+
+    def __unindex_key__(self, key):
+        """
+        A hidden method that removes a key from the name, class and UUID indexes.  The caller must hold the lock.
+        :return: none
+        """
+        for cls in self.__classes.pop(key, ()):
+            keys = self.__types.get(cls)
+            if keys is not None:
+                keys.pop(key, None)
+                if not keys:
+                    del self.__types[cls]
+        keys = self.__names.get(key[1])
+        if keys is not None:
+            keys.pop(key, None)
+            if not keys:
+                del self.__names[key[1]]
+        uuid = self.__uuids.pop(key, NO_ID)
+        if uuid is not NO_ID and self.__ids.get(uuid) == key:
+            del self.__ids[uuid]
+
+    # end __unindex_key__()
+
+    def __collected__(self, ref):
+        """
+        A hidden method called by the garbage collector when a weakly held object is released.  It may run at any
+        point, even in the middle of one of this class's methods, so it only queues the key for removal.
+        :return: none
+        """
+        self.__dead.append((ref.key, ref))
+
+    # end __collected__()
+
+    def __reap__(self):
+        """
+        A hidden method that drops the keys of weakly held objects that have been released.  The caller must hold
+        the lock.
+        :return: none
+        """
+        while self.__dead:
+            key, ref = self.__dead.pop()
+            if self.__weak.get(key) is ref:
+                del self.__weak[key]
+                self.__unindex_key__(key)
+
+    # end __reap__()
+
+    def __purge__(self, entries, policy, now):
+        """
+        A hidden method that drops an LRU list's idle and excess entries.  Entries are kept in order of last use, so
+        the idle ones are always at the front.  The caller must hold the lock.
+        :return: none
+        """
+        if policy.ttl is not NO_TTL:
+            while entries:
+                key, entry = next(iter(entries.items()))
+                if now - entry[1] < policy.ttl:
+                    break
+                del entries[key]
+                self.__unindex_key__(key)
+        while len(entries) > policy.max_size:
+            key, entry = entries.popitem(last=False)
+            self.__unindex_key__(key)
+
+    # end __purge__()
+
+    def __purge_all__(self):
+        """
+        A hidden method that drops released and expired objects from every store.  The caller must hold the lock.
+        :return: none
+        """
+        self.__reap__()
+        now = time.monotonic()
+        for policy, entries in self.__lru.values():
+            self.__purge__(entries, policy, now)
+
+    # end __purge_all__()
+
+    def __discard__(self, key):
+        """
+        A hidden method that removes a key from every store.  The caller must hold the lock.
+        :return: bool, True if the key was found
+        """
+        found = self.__strong.pop(key, None) is not None
+        ref = self.__weak.pop(key, None)
+        found = (ref is not None and ref() is not None) or found
+        for policy, entries in self.__lru.values():
+            found = entries.pop(key, None) is not None or found
+        self.__unindex_key__(key)
+        return found
+
+    # end __discard__()
+
+    def __lookup__(self, key):
+        """
+        A hidden method that finds an object by key without marking it as recently used.  The caller must hold the
+        lock and purge the stores first.
+        :return: DnacApi object or None
+        """
+        if key is None:
+            return None
+        value = self.__strong.get(key)
+        if value is not None:
+            return value
+        ref = self.__weak.get(key)
+        if ref is not None:
+            return ref()
+        for policy, entries in self.__lru.values():
+            entry = entries.get(key)
+            if entry is not None:
+                return entry[0]
+        return None
+
+    # end __lookup__()
+
+    def __setitem__(self, key, value):
+        """
+        Adds an object under the policy for its type, replacing any object of the same class by the same name.
+        Objects of other classes by that name are kept.  A (class, name) key is accepted, but the object's own class
+        always decides its namespace.
+        :return: none
+        """
+        if isinstance(key, tuple):
+            key = key[1]
+        key = (type(value).__name__, key)
+        policy = self.policy_for(value)
+        with self.__lock:
+            self.__reap__()
+            self.__discard__(key)
+            if policy.kind == STRONG:
+                self.__strong[key] = value
+            elif policy.kind == WEAK:
+                ref = weakref.KeyedRef(value, self.__collected__, key)
+                self.__weak[key] = ref
+            else:
+                entries = self.__lru.get(id(policy))
+                if entries is None:
+                    entries = (policy, OrderedDict())
+                    self.__lru[id(policy)] = entries
+                entries[1][key] = [value, time.monotonic()]
+            self.__index_key__(key, value)
+            if policy.kind == LRU:
+                self.__purge__(entries[1], policy, time.monotonic())
+
+    # end __setitem__()
+
+    def __getitem__(self, key):
+        """
+        Looks up an object by name, or by (class, name).  Looking up an object held by an LRU policy marks it as
+        recently used.  Raises a KeyError if no such object is held.
+        :return: DnacApi object
+        """
+        with self.__lock:
+            self.__purge_all__()
+            resolved = self.__resolve__(key)
+            value = self.__lookup__(resolved)
+            if value is None:
+                raise KeyError(key)
+            for policy, entries in self.__lru.values():
+                entry = entries.get(resolved)
+                if entry is not None:
+                    entry[1] = time.monotonic()
+                    entries.move_to_end(resolved)
+                    break
+            return value
+
+    # end __getitem__()
+
+    def __delitem__(self, key):
+        """
+        Removes an object by name, or by (class, name).  A plain name removes only the object it looks up, i.e. the
+        newest by that name.  Raises a KeyError if no such object is held.
+        :return: none
+        """
+        with self.__lock:
+            self.__purge_all__()
+            resolved = self.__resolve__(key)
+            if resolved is None or not self.__discard__(resolved):
+                raise KeyError(key)
+
+    # end __delitem__()
+
+    def __contains__(self, key):
+        """
+        Indicates whether an object by that name, or (class, name), is held, without marking it as recently used.
+        :return: bool
+        """
+        with self.__lock:
+            self.__purge_all__()
+            return self.__lookup__(self.__resolve__(key)) is not None
+
+    # end __contains__()
+
+    def __keys__(self):
+        """
+        A hidden method that lists the names currently held, each once.
+        :return: list of str
+        """
+        with self.__lock:
+            self.__purge_all__()
+            return list(self.__names)
+
+    # end __keys__()
+
+    def __iter__(self):
+        """
+        Iterates over a snapshot of the names held, so the registry may change during the iteration.
+        :return: iterator
+        """
+        return iter(self.__keys__())
+
+    # end __iter__()
+
+    def __len__(self):
+        """
+        Gives the number of names held.
+        :return: int
+        """
+        with self.__lock:
+            self.__purge_all__()
+            return len(self.__names)
+
+    # end __len__()
+
+    def __repr__(self):
+        """
+        Shows the registry's names.
+        :return: str
+        """
+        return 'ApiRegistry(%s)' % self.__keys__()
+
+    # end __repr__()
+
+    def reindex(self, key, cls=None):
+        """
+        Refreshes the UUID index for an object.  Objects call this once they have loaded their UUID from Cisco DNAC,
+        e.g. at the end of Site.load_site.
+        :param key: The object's name in the registry.
+            type: str
+            required: yes
+            default: none
+        :param cls: The object's class, or its name, to tell it apart from objects of other classes by that name.
+            type: class or str
+            required: no
+            default: None, meaning the newest object by that name
+        :return: none
+        """
+        with self.__lock:
+            self.__purge_all__()
+            key = self.__resolve__(key, cls)
+            value = self.__lookup__(key)
+            if value is None:
+                return
+            uuid = self.__uuids.pop(key, NO_ID)
+            if uuid is not NO_ID and self.__ids.get(uuid) == key:
+                del self.__ids[uuid]
+            uuid = self.__uuid__(value)
+            if uuid is not NO_ID:
+                self.__ids[uuid] = key
+                self.__uuids[key] = uuid
+
+    # end reindex()
+
+    def by_id(self, uuid, cls=None):
+        """
+        Finds the object with a UUID, e.g. a Site by its site UUID or a Task by its task UUID.  Only the classes in
+        ID_ATTRIBUTES are indexed.
+        :param uuid: The object's UUID.
+            type: str
+            required: yes
+            default: none
+        :param cls: The class, or its name, the object must be an instance of.
+            type: class or str
+            required: no
+            default: None
+        :return: DnacApi object or None if no such object is held
+        """
+        with self.__lock:
+            self.__purge_all__()
+            key = self.__ids.get(uuid)
+            if key is None:
+                return None
+            if cls is not None and self.__class_name__(cls) not in self.__classes.get(key, ()):
+                return None
+            return self.__lookup__(key)
+
+    # end by_id()
+
+    def find(self, cls, key):
+        """
+        Looks up a name among the objects of one class, so that, e.g., a project and a template sharing a name are
+        never confused.
+        :param cls: The class, or its name, e.g. Project.
+            type: class or str
+            required: yes
+            default: none
+        :param key: The object's name in the registry.
+            type: str
+            required: yes
+            default: none
+        :return: DnacApi object or None if no such object is held
+        """
+        with self.__lock:
+            self.__purge_all__()
+            return self.__lookup__(self.__resolve__(key, cls))
+
+    # end find()
+
+    def of_type(self, cls):
+        """
+        Gives the objects held that are instances of a class, including its subclasses.
+        :param cls: The class or its name, e.g. Site or 'Task'.
+            type: class or str
+            required: yes
+            default: none
+        :return: dict of name to DnacApi object
+        """
+        with self.__lock:
+            self.__purge_all__()
+            objects = {}
+            for key in self.__types.get(self.__class_name__(cls), {}):
+                value = self.__lookup__(key)
+                if value is not None:
+                    objects[key[1]] = value
+            return objects
+
+    # end of_type()
+
+    @property
+    def sites(self):
+        """
+        Returns the Site objects held, by site name hierarchy.
+        :return: dict
+        """
+        return self.of_type('Site')
+
+    # end sites getter
+
+    @property
+    def templates(self):
+        """
+        Returns the Template objects held, by template name.
+        :return: dict
+        """
+        return self.of_type('Template')
+
+    # end templates getter
+
+    @property
+    def projects(self):
+        """
+        Returns the Project objects held, by project name.
+        :return: dict
+        """
+        return self.of_type('Project')
+
+    # end projects getter
+
+    @property
+    def tasks(self):
+        """
+        Returns the Task objects held, including CommandRunnerTask and DeviceArchiveTask objects.
+        :return: dict
+        """
+        return self.of_type('Task')
+
+    # end tasks getter
+
+    @property
+    def files(self):
+        """
+        Returns the File objects held.
+        :return: dict
+        """
+        return self.of_type('File')
+
+    # end files getter
+
+    @property
+    def versions(self):
+        """
+        Returns the device archive Version objects held.
+        :return: dict
+        """
+        return self.of_type('Version')
+
+    # end versions getter
+
+    @property
+    def deployments(self):
+        """
+        Returns the template Deployment objects held.
+        :return: dict
+        """
+        return self.of_type('Deployment')
+
+    # end deployments getter
+
+# end class ApiRegistry
@@ -0,0 +1,288 @@
+
+from email.utils import parsedate_to_datetime
+import datetime
+import random
+import time
+
+# globals
+
+MODULE = 'retrypolicy.py'
+
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BACKOFF = 0.5  # seconds before the first retry; doubles with every attempt
+DEFAULT_MAX_BACKOFF = 30  # longest wait between two attempts
+DEFAULT_BUDGET = 60  # seconds a single call may spend retrying before giving up
+BACKOFF_FACTOR = 2
+
+# 429 - throttled, 503 - unavailable, 504 - gateway timed-out
+DEFAULT_RETRY_STATUSES = (429, 503, 504)
+
+# methods that may be repeated without changing the outcome on the server
+IDEMPOTENT_METHODS = ('GET', 'PUT', 'DELETE', 'HEAD', 'OPTIONS')
+
+# a throttled request was refused before the server acted on it, so it is safe to resend no matter the method
+THROTTLED = 429
+
+RETRY_AFTER = 'Retry-After'
+CONNECTION_FAILED = None  # the status of a request that never got a response
+
+
+class RetryPolicy(object):
+    """
+    The RetryPolicy class decides whether an API call that failed with a transient error should be attempted again and
+    how long to wait before doing so.  Calls are retried with capped exponential backoff, optionally with full jitter
+    so that many callers do not retry in lockstep.  When the server sends a Retry-After header, the policy waits at
+    least that long.  Each call has a time budget: once it runs out, the last response is returned as-is.
+
+    Only idempotent methods are retried after a server error or a failed connection.  A POST is only retried when the
+    server throttled it with a 429, because the server refuses a throttled request before acting on it.
+
+    A Dnac object holds a default RetryPolicy that every DnacApi object follows.  Individual DnacApi objects may be
+    given their own policy, or None to disable retries, through their retry_policy attribute.
+
+    Attributes:
+        max_retries: The maximum number of times a call is repeated.
+            type: int
+            default: 5
+            scope: protected
+        backoff: The seconds to wait before the first retry.
+            type: float
+            default: 0.5
+            scope: protected
+        max_backoff: The longest wait between two attempts.
+            type: float
+            default: 30
+            scope: protected
+        budget: The seconds a call may spend from its first attempt until its last retry begins.
+            type: float
+            default: 60
+            scope: protected
+        statuses: The HTTP status codes that are retried.
+            type: tuple of int
+            default: DEFAULT_RETRY_STATUSES
+            scope: protected
+        methods: The HTTP methods retried after a server error.
+            type: tuple of str
+            default: IDEMPOTENT_METHODS
+            scope: protected
+        jitter: A flag indicating whether to randomize each backoff between zero and its full value.
+            type: bool
+            default: True
+            scope: protected
+
+    Usage:
+        policy = RetryPolicy(max_retries=3, budget=20)
+        d = Dnac(retry_policy=policy)
+        d.api['network-device'].retry_policy = None  # never retry this API
+    """
+
+    def __init__(self,
+                 max_retries=DEFAULT_MAX_RETRIES,
+                 backoff=DEFAULT_BACKOFF,
+                 max_backoff=DEFAULT_MAX_BACKOFF,
+                 budget=DEFAULT_BUDGET,
+                 statuses=DEFAULT_RETRY_STATUSES,
+                 methods=IDEMPOTENT_METHODS,
+                 jitter=True):
+        """
+        Creates a new RetryPolicy.
+        :param max_retries: The maximum number of times a call is repeated.
+            type: int
+            required: no
+            default: 5
+        :param backoff: The seconds to wait before the first retry.
+            type: float
+            required: no
+            default: 0.5
+        :param max_backoff: The longest wait between two attempts.
+            type: float
+            required: no
+            default: 30
+        :param budget: The seconds a call may spend retrying.
+            type: float
+            required: no
+            default: 60
+        :param statuses: The HTTP status codes to retry.
+            type: tuple of int
+            required: no
+            default: (429, 503, 504)
+        :param methods: The HTTP methods to retry after a server error.
+            type: tuple of str
+            required: no
+            default: ('GET', 'PUT', 'DELETE', 'HEAD', 'OPTIONS')
+        :param jitter: Flag indicating whether or not to randomize the backoff.
+            type: bool
+            required: no
+            default: True
+        """
+        self.__max_retries = max_retries
+        self.__backoff = backoff
+        self.__max_backoff = max_backoff
+        self.__budget = budget
+        self.__statuses = tuple(statuses)
+        self.__methods = tuple(method.upper() for method in methods)
+        self.__jitter = jitter
+
+    # end __init__()
+
+    @property
+    def max_retries(self):
+        """
+        Returns the maximum number of times a call is repeated.
+        :return: int
+        """
+        return self.__max_retries
+
+    # end max_retries getter
+
+    @property
+    def backoff(self):
+        """
+        Returns the seconds waited before the first retry.
+        :return: float
+        """
+        return self.__backoff
+
+    # end backoff getter
+
+    @property
+    def max_backoff(self):
+        """
+        Returns the longest wait between two attempts.
+        :return: float
+        """
+        return self.__max_backoff
+
+    # end max_backoff getter
+
+    @property
+    def budget(self):
+        """
+        Returns the seconds a call may spend retrying.
+        :return: float
+        """
+        return self.__budget
+
+    # end budget getter
+
+    @property
+    def statuses(self):
+        """
+        Returns the HTTP status codes that are retried.
+        :return: tuple
+        """
+        return self.__statuses
+
+    # end statuses getter
+
+    @property
+    def methods(self):
+        """
+        Returns the HTTP methods retried after a server error.
+        :return: tuple
+        """
+        return self.__methods
+
+    # end methods getter
+
+    @property
+    def jitter(self):
+        """
+        Indicates whether or not backoffs are randomized.
+        :return: bool
+        """
+        return self.__jitter
+
+    # end jitter getter
+
+    @staticmethod
+    def parse_retry_after(value):
+        """
+        Converts a Retry-After header into seconds.  The header holds either a number of seconds or an HTTP date.
+        :param value: The Retry-After header's value.
+            type: str
+            required: yes
+            default: none
+        :return: float, or None if the value cannot be understood
+        """
+        if value is None:
+            return None
+        value = value.strip()
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError, IndexError):
+            return None
+        if when is None:
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=datetime.timezone.utc)
+        return max(0.0, (when - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+
+    # end parse_retry_after()
+
+    def is_retryable(self, method, status):
+        """
+        Determines if a call that ended with the status given may be attempted again.
+        :param method: The call's HTTP method.
+            type: str
+            required: yes
+            default: none
+        :param status: The response's status code, or CONNECTION_FAILED if no response was received.
+            type: int
+            required: yes
+            default: none
+        :return: bool
+        """
+        if status == THROTTLED and THROTTLED in self.__statuses:
+            return True
+        if method.upper() not in self.__methods:
+            return False
+        return status is CONNECTION_FAILED or status in self.__statuses
+
+    # end is_retryable()
+
+    def next_delay(self, method, resp, attempt, started):
+        """
+        Decides whether to retry a call and, if so, how many seconds to wait beforehand.
+        :param method: The call's HTTP method.
+            type: str
+            required: yes
+            default: none
+        :param resp: The server's response, or None if the connection failed.
+            type: requests.Response object
+            required: yes
+            default: none
+        :param attempt: The number of retries already made.
+            type: int
+            required: yes
+            default: none
+        :param started: When the first attempt began, as given by time.monotonic().
+            type: float
+            required: yes
+            default: none
+        :return: float, or None if the call should not be retried
+        """
+        status = CONNECTION_FAILED if resp is None else resp.status_code
+        if attempt >= self.__max_retries or not self.is_retryable(method, status):
+            return None
+        delay = min(self.__max_backoff, self.__backoff * BACKOFF_FACTOR ** attempt)
+        if self.__jitter:
+            delay = random.uniform(0, delay)
+        if resp is not None:
+            retry_after = self.parse_retry_after(resp.headers.get(RETRY_AFTER))
+            if retry_after is not None:
+                delay = max(delay, retry_after)
+        if time.monotonic() - started + delay > self.__budget:
+            return None
+        return delay
+
+    # end next_delay()
+
+# end class RetryPolicy
+
+# the policy every Dnac object follows unless given another one
+DEFAULT_RETRY_POLICY = RetryPolicy()
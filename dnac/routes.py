@@ -0,0 +1,239 @@
+
+# globals
+
+MODULE = 'routes.py'
+
+# route names
+TASK = 'task'
+FILE = 'file'
+SITE = 'site'
+SITE_HEALTH = 'site-health'
+SITE_COUNT = 'site-count'  # appended to SITE
+CLIENT = 'client-detail'
+NETWORK_DEVICE = 'network-device'
+DEVICE_DETAIL = 'device-detail'
+PROJECT = 'project'
+TEMPLATE = 'template'
+DEPLOYMENT = 'deployment'
+COMMANDRUNNER = 'commandrunner'
+ARCHIVE = 'archive-config'
+ARCHIVE_SETTINGS = 'archive-config-settings'
+DEVICE_ARCHIVE = 'device-archive'
+VERSION = 'version'
+VERSION_SUB = 'version-sub'  # appended to VERSION/<device UUID>
+CONFIG_FILE_SUB = 'config-file-sub'  # appended to a Version's resource
+
+# Each Cisco DNA Center version lists only the routes that changed since the version before it and inherits all of
+# the others.  To support a new version, append it here along with whatever it changed.
+ROUTE_CHANGES = (
+    ('1.2.8', {
+        TASK: '/api/v1/task',
+        FILE: '/api/v1/file',
+        NETWORK_DEVICE: '/dna/intent/api/v1/network-device',
+        TEMPLATE: '/api/v1/template-programmer/template',
+        DEPLOYMENT: '/api/v1/template-programmer/template/deploy/status',
+        COMMANDRUNNER: '/api/v1/network-device-poller/cli/read-request'
+    }),
+    ('1.2.10', {
+        FILE: '/dna/intent/api/v1/file',
+        SITE: '/dna/intent/api/v1/site',
+        SITE_HEALTH: '/dna/intent/api/v1/site-health',
+        SITE_COUNT: '/count',
+        CLIENT: '/dna/intent/api/v1/client-detail',
+        DEVICE_DETAIL: '/dna/intent/api/v1/device-detail',
+        TEMPLATE: '/api/v2/template-programmer/template',
+        ARCHIVE: '/api/v1/archive-config',
+        ARCHIVE_SETTINGS: '/api/v1/archive-config/setting',
+        DEVICE_ARCHIVE: '/api/v1/archive-config/network-device',
+        VERSION: '/api/v1/archive-config/network-device',
+        VERSION_SUB: '/version',
+        CONFIG_FILE_SUB: '/file'
+    }),
+    ('1.3.0.2', {
+        FILE: '/api/v1/file',
+        NETWORK_DEVICE: '/api/v1/network-device',
+        DEVICE_DETAIL: '/api/v1/device-detail'
+    }),
+    ('1.3.0.3', {}),
+    ('1.3.1.3', {
+        PROJECT: '/api/v2/template-programmer/project'
+    }),
+    ('1.3.1.4', {
+        TASK: '/dna/intent/api/v1/task',
+        TEMPLATE: '/dna/intent/api/v1/template-programmer/template',
+        DEPLOYMENT: '/dna/intent/api/v1/template-programmer/template/deploy/status/'
+    })
+)
+
+# error messages
+NO_ROUTE = 'No route in Cisco DNA Center version'
+UNSUPPORTED_VERSION = 'No routes for Cisco DNA Center version'
+
+
+class RouteError(Exception):
+    """
+    The RouteError exception class, derived from Exception, indicates that an API is not available in the Cisco DNA
+    Center version being used.
+
+    Attributes:
+        none
+    """
+
+    def __init__(self, msg):
+        """
+        RouteError's __init__ method passes a message to its parent class.
+        :param msg: An error message indicating the problem.
+            type: str
+            required: yes
+            default: none
+        """
+        super(RouteError, self).__init__(msg)
+
+# end class RouteError
+
+# end exceptions
+
+
+def compile_routes(changes):
+    """
+    Expands a list of per-version route changes into the complete set of routes for every version.
+    :param changes: (version, routes changed) pairs in release order.
+        type: tuple of tuple
+        required: yes
+        default: none
+    :return: dict of version to dict of route name to path
+    """
+    routes = {}
+    current = {}
+    for version, changed in changes:
+        current = dict(current, **changed)
+        routes[version] = current
+    return routes
+
+# end compile_routes()
+
+
+ROUTES = compile_routes(ROUTE_CHANGES)
+SUPPORTED_DNAC_VERSIONS = [version for version, changed in ROUTE_CHANGES]
+
+
+def resource_paths(route):
+    """
+    Lists a route's path in every version that has it, in the form of the per-module *_RESOURCE_PATH dicts.
+    :param route: The route's name, e.g. TASK.
+        type: str
+        required: yes
+        default: none
+    :return: dict of version to path
+    """
+    return {version: paths[route] for version, paths in ROUTES.items() if route in paths}
+
+# end resource_paths()
+
+
+class RouteTable(object):
+    """
+    The RouteTable class holds one Cisco DNA Center cluster's routes.  Dnac builds it once, when it is created, with
+    each route's path and full URL prefix already worked out, so API objects only need a dictionary lookup to find
+    their resource.
+
+    Attributes:
+        version: The Cisco DNA Center version whose routes the table holds.
+            type: str
+            default: none
+            scope: protected
+        paths: Each route's resource path.
+            type: dict
+            default: none
+            scope: protected
+
+    Usage:
+        d = Dnac()
+        url = d.routes.url(TASK)  # e.g. https://dnac.example.com:443/api/v1/task
+        if DEVICE_DETAIL in d.routes:
+            path = d.routes.path(DEVICE_DETAIL)
+    """
+
+    def __init__(self, version, url):
+        """
+        Resolves the routes of a Cisco DNA Center version.
+        :param version: The Cisco DNA Center version.
+            type: str
+            required: yes
+            default: none
+        :param url: The cluster's base URL, e.g. https://dnac.example.com:443.
+            type: str
+            required: yes
+            default: none
+        """
+        if version not in ROUTES:
+            raise RouteError('%s: %s' % (UNSUPPORTED_VERSION, version))
+        self.__version = version
+        self.__paths = ROUTES[version]
+        self.__urls = {route: '%s%s' % (url, path) for route, path in self.__paths.items()}
+
+    # end __init__()
+
+    @property
+    def version(self):
+        """
+        Returns the Cisco DNA Center version whose routes the table holds.
+        :return: str
+        """
+        return self.__version
+
+    # end version getter
+
+    @property
+    def paths(self):
+        """
+        Returns each route's resource path.
+        :return: dict
+        """
+        return dict(self.__paths)
+
+    # end paths getter
+
+    def path(self, route):
+        """
+        Gives a route's resource path, e.g. /api/v1/task.  Raises a RouteError if the version does not have it.
+        :param route: The route's name, e.g. TASK.
+            type: str
+            required: yes
+            default: none
+        :return: str
+        """
+        try:
+            return self.__paths[route]
+        except KeyError:
+            raise RouteError('%s %s: %s' % (NO_ROUTE, self.__version, route))
+
+    # end path()
+
+    def url(self, route):
+        """
+        Gives a route's full URL, i.e. the cluster's base URL followed by the route's path.  Raises a RouteError if
+        the version does not have it.
+        :param route: The route's name, e.g. TASK.
+            type: str
+            required: yes
+            default: none
+        :return: str
+        """
+        try:
+            return self.__urls[route]
+        except KeyError:
+            raise RouteError('%s %s: %s' % (NO_ROUTE, self.__version, route))
+
+    # end url()
+
+    def __contains__(self, route):
+        """
+        Indicates whether the version has a route.
+        :return: bool
+        """
+        return route in self.__paths
+
+    # end __contains__()
+
+# end class RouteTable
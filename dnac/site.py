@@ -1,7 +1,7 @@
 
-from dnac import DnacError, \
-                 SUPPORTED_DNAC_VERSIONS, \
-                 UNSUPPORTED_DNAC_VERSION
+from dnac.routes import SITE, \
+                        SITE_HEALTH, \
+                        resource_paths
 from dnac.dnacapi import DnacApi, \
                          DnacApiError
 from dnac.crud import OK, \
@@ -9,6 +9,8 @@ from dnac.crud import OK, \
                       ERROR_MSGS, \
                       _500_
 from dnac.timestamp import TimeStamp
+from dnac.projection import NO_PROJECTION, \
+                            project
 import json
 
 # globals
@@ -16,21 +18,9 @@ import json
 MODULE = 'site.py'
 
 
-SITE_RESOURCE_PATH = {
-    '1.2.10': '/dna/intent/api/v1/site',
-    '1.3.0.2': '/dna/intent/api/v1/site',
-    '1.3.0.3': '/dna/intent/api/v1/site',
-    '1.3.1.3': '/dna/intent/api/v1/site',
-    '1.3.1.4': '/dna/intent/api/v1/site'
-}
+SITE_RESOURCE_PATH = resource_paths(SITE)
 
-SITE_HEALTH_RESOURCE_PATH = {
-    '1.2.10': '/dna/intent/api/v1/site-health',
-    '1.3.0.2': '/dna/intent/api/v1/site-health',
-    '1.3.0.3': '/dna/intent/api/v1/site-health',
-    '1.3.1.3': '/dna/intent/api/v1/site-health',
-    '1.3.1.4': '/dna/intent/api/v1/site-health'
-}
+SITE_HEALTH_RESOURCE_PATH = resource_paths(SITE_HEALTH)
 
 STUB_SITE = 'STUB_SITE'
 LOCATION = 'Location'
@@ -58,6 +48,7 @@ RF_MODELS = {
 
 NO_SITE = {}
 NO_SITE_HEALTH = {}
+RUNSYNC_HDRS = {'__runsync': 'true'}  # asks DNAC to finish adding a site before responding
 SINGLE_SITE = 1
 INVALID_SITE_TYPE_ERROR = 'Illegal site type'
 INVALID_RF_MODEL_ERROR = 'Illegal RF model'
@@ -114,7 +105,8 @@ class Site(DnacApi):
                  dnac,
                  site_name_hierarchy,  # use the site's name hierarchy to ensure uniqueness
                  verify=False,
-                 timeout=5):
+                 timeout=5,
+                 keep_results=True):
         """
         Creates a new Site object and loads its information from the Cisco DNA Center cluster specified.
         :param dnac: The Cisco DNAC cluster object from which to load the site's information.
@@ -133,19 +125,21 @@ class Site(DnacApi):
             type: int
             required: no
             default: 5
+        :param keep_results: Flag indicating whether or not to keep the last raw API response in results.
+            type: bool
+            required: no
+            default: True
         """
-        if dnac.version in SUPPORTED_DNAC_VERSIONS:
-            path = SITE_RESOURCE_PATH[dnac.version]
-            self.__site_health_resource = SITE_HEALTH_RESOURCE_PATH[dnac.version]
-        else:
-            raise DnacError('__init__: %s: %s' % (UNSUPPORTED_DNAC_VERSION, dnac.version))
+        path = dnac.routes.path(SITE)
+        self.__site_health_resource = dnac.routes.path(SITE_HEALTH)
         self.__site = NO_SITE
         self.__site_health = NO_SITE_HEALTH
         super(Site, self).__init__(dnac,
                                    site_name_hierarchy,
                                    resource=path,
                                    verify=verify,
-                                   timeout=timeout)
+                                   timeout=timeout,
+                                   keep_results=keep_results)
         if site_name_hierarchy != STUB_SITE:
             self.load_site(site_name_hierarchy)
 
@@ -351,6 +345,8 @@ class Site(DnacApi):
                 MODULE, 'load_site', MULTIPLE_SITES_FOUND, '', SINGLE_SITE, len(site['response']), '', ''
             )
         self.__site = site['response'][0]
+        # now that its UUID is known, let Dnac.api find the site by it
+        self.dnac.api.reindex(site_name_hierarchy, Site)
         return self.__site
 
     # end load_site
@@ -371,7 +367,7 @@ class Site(DnacApi):
         area = {'name': name, 'parentName': parent_name_hierarchy}
         site = {'area': area}
         body = {'type': AREA, 'site': site}
-        return json.dumps(body)
+        return self.dnac.codec.dumps(body)
 
     # end __make_area_body__()
 
@@ -406,7 +402,7 @@ class Site(DnacApi):
             building['address'] = address
         site = {'building': building}
         body = {'type': BUILDING, 'site': site}
-        return json.dumps(body)
+        return self.dnac.codec.dumps(body)
 
     # end __make_building_body()
 
@@ -443,7 +439,7 @@ class Site(DnacApi):
                  'length': length, 'height': height}
         site = {'floor': floor}
         body = {'type': FLOOR, 'site': site}
-        return json.dumps(body)
+        return self.dnac.codec.dumps(body)
 
     # end __make_floor_body__()
 
@@ -500,11 +496,9 @@ class Site(DnacApi):
             raise DnacApiError(
                 MODULE, 'add_site', INVALID_SITE_TYPE_ERROR, '', '', site_type, '', VALID_SITE_TYPES_RESOLUTION
             )
-        headers = {'__runsync': 'true'}
-        headers.update(self.dnac.hdrs)
         url = '%s%s' % (self.dnac.url, self.resource)
         results, status = self.crud.post(url,
-                                         headers=headers,
+                                         headers=self.dnac.hdrs_with(RUNSYNC_HDRS),
                                          body=body,
                                          verify=self.verify,
                                          timeout=self.timeout)
@@ -532,9 +526,13 @@ class Site(DnacApi):
 
     # end add_site()
 
-    def get_all_sites_health(self):
+    def get_all_sites_health(self, projection=NO_PROJECTION):
         """
         Returns the site health information for every site.
+        :param projection: The fields to keep from each site's health: a list of keys or a callable.  See dnac.projection.
+            type: list of str or callable
+            required: no
+            default: None, which keeps every field
         :return: dict
         """
         time = TimeStamp()
@@ -549,18 +547,22 @@ class Site(DnacApi):
                 MODULE, 'get_all_sites_health', REQUEST_NOT_OK, url,
                 OK, status, ERROR_MSGS[status], str(health)
             )
-        self.__site_health = health['response']
+        self.__site_health = project(health['response'], projection)
         return self.__site_health
 
     # end get_all_sites_health()
 
-    def get_site_health_by_name(self, site_name):
+    def get_site_health_by_name(self, site_name, projection=NO_PROJECTION):
         """
-        Gives the named site's health.
+        Gives the named site's health.  The projection is applied after the site has been found by its name.
         :param site_name: The site's name.
             type: str
             required: yes
             default: none
+        :param projection: The fields to keep from the site's health: a list of keys or a callable.  See dnac.projection.
+            type: list of str or callable
+            required: no
+            default: None, which keeps every field
         :return: dict
         """
         target_site_health = NO_SITE_HEALTH
@@ -576,7 +578,7 @@ class Site(DnacApi):
                 MODULE, 'get_all_sites_health', SITE_NOT_FOUND, '',
                 site_name, '', '', SITE_NOT_FOUND_RESOLUTION
             )
-        self.__site_health = target_site_health
+        self.__site_health = project(target_site_health, projection)
         return self.__site_health
 
     # end get_site_health_by_name
@@ -1,34 +1,31 @@
 
 from dnac import DnacError, \
-                 SUPPORTED_DNAC_VERSIONS, \
-                 UNSUPPORTED_DNAC_VERSION, \
                  NO_DNAC_PATH, \
                  NO_DNAC_PATH_ERROR, \
                  NO_DNAC_PATH_RESOLUTION
+from dnac.routes import SITE, \
+                        SITE_COUNT, \
+                        resource_paths
 from dnac.dnacapi import DnacApi, \
                          DnacApiError
 from dnac.crud import OK, \
                       REQUEST_NOT_OK, \
                       ERROR_MSGS
-from dnac.site import Site, \
-                      SITE_RESOURCE_PATH
+from dnac.site import Site
+from dnac.projection import NO_PROJECTION, \
+                            projector
 from multi_key_dict import multi_key_dict
+import asyncio
 
 MODULE = 'site_hierarchy.py'
 
-SITE_COUNT_RESOURCE_PATH = {
-    '1.2.10': '/count',
-    '1.3.0.2': '/count',
-    '1.3.0.3': '/count',
-    '1.3.1.3': '/count',
-    '1.3.1.4': '/count'
-}
+SITE_COUNT_RESOURCE_PATH = resource_paths(SITE_COUNT)
 
 
 SITE_HIERARCHY_NAME = '_site_hierarchy'  # suffix used to differentiate between cluster hierarchies
 GLOBAL_SITE = 'Global'
 SITE_REQUEST_LIMIT = 500  # only a maximum of 500 site records may be retrieved at any give time
-SITE_API_THROTTLE = 1000  # DNAC throttles the site API to 1000 requests/min
+HIERARCHY_FIELDS = ['id', 'parentId', 'siteNameHierarchy']  # the least load_sites needs from each site record
 
 NO_GLOBAL_SITE_ERROR = 'Could not find the Global site'
 NO_CHILD = []
@@ -58,7 +55,8 @@ class SiteHierarchy(DnacApi):
             type: str
             default: Dnac.name or Dnac.ip + SITE_HIERARCHY_NAME
             scope: public
-        all_sites: The Cisco DNA Center information on all sites.
+        all_sites: The Cisco DNA Center information on all sites.  Each site holds every field unless load_sites or
+                   get_all_sites was given a projection.
             type: list
             default: []
             scope: protected
@@ -83,13 +81,18 @@ class SiteHierarchy(DnacApi):
     Usage:
         d = Dnac()
         hierarchy = SiteHierarchy(d)
+
+        # or, from a coroutine
+        hierarchy = SiteHierarchy(d, load=False)
+        await hierarchy.load_sites_async()
     """
 
     def __init__(self,
                  dnac,
                  name=SITE_HIERARCHY_NAME,
                  verify=False,
-                 timeout=5):
+                 timeout=5,
+                 load=True):
         """
         Creates at new Site object.
         :param dnac: The Cisco DNA Center cluster to which the site belongs.
@@ -108,11 +111,13 @@ class SiteHierarchy(DnacApi):
             type: int
             required: no
             default: 5
+        :param load: A flag indicating whether or not to load the hierarchy immediately.  Set it to False in order to
+                     load the hierarchy later, e.g. with load_sites_async.
+            type: bool
+            required: no
+            default: True
         """
-        if dnac.version in SUPPORTED_DNAC_VERSIONS:
-            path = SITE_RESOURCE_PATH[dnac.version]
-        else:
-            raise DnacError('__init__: %s: %s' % (UNSUPPORTED_DNAC_VERSION, dnac.version))
+        path = dnac.routes.path(SITE)
         if dnac.name != NO_DNAC_PATH:
             site_hierarchy_name = '%s%s' % (dnac.name, name)
         elif dnac.ip != NO_DNAC_PATH:
@@ -127,7 +132,8 @@ class SiteHierarchy(DnacApi):
         self.__all_sites = []
         self.__site_nodes = multi_key_dict()
         self.__site_count = NO_SITES
-        self.load_sites()
+        if load:
+            self.load_sites()
 
     @property
     def all_sites(self):
@@ -159,10 +165,7 @@ class SiteHierarchy(DnacApi):
         :return: int
         """
         # get the number of sites in the hierarchy
-        if self.dnac.version in SUPPORTED_DNAC_VERSIONS:
-            count_path = SITE_COUNT_RESOURCE_PATH[self.dnac.version]
-        else:
-            raise DnacError('__init__: %s: %s' % (UNSUPPORTED_DNAC_VERSION, self.dnac.version))
+        count_path = self.dnac.routes.path(SITE_COUNT)
         url = '%s%s%s' % (self.dnac.url, self.resource, count_path)
         response, status = self.crud.get(url,
                                          headers=self.dnac.hdrs,
@@ -175,23 +178,39 @@ class SiteHierarchy(DnacApi):
             raise DnacApiError(MODULE, 'get_site_count', NO_SITES_ERROR, '', '', '', '', '')
         return self.__site_count
 
-    def get_all_sites(self):
+    def __site_page_urls__(self):
+        """
+        A hidden method that computes the URLs needed to page through all of the cluster's sites.
+        :return: list of str
+        """
+        (rounds, remainder) = divmod(self.__site_count, SITE_REQUEST_LIMIT)
+        if remainder > 0:
+            rounds += 1
+        urls = []
+        offset = 1
+        for i in range(rounds):
+            filter = '?offset=%i&limit=%i' % (offset, SITE_REQUEST_LIMIT)
+            urls.append('%s%s%s' % (self.dnac.url, self.resource, filter))
+            offset += SITE_REQUEST_LIMIT
+        return urls
+
+    def get_all_sites(self, projection=NO_PROJECTION):
         """
         Places an API call to the hierarchy's Cisco DNA Center cluster for all sites listed in its design hierarchy.
+        Each page of sites is projected as soon as it arrives, so only one page of full site records is held at a
+        time.
+        :param projection: The fields to keep from each site: a list of keys or a callable.  See dnac.projection.
+            type: list of str or callable
+            required: no
+            default: None, which keeps every field
         :return: dict
         """
+        reduce = projector(projection)
         self.__all_sites = []
         self.get_site_count()
-        (rounds, remainder) = divmod(self.__site_count, SITE_REQUEST_LIMIT)
-        if remainder > 0:
-            rounds += 1
         if self.__site_count <= NO_SITES:
             raise DnacApiError(MODULE, 'get_all_sites', NO_SITES_ERROR, '', '', '', '', '')
-        i = 0
-        offset = 1
-        filter = '?offset=%i&limit=%i' % (offset, SITE_REQUEST_LIMIT)
-        url = '%s%s%s' % (self.dnac.url, self.resource, filter)
-        while i < rounds:
+        for url in self.__site_page_urls__():
             # get the next batch of sites
             response, status = self.crud.get(url,
                                              headers=self.dnac.hdrs,
@@ -199,36 +218,100 @@ class SiteHierarchy(DnacApi):
                                              timeout=self.timeout)
             if status != OK:
                 raise DnacApiError(MODULE, 'get_all_sites', REQUEST_NOT_OK, url, OK, status, ERROR_MSGS[status], '')
-            self.__all_sites = self.__all_sites + response['response']
-            offset += SITE_REQUEST_LIMIT
-            i += 1
+            self.__all_sites.extend(reduce(site) for site in response['response'])
         return self.__all_sites
 
-    def load_sites(self):
+    async def __get_site_page_async__(self, url, reduce):
+        """
+        A hidden coroutine that retrieves and projects one page of sites.
+        :param url: The page's URL.
+        :param reduce: The function that projects each site.
+        :return: list
+        """
+        response, status = await self.acrud.get(url,
+                                                headers=await self.dnac.hdrs_async(),
+                                                verify=self.verify,
+                                                timeout=self.timeout)
+        if status != OK:
+            raise DnacApiError(MODULE, 'get_all_sites_async', REQUEST_NOT_OK, url, OK, status, ERROR_MSGS[status], '')
+        return [reduce(site) for site in response['response']]
+
+    async def get_all_sites_async(self, projection=NO_PROJECTION):
+        """
+        Coroutine version of get_all_sites.  All pages of sites are requested concurrently.
+        :param projection: The fields to keep from each site: a list of keys or a callable.  See dnac.projection.
+            type: list of str or callable
+            required: no
+            default: None, which keeps every field
+        :return: dict
+        """
+        reduce = projector(projection)
+        self.__all_sites = []
+        await self.acrud.call(self.get_site_count)
+        if self.__site_count <= NO_SITES:
+            raise DnacApiError(MODULE, 'get_all_sites_async', NO_SITES_ERROR, '', '', '', '', '')
+        pages = await asyncio.gather(*[self.__get_site_page_async__(url, reduce) for url in self.__site_page_urls__()])
+        for page in pages:
+            self.__all_sites.extend(page)
+        return self.__all_sites
+
+    def load_sites(self, projection=NO_PROJECTION):
         """
         Instructs the SiteHierarchy object to load all sites from the Cisco DNA Center's site design hierarchy.  This
         method can be used to load a new hierarchy object or to refresh one that has sites which have been added or
         deleted.
+        :param projection: The fields to keep from each site in all_sites, e.g. HIERARCHY_FIELDS to hold only what
+                           building the hierarchy needs; the Site objects in the hierarchy still hold the rest.  The
+                           projection must keep the HIERARCHY_FIELDS.
+            type: list of str
+            required: no
+            default: None, which keeps every field
+        :return: dict
+        """
+        self.get_all_sites(projection=projection)
+        return self.__build_hierarchy__('load_sites')
+
+    async def load_sites_async(self, projection=NO_PROJECTION):
+        """
+        Coroutine version of load_sites.  The sites' pages are retrieved concurrently, and then every site that the
+        Dnac object does not yet hold is loaded concurrently before the hierarchy is assembled.
+        :param projection: The fields to keep from each site in all_sites, e.g. HIERARCHY_FIELDS to hold only what
+                           building the hierarchy needs; the Site objects in the hierarchy still hold the rest.  The
+                           projection must keep the HIERARCHY_FIELDS.
+            type: list of str
+            required: no
+            default: None, which keeps every field
+        :return: dict
+        """
+        await self.get_all_sites_async(projection=projection)
+        new_sites = [site['siteNameHierarchy'] for site in self.__all_sites
+                     if self.dnac.api.by_id(site['id'], Site) is None]
+        await asyncio.gather(*[self.acrud.call(Site, self.dnac, name, keep_results=False) for name in new_sites])
+        return self.__build_hierarchy__('load_sites_async')
+
+    def __build_hierarchy__(self, caller):
+        """
+        A hidden method that assembles the SiteNodes from the sites retrieved by get_all_sites, starting at the
+        Global site.
+        :param caller: The name of the calling method for error reporting.
         :return: dict
         """
-        self.get_all_sites()
         # find the site hierarchy's root: siteNameHierarchy = "Global"
         global_site_node = None
         for site in self.__all_sites:
             if site['siteNameHierarchy'] != GLOBAL_SITE:
                 continue
             else:  # found the root
-                global_site = Site(self.dnac, GLOBAL_SITE)
+                global_site = self.dnac.api.by_id(site['id'], Site)
+                if global_site is None:
+                    global_site = Site(self.dnac, GLOBAL_SITE, keep_results=False)
                 global_site_node = SiteNode(global_site)
                 self.add_site_node(global_site_node)
                 break
         if global_site_node is None:
-            raise DnacApiError(MODULE, 'load_sites', NO_GLOBAL_SITE_ERROR, '', '', str(global_site_node), '', '')
+            raise DnacApiError(MODULE, caller, NO_GLOBAL_SITE_ERROR, '', '', str(global_site_node), '', '')
         # starting from the global site, load all children recursively
-        #
-        #  need a throttle here; this is where the majority of the site calls are being made
-        #  perhaps the throttle should be part of a SiteHierarchy instance?
-        #
+        #   the Dnac object's rate limiter keeps these site calls within ratelimiter.SITE_API_THROTTLE
         self.__load_children__(global_site_node)
         return self.__site_nodes
 
@@ -261,12 +344,13 @@ class SiteHierarchy(DnacApi):
             if site['parentId'] != parent_node.site.id:
                 continue
             else:
-                if site['siteNameHierarchy'] not in self.dnac.api.keys():
+                # look the site up by its UUID so another API object sharing its name is never mistaken for it
+                child_site = self.dnac.api.by_id(site['id'], Site)
+                if child_site is None:
                     # site does not exist; create it now
-                    child_site = Site(self.dnac, site['siteNameHierarchy'])
+                    child_site = Site(self.dnac, site['siteNameHierarchy'], keep_results=False)
                 else:
                     # site exists; get it from Dnac.api
-                    child_site = self.dnac.api[site['siteNameHierarchy']]
                     if site['siteNameHierarchy'] in self.__site_nodes.keys():
                         # the site and its site node both exist; nothing to do
                         continue
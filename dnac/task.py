@@ -1,26 +1,19 @@
 
-from dnac import DnacError, \
-                 SUPPORTED_DNAC_VERSIONS, \
-                 UNSUPPORTED_DNAC_VERSION
+from dnac.routes import TASK, \
+                        resource_paths
 from dnac.dnacapi import DnacApi, \
                          DnacApiError
 from dnac.crud import OK, \
                       REQUEST_NOT_OK, \
                       ERROR_MSGS
+import asyncio
 import time
 
 # globals
 
 MODULE = 'task.py'
 
-TASK_RESOURCE_PATH = {
-                      '1.2.8': '/api/v1/task',
-                      '1.2.10': '/api/v1/task',
-                      '1.3.0.2': '/api/v1/task',
-                      '1.3.0.3': '/api/v1/task',
-                      '1.3.1.3': '/api/v1/task',
-                      '1.3.1.4': '/dna/intent/api/v1/task'
-}
+TASK_RESOURCE_PATH = resource_paths(TASK)
 
 PROGRESS_KEY = 'progress'
 END_TIME_KEY = 'endTime'
@@ -57,12 +50,10 @@ class Task(DnacApi):
                  dnac,
                  id,
                  verify=False,
-                 timeout=5):
+                 timeout=5,
+                 keep_results=False):
         # check Cisco DNA Center's version and set the resource path
-        if dnac.version in SUPPORTED_DNAC_VERSIONS:
-            path = TASK_RESOURCE_PATH[dnac.version]
-        else:
-            raise DnacError('__init__: %s: %s' % (UNSUPPORTED_DNAC_VERSION, dnac.version))
+        path = dnac.routes.path(TASK)
         # setup the attributes
         self.__task = {}
         self.__id = id
@@ -70,7 +61,8 @@ class Task(DnacApi):
                                    ('task_%s' % self.__id),
                                    resource=path,
                                    verify=verify,
-                                   timeout=timeout)
+                                   timeout=timeout,
+                                   keep_results=keep_results)
 
     # end __init__()
 
@@ -163,11 +155,34 @@ class Task(DnacApi):
             raise DnacApiError(
                 MODULE, '__check_task__', REQUEST_NOT_OK, url, OK, status, ERROR_MSGS[status], str(results)
             )
+        if self.dnac.metrics is not None:
+            self.dnac.metrics.task_polled()
         self.__task = results['response']
         return self.__task
 
     # end check_task()
 
+    async def __check_task_async__(self):
+        """
+        Hidden coroutine version of __check_task__.
+        :return: dict
+        """
+        url = '%s%s/%s' % (self.dnac.url, self.resource, self.id)
+        results, status = await self.acrud.get(url,
+                                               headers=await self.dnac.hdrs_async(),
+                                               verify=self.verify,
+                                               timeout=self.timeout)
+        if status != OK:
+            raise DnacApiError(
+                MODULE, '__check_task_async__', REQUEST_NOT_OK, url, OK, status, ERROR_MSGS[status], str(results)
+            )
+        if self.dnac.metrics is not None:
+            self.dnac.metrics.task_polled()
+        self.__task = results['response']
+        return self.__task
+
+    # end __check_task_async__()
+
     def get_task_results(self, wait=3):
         """
         Checks for the task's endTime.  If endTime does not exist, then the method waits for the number of seconds
@@ -185,4 +200,21 @@ class Task(DnacApi):
 
     # end get_task_results()
 
+    async def get_task_results_async(self, wait=3):
+        """
+        Coroutine version of get_task_results.  Between checks, it yields to the event loop instead of sleeping in the
+        calling thread, so many tasks can be monitored at once.
+        :param wait: Number of seconds to wait before checking again.
+            type: int
+            required: no
+            default: 3
+        :return: dict
+        """
+        while END_TIME_KEY not in self.__task.keys():
+            await asyncio.sleep(wait)
+            await self.__check_task_async__()
+        return self.__task
+
+    # end get_task_results_async()
+
 # end class Task()
@@ -1,6 +1,7 @@
-from dnac import DnacError, \
-                 SUPPORTED_DNAC_VERSIONS, \
-                 UNSUPPORTED_DNAC_VERSION
+from dnac import UNSUPPORTED_DNAC_VERSION
+from dnac.routes import PROJECT, \
+                        TEMPLATE, \
+                        resource_paths
 from dnac.dnacapi import DnacApi, \
                          DnacApiError
 from dnac.crud import OK, \
@@ -11,22 +12,19 @@ from dnac.crud import OK, \
                       _500_
 from dnac.deployment import Deployment
 from dnac.project import Project, \
-                         PROJECT_RESOURCE_PATH, \
                          NO_TEMPLATES
 from dnac.task import Task
+from dnac.jsonstream import TOP_LEVEL
+from dnac.projection import NO_PROJECTION, \
+                            projector, \
+                            project
+import asyncio
 import json
 import time
 
 MODULE = 'template.py'
 
-TEMPLATE_RESOURCE_PATH = {
-    '1.2.8': '/api/v1/template-programmer/template',
-    '1.2.10': '/api/v2/template-programmer/template',
-    '1.3.0.2': '/api/v2/template-programmer/template',
-    '1.3.0.3': '/api/v2/template-programmer/template',
-    '1.3.1.3': '/api/v2/template-programmer/template',
-    '1.3.1.4': '/dna/intent/api/v1/template-programmer/template'
-}
+TEMPLATE_RESOURCE_PATH = resource_paths(TEMPLATE)
 
 POST_1_2_8 = ['1.2.10', '1.3.0.2', '1.3.0.3', '1.3.1.3', '1.3.1.4']
 
@@ -176,10 +174,7 @@ class Template(DnacApi):
             default: 5
         """
         # check Cisco DNA Center's version and set the resource path
-        if dnac.version in SUPPORTED_DNAC_VERSIONS:
-            path = TEMPLATE_RESOURCE_PATH[dnac.version]
-        else:
-            raise DnacError('__init__: %s: %s' % (UNSUPPORTED_DNAC_VERSION, dnac.version))
+        path = dnac.routes.path(TEMPLATE)
 
         # template attributes
         self.__template = {}  # contents of the template info found by querying all available templates
@@ -339,8 +334,8 @@ class Template(DnacApi):
         # prepare the template for import
         template = self.__prepare_template__(template)
         # add the template into DNA Center
-        url = '%s%s/%s/template' % (self.dnac.url, PROJECT_RESOURCE_PATH[self.dnac.version], project.project_id)
-        body = json.dumps(template)
+        url = '%s/%s/template' % (self.dnac.routes.url(PROJECT), project.project_id)
+        body = self.dnac.codec.dumps(template)
         results, status = self.crud.post(url,
                                          headers=self.dnac.hdrs,
                                          body=body,
@@ -379,18 +374,16 @@ class Template(DnacApi):
         # ensure the template is correctly formatted
         self.__is_versioned_template__(version)
         # check if the template associated with the new version is already in Dnac
-        if version['name'] not in self.dnac.api:
+        template = self.dnac.api.find(Template, version['name'])
+        if template is None:
             # if not, throw an error
             raise DnacApiError(MODULE, 'add_version', '%s %s' % (TEMPLATE_NOT_FOUND, version['name']), '',
                                '', '', '', CALL_ADD_NEW_TEMPLATE)
-        else:
-            # if so, save a pointer to it
-            template = self.dnac.api[version['name']]
         # prepare the new version
         self.__prepare_version__(version, template)
         # add the new version to DNAC
-        url = '%s%s' % (self.dnac.url, TEMPLATE_RESOURCE_PATH[self.dnac.version])
-        body = json.dumps(version)
+        url = self.dnac.routes.url(TEMPLATE)
+        body = self.dnac.codec.dumps(version)
         results, status = self.crud.put(url,
                                         headers=self.dnac.hdrs,
                                         body=body,
@@ -435,10 +428,9 @@ class Template(DnacApi):
         file.close()
 
         # load the template's project info; check Dnac first
-        if template['projectName'] in self.dnac.api:
-            project = self.dnac.api[template['projectName']]
+        project = self.dnac.api.find(Project, template['projectName'])
         # not in Dnac so load it from DNAC
-        else:
+        if project is None:
             # if the project does not exist, an exception will be thrown
             project = Project(self.dnac, template['projectName'])
 
@@ -474,7 +466,7 @@ class Template(DnacApi):
         url = '%s%s%s' % (self.dnac.url, self.resource, TEMPLATE_VERSION_PATH[self.dnac.version])
         results, status = self.crud.post(url,
                                          headers=self.dnac.hdrs,
-                                         body=json.dumps(body),
+                                         body=self.dnac.codec.dumps(body),
                                          verify=self.verify,
                                          timeout=timeout)
         if status != ACCEPTED:
@@ -671,25 +663,71 @@ class Template(DnacApi):
 
     # end deployment getter
 
-    def get_all_templates(self):
+    def get_all_templates(self, projection=NO_PROJECTION):
         """
         Class method getAllTemplates queries the Cisco DNA Center cluster for a listing of every template it has.
-        The listing includes the base templates and all of its versions.
+        The listing includes the base templates and all of its versions.  The listing is streamed rather than decoded
+        whole, and when given a projection, each template is reduced to the fields requested as soon as it is parsed.
+        :param projection: The fields to keep from each template: a list of keys or a callable.  See dnac.projection.
+            type: list of str or callable
+            required: no
+            default: None, which keeps every field
         :return: list
         """
+        return list(self.stream_all_templates(projection=projection))
+
+    # end get_all_templates()
+
+    def stream_all_templates(self, projection=NO_PROJECTION):
+        """
+        Class method stream_all_templates yields the same listing as get_all_templates, one template at a time as the
+        listing downloads, so that the whole listing is never held in memory.
+        :param projection: The fields to keep from each template: a list of keys or a callable.  See dnac.projection.
+            type: list of str or callable
+            required: no
+            default: None, which keeps every field
+        :return: generator of dict, or of whatever the projection returns
+        """
+        reduce = projector(projection)  # reject a bad projection before placing the call
         filter = '?unCommitted=true'
         url = '%s%s%s' % (self.dnac.url, self.resource, filter)
-        templates, status = self.crud.get(url,
-                                          headers=self.dnac.hdrs,
-                                          verify=self.verify,
-                                          timeout=self.timeout)
+        templates, status = self.crud.stream(url,
+                                             headers=self.dnac.hdrs,
+                                             key=TOP_LEVEL,
+                                             verify=self.verify,
+                                             timeout=self.timeout)
         if status != OK:
             raise DnacApiError(
-                MODULE, 'get_all_templates', REQUEST_NOT_OK, url, OK, status, ERROR_MSGS[status], str(templates)
+                MODULE, 'stream_all_templates', REQUEST_NOT_OK, url, OK, status, ERROR_MSGS[status], str(templates)
             )
-        return templates
+        if projection is NO_PROJECTION:
+            return templates
+        return (reduce(template) for template in templates)
 
-    # end get_all_templates()
+    # end stream_all_templates()
+
+    async def get_all_templates_async(self, projection=NO_PROJECTION):
+        """
+        Coroutine version of get_all_templates.  The response is decoded whole and then projected.
+        :param projection: The fields to keep from each template: a list of keys or a callable.  See dnac.projection.
+            type: list of str or callable
+            required: no
+            default: None, which keeps every field
+        :return: list
+        """
+        filter = '?unCommitted=true'
+        url = '%s%s%s' % (self.dnac.url, self.resource, filter)
+        templates, status = await self.acrud.get(url,
+                                                 headers=await self.dnac.hdrs_async(),
+                                                 verify=self.verify,
+                                                 timeout=self.timeout)
+        if status != OK:
+            raise DnacApiError(
+                MODULE, 'get_all_templates_async', REQUEST_NOT_OK, url, OK, status, ERROR_MSGS[status], str(templates)
+            )
+        return project(templates, projection)
+
+    # end get_all_templates_async()
 
     def get_template_by_id(self, id):
         """
@@ -714,6 +752,28 @@ class Template(DnacApi):
 
     # end get_template_by_id
 
+    async def get_template_by_id_async(self, id):
+        """
+        Coroutine version of get_template_by_id.
+        :param id: The template's UUID
+            type: str
+            required: yes
+            default: None
+        :return: dict
+        """
+        url = self.dnac.url + self.resource + '/' + id
+        template, status = await self.acrud.get(url,
+                                                headers=await self.dnac.hdrs_async(),
+                                                verify=self.verify,
+                                                timeout=self.timeout)
+        if status != OK:
+            raise DnacApiError(
+                MODULE, 'get_template_by_id_async', REQUEST_NOT_OK, url, OK, status, ERROR_MSGS[status], str(template)
+            )
+        return template
+
+    # end get_template_by_id_async()
+
     def get_versioned_template(self, version):
         """
         get_versioned_template searches the Template object's versions for the version requested and returns it.  Use
@@ -769,11 +829,55 @@ class Template(DnacApi):
         if bool(self.__template['versionsInfo']):  # at least one committed version exists
             for version in self.__template['versionsInfo']:
                 self.__versions[int(version['version'])] = self.get_template_by_id(version['id'])
+        # now that its UUID is known, let Dnac.api find the template by it
+        self.dnac.api.reindex(self.name, Template)
         # all done - return the template
         return self
 
     # end load_template()
 
+    async def load_template_async(self, name):
+        """
+        Coroutine version of load_template.  The parent template and all of its committed versions are requested
+        concurrently rather than one after another.
+        :param name: The template's name as given in Cisco DNAC
+            type: str
+            required: yes
+            default: None
+        :return: Template object
+        """
+        # search all templates for the target
+        templates = await self.get_all_templates_async()
+        if bool(templates):  # templates is not empty
+            for template in templates:
+                # find the template by name
+                if template['name'] == name:
+                    self.__template = template
+                    break
+            # make sure the template is not empty
+            if self.__template == TEMPLATE_IS_EMPTY:
+                raise DnacApiError(
+                    MODULE, 'load_template_async', EMPTY_TEMPLATE, '', '', '', '', ''
+                )
+        else:
+            raise DnacApiError(
+                MODULE, 'load_template_async', NO_TEMPLATES_FOUND, '', '', '', '', ''
+            )
+        # load the parent template (version 0) and all committed versions at once
+        version_ids = {0: self.__template['templateId']}
+        for version in self.__template['versionsInfo'] or []:
+            version_ids[int(version['version'])] = version['id']
+        numbers = list(version_ids.keys())
+        loaded = await asyncio.gather(*[self.get_template_by_id_async(version_ids[number]) for number in numbers])
+        for number, version in zip(numbers, loaded):
+            self.__versions[number] = version
+        # now that its UUID is known, let Dnac.api find the template by it
+        self.dnac.api.reindex(self.name, Template)
+        # all done - return the template
+        return self
+
+    # end load_template_async()
+
     def __make_body__(self):
         """
         The __make_body__ method converts the Template object's target and versioned template information into a JSON
@@ -802,7 +906,7 @@ class Template(DnacApi):
                 MODULE, 'make_body', UNSUPPORTED_DNAC_VERSION, '',
                 '', self.dnac.version, '', ''
             )
-        return json.dumps(body)
+        return self.dnac.codec.dumps(body)
 
     # end make_body()
 
@@ -0,0 +1,306 @@
+
+import json
+import os
+import tempfile
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# globals
+
+MODULE = 'tokencache.py'
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.dnac')
+DEFAULT_CACHE_FILE = 'tokens.json'
+LOCK_SUFFIX = '.lock'
+
+CACHE_DIR_MODE = 0o700
+CACHE_FILE_MODE = 0o600
+INSECURE_MODE_BITS = 0o077  # any access for the group or other users
+
+SHARED = False
+EXCLUSIVE = True
+LOCK_BYTES = 1
+
+# error messages
+INSECURE_CACHE = 'Token cache is not private to its owner'
+INSECURE_CACHE_RESOLUTION = 'Remove the file or restrict it with chmod 600'
+
+
+class TokenCacheError(Exception):
+    """
+    The TokenCacheError exception class, derived from Exception, indicates that the token cache cannot be trusted.
+
+    Attributes:
+        none
+    """
+
+    def __init__(self, msg):
+        """
+        TokenCacheError's __init__ method passes a message to its parent class.
+        :param msg: An error message indicating the problem.
+            type: str
+            required: yes
+            default: none
+        """
+        super(TokenCacheError, self).__init__(msg)
+
+# end class TokenCacheError
+
+# end exceptions
+
+
+class TokenCache(object):
+    """
+    The TokenCache class stores x-auth-tokens in a file so that separate processes, e.g. cron jobs and CLI scripts,
+    can reuse a valid token instead of logging into Cisco DNA Center every time they start.  Tokens are kept per
+    cluster URL and user.
+
+    Readers and writers coordinate through a lock file next to the cache, and the cache is replaced atomically so a
+    reader never sees a partial update.  Because the cache holds credentials, it is created readable by its owner
+    only; on POSIX systems, a cache owned by another user or accessible to anyone else raises a TokenCacheError rather
+    than being used.
+
+    Attributes:
+        path: The file holding the cached tokens.
+            type: str
+            default: ~/.dnac/tokens.json
+            scope: protected
+
+    Usage:
+        d = Dnac(token_cache=TokenCache())
+    """
+
+    def __init__(self, path=None):
+        """
+        Creates a new TokenCache.  The file itself is not created until a token is stored.
+        :param path: The file holding the cached tokens.
+            type: str
+            required: no
+            default: DEFAULT_CACHE_DIR/DEFAULT_CACHE_FILE
+        """
+        if path is None:
+            path = os.path.join(DEFAULT_CACHE_DIR, DEFAULT_CACHE_FILE)
+        self.__path = path
+
+    # end __init__()
+
+    @property
+    def path(self):
+        """
+        Returns the path to the file holding the cached tokens.
+        :return: str
+        """
+        return self.__path
+
+    # end path getter
+
+    @staticmethod
+    def key(url, user):
+        """
+        Builds the cache key for a cluster and user.
+        :param url: The cluster's base URL.
+            type: str
+            required: yes
+            default: none
+        :param user: The user logging into the cluster.
+            type: str
+            required: yes
+            default: none
+        :return: str
+        """
+        return '%s@%s' % (user, url)
+
+    # end key()
+
+    def __check__(self, path):
+        """
+        A hidden method that raises a TokenCacheError if a file is owned by another user or is accessible to anyone
+        other than its owner.  The check is skipped on systems without POSIX ownership.
+        :return: none
+        """
+        if not hasattr(os, 'getuid'):
+            return
+        info = os.stat(path)
+        if info.st_uid != os.getuid() or info.st_mode & INSECURE_MODE_BITS:
+            raise TokenCacheError('%s: %s: %s' % (INSECURE_CACHE, path, INSECURE_CACHE_RESOLUTION))
+
+    # end __check__()
+
+    def __lock__(self, lock_file, exclusive):
+        """
+        A hidden method that blocks until the lock file is held.  Windows has no shared locks, so every lock taken
+        there is exclusive.
+        :return: none
+        """
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, LOCK_BYTES)
+
+    # end __lock__()
+
+    def __unlock__(self, lock_file):
+        """
+        A hidden method that releases the lock file.
+        :return: none
+        """
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, LOCK_BYTES)
+
+    # end __unlock__()
+
+    def __open_lock__(self):
+        """
+        A hidden method that opens, creating if need be, the cache's directory and lock file.
+        :return: file object
+        """
+        directory = os.path.dirname(os.path.abspath(self.__path))
+        if not os.path.isdir(directory):
+            os.makedirs(directory, mode=CACHE_DIR_MODE, exist_ok=True)
+        lock_path = self.__path + LOCK_SUFFIX
+        fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, CACHE_FILE_MODE)
+        return os.fdopen(fd, 'r+')
+
+    # end __open_lock__()
+
+    def __read__(self):
+        """
+        A hidden method that reads every cached entry.  The caller must hold the lock.
+        :return: dict
+        """
+        if not os.path.exists(self.__path):
+            return {}
+        self.__check__(self.__path)
+        with open(self.__path, 'r') as cache:
+            try:
+                entries = json.load(cache)
+            except ValueError:
+                return {}  # a corrupt cache is simply rebuilt
+        if not isinstance(entries, dict):
+            return {}
+        return entries
+
+    # end __read__()
+
+    def __write__(self, entries):
+        """
+        A hidden method that atomically replaces the cache with the entries given.  The caller must hold the
+        exclusive lock.
+        :return: none
+        """
+        directory = os.path.dirname(os.path.abspath(self.__path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tokens')  # mkstemp creates the file with mode 0600
+        try:
+            with os.fdopen(fd, 'w') as tmp:
+                json.dump(entries, tmp)
+            os.replace(tmp_path, self.__path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    # end __write__()
+
+    def load(self, url, user):
+        """
+        Looks up the cached token for a cluster and user.
+        :param url: The cluster's base URL.
+            type: str
+            required: yes
+            default: none
+        :param user: The user logging into the cluster.
+            type: str
+            required: yes
+            default: none
+        :return: dict with keys token and issued, or None if no token is cached
+        """
+        if not os.path.exists(self.__path):
+            return None
+        with self.__open_lock__() as lock_file:
+            self.__lock__(lock_file, SHARED)
+            try:
+                return self.__read__().get(self.key(url, user))
+            finally:
+                self.__unlock__(lock_file)
+
+    # end load()
+
+    def store(self, url, user, token, issued=None):
+        """
+        Caches a token for a cluster and user, replacing any token cached for them before.
+        :param url: The cluster's base URL.
+            type: str
+            required: yes
+            default: none
+        :param user: The user logging into the cluster.
+            type: str
+            required: yes
+            default: none
+        :param token: The x-auth-token.
+            type: str
+            required: yes
+            default: none
+        :param issued: When the token was issued in seconds since the epoch.
+            type: float
+            required: no
+            default: now
+        :return: none
+        """
+        if issued is None:
+            issued = time.time()
+        with self.__open_lock__() as lock_file:
+            self.__lock__(lock_file, EXCLUSIVE)
+            try:
+                entries = self.__read__()
+                entries[self.key(url, user)] = {'token': token, 'issued': issued}
+                self.__write__(entries)
+            finally:
+                self.__unlock__(lock_file)
+
+    # end store()
+
+    def invalidate(self, url, user, token=None):
+        """
+        Removes the cached token for a cluster and user.  When a token is given, the entry is only removed if it still
+        holds that token, so a newer token cached by another process survives.
+        :param url: The cluster's base URL.
+            type: str
+            required: yes
+            default: none
+        :param user: The user logging into the cluster.
+            type: str
+            required: yes
+            default: none
+        :param token: The token known to be invalid.
+            type: str
+            required: no
+            default: None
+        :return: none
+        """
+        if not os.path.exists(self.__path):
+            return
+        with self.__open_lock__() as lock_file:
+            self.__lock__(lock_file, EXCLUSIVE)
+            try:
+                entries = self.__read__()
+                key = self.key(url, user)
+                entry = entries.get(key)
+                if entry is None or (token is not None and entry.get('token') != token):
+                    return
+                del entries[key]
+                self.__write__(entries)
+            finally:
+                self.__unlock__(lock_file)
+
+    # end invalidate()
+
+# end class TokenCache
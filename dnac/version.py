@@ -1,6 +1,7 @@
-from dnac import DnacError, \
-                 SUPPORTED_DNAC_VERSIONS, \
-                 UNSUPPORTED_DNAC_VERSION
+from dnac.routes import VERSION, \
+                        VERSION_SUB, \
+                        CONFIG_FILE_SUB, \
+                        resource_paths
 from dnac.dnacapi import DnacApi, \
                          DnacApiError
 from dnac.crud import OK, \
@@ -13,26 +14,11 @@ from dnac.task import Task
 
 MODULE = 'version.py'
 
-VERSION_RESOURCE_PATH = {
-    '1.2.10': '/api/v1/archive-config/network-device',
-    '1.3.0.2': '/api/v1/archive-config/network-device',
-    '1.3.0.3': '/api/v1/archive-config/network-device',
-    '1.3.1.3': '/api/v1/archive-config/network-device'
-}
-
-VERSION_SUB_RESOURCE_PATH = {
-    '1.2.10': '/version',
-    '1.3.0.2': '/version',
-    '1.3.0.3': '/version',
-    '1.3.1.3': '/version'
-}
-
-CONFIG_FILE_SUB_RESOURCE_PATH = {
-    '1.2.10': '/file',
-    '1.3.0.2': '/file',
-    '1.3.0.3': '/file',
-    '1.3.1.3': '/file'
-}
+VERSION_RESOURCE_PATH = resource_paths(VERSION)
+
+VERSION_SUB_RESOURCE_PATH = resource_paths(VERSION_SUB)
+
+CONFIG_FILE_SUB_RESOURCE_PATH = resource_paths(CONFIG_FILE_SUB)
 
 RUNNING_CONFIG = 'RUNNINGCONFIG'
 STARTUP_CONFIG = 'STARTUPCONFIG'
@@ -65,7 +51,8 @@ class Version(DnacApi):
                  device_id,
                  version_id,
                  verify=False,
-                 timeout=5):
+                 timeout=5,
+                 keep_results=False):
         """
         Instantiates a new Version object.
         :param dnac: A reference to the master script's Dnac object.
@@ -88,14 +75,15 @@ class Version(DnacApi):
             type: int
             required: no
             default: 5
+        :param keep_results: Flag indicating whether or not to keep the last raw API response in results.
+            type: bool
+            required: no
+            default: False
         """
-        if dnac.version in SUPPORTED_DNAC_VERSIONS:
-            path = '%s/%s%s/%s' % (VERSION_RESOURCE_PATH[dnac.version],
-                                  device_id,
-                                  VERSION_SUB_RESOURCE_PATH[dnac.version],
-                                  version_id)
-        else:
-            raise DnacError('__init__: %s: %s' % (UNSUPPORTED_DNAC_VERSION, dnac.version))
+        path = '%s/%s%s/%s' % (dnac.routes.path(VERSION),
+                              device_id,
+                              dnac.routes.path(VERSION_SUB),
+                              version_id)
         self.__id = version_id
         self.__device_id = device_id
         self.__config_files = {}  # key = fileType, value = File object
@@ -104,7 +92,8 @@ class Version(DnacApi):
                                       name,
                                       resource=path,
                                       verify=verify,
-                                      timeout=timeout)
+                                      timeout=timeout,
+                                      keep_results=keep_results)
         # load the version
         url = self.dnac.url + self.resource
         version, status = self.crud.get(url,
@@ -199,7 +188,7 @@ class Version(DnacApi):
             raise DnacApiError(MODULE, 'delete', task.progress, '', '', '', task.failure_reason, '')
         else:
             # remove self from Dnac.api{}
-            del self.dnac.api[self.name]
+            del self.dnac.api[Version, self.name]
 
     # end delete()
 
@@ -209,7 +198,7 @@ class Version(DnacApi):
         :param file_id: str
         :return: None
         """
-        url = '%s%s/%s/%s' % (self.dnac.url, self.resource, CONFIG_FILE_SUB_RESOURCE_PATH[self.dnac.version], file_id)
+        url = '%s%s/%s/%s' % (self.dnac.url, self.resource, self.dnac.routes.path(CONFIG_FILE_SUB), file_id)
         results, status = self.crud.delete(url, headers=self.dnac.hdrs)
         if status != OK:
             raise DnacApiError(MODULE, 'delete_config', REQUEST_NOT_OK, url, OK, status, ERROR_MSGS[status], '')
@@ -222,7 +211,8 @@ class Version(DnacApi):
                 if file_id == config_file.id:
                     del self.__config_files[config_file_type]
                     break
-            del self.dnac.api['file_%s' % file_id]
+            # the File may already be gone from Dnac.api, which holds Files weakly
+            self.dnac.api.pop((File, 'file_%s' % file_id), None)
 
     # end delete_config_file
 
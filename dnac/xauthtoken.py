@@ -1,6 +1,18 @@
 
+from dnac.tokencache import TokenCacheError
 import json
 import requests
+import threading
+import time
+
+# globals
+
+X_AUTH_TOKEN = 'X-Auth-Token'
+
+DEFAULT_TOKEN_LIFETIME = 3600  # Cisco DNAC tokens are good for about an hour
+DEFAULT_REFRESH_MARGIN = 300  # renew a token this many seconds before it expires
+REFRESH_RETRY_INTERVAL = 30  # wait before trying again when a background renewal fails
+NOT_ISSUED = 0
 
 # error messages
 INVALID_RESPONSE = "Invalid response to API call"
@@ -39,6 +51,17 @@ class XAuthToken(object):
     attribute, which is an instantiation of this class.  As necessary, use Dnac.get_new_token to refresh the
     x-auth-token value.
 
+    When the token expires, every API call in flight fails with a 401 at about the same time.  Their Crud objects each
+    call refresh with the token they used, and refresh makes sure only the first of them logs in again; the others
+    simply pick up the new token.
+
+    To avoid those failed calls altogether, XAuthToken records when each token was issued.  With auto_refresh set, a
+    background timer renews the token refresh_margin seconds before its lifetime ends.  Otherwise, refresh_if_due
+    renews it on demand; Dnac.hdrs calls it before building the headers of every API call.
+
+    Given a TokenCache, XAuthToken first looks for a token another process has already obtained and only logs in if
+    none is cached or the cached token is due for renewal.  Every new token it obtains is written back to the cache.
+
     Attributes:
         url: The base URL for contacting Cisco DNAC.
             type: str
@@ -75,6 +98,53 @@ class XAuthToken(object):
             type: dict
             default: none
             scope: protected
+        pool: The connection pool used to request a token.  If None, the
+              request opens its own connection.
+            type: ConnectionPool object
+            default: None
+            scope: protected
+        refreshes: The number of times the token was renewed after the
+                   first login, whether because of a 401 or because it was
+                   about to expire.
+            type: int
+            default: 0
+            scope: protected
+        issued: When the current token was issued, in seconds since the
+                epoch.
+            type: float
+            default: NOT_ISSUED
+            scope: protected
+        lifetime: The number of seconds a token remains valid.
+            type: int
+            default: DEFAULT_TOKEN_LIFETIME
+            scope: protected
+        refresh_margin: The number of seconds before expiry that a token
+                        is renewed.
+            type: int
+            default: DEFAULT_REFRESH_MARGIN
+            scope: protected
+        auto_refresh: Flag indicating whether or not a background timer
+                      renews the token before it expires.
+            type: bool
+            default: False
+            scope: protected
+        cache: The on-disk cache of tokens shared with other processes.
+            type: TokenCache object
+            default: None
+            scope: protected
+        cache_hits: The number of logins avoided by reusing a cached token.
+            type: int
+            default: 0
+            scope: protected
+        cache_misses: The number of times the cache held no usable token.
+            type: int
+            default: 0
+            scope: protected
+        version: A counter incremented every time the token changes so
+                 that copies of hdrs can tell when they are out of date.
+            type: int
+            default: 0
+            scope: protected
     """
 
     def __init__(self,
@@ -83,7 +153,12 @@ class XAuthToken(object):
                  content_type,
                  resource='/api/system/v1/auth/token',
                  verify=False,
-                 timeout=5):
+                 timeout=5,
+                 pool=None,
+                 lifetime=DEFAULT_TOKEN_LIFETIME,
+                 refresh_margin=DEFAULT_REFRESH_MARGIN,
+                 auto_refresh=False,
+                 cache=None):
         """
         The __init__ method initializes an XAuthToken object.  It takes a URL pointing to the Cisco DNAC cluster as
         well as both a BasicAuth and CType objects for constructing the token request.  When creating a Dnac object,
@@ -115,6 +190,26 @@ class XAuthToken(object):
             type: int
             default: 5
             required: no
+        :param pool: A connection pool shared with the Dnac object's API calls.
+            type: ConnectionPool object
+            default: None
+            required: no
+        :param lifetime: The number of seconds each token remains valid.
+            type: int
+            default: DEFAULT_TOKEN_LIFETIME
+            required: no
+        :param refresh_margin: The number of seconds before expiry to renew a token.
+            type: int
+            default: DEFAULT_REFRESH_MARGIN
+            required: no
+        :param auto_refresh: Flag indicating whether or not to renew tokens from a background timer.
+            type: bool
+            default: False
+            required: no
+        :param cache: A token cache shared with other processes logging into the same cluster.
+            type: TokenCache object
+            default: None
+            required: no
         """
         self.__url = url
         self.__bauth = basic_auth
@@ -124,6 +219,18 @@ class XAuthToken(object):
         self.__verify = verify
         self.__timeout = timeout
         self.__hdrs = {}
+        self.__pool = pool
+        self.__lock = threading.Lock()
+        self.__refreshes = 0
+        self.__issued = NOT_ISSUED
+        self.__lifetime = lifetime
+        self.__refresh_margin = refresh_margin
+        self.__auto_refresh = auto_refresh
+        self.__timer = None
+        self.__cache = cache
+        self.__cache_hits = 0
+        self.__cache_misses = 0
+        self.__version = 0
 
     # end __init__()
 
@@ -214,29 +321,291 @@ class XAuthToken(object):
         """
         Class method getToken causes the XAuthToken instance to send a request to the server for a new x-auth-token.
         The returned result gets stored in __token and then the function updates the object's __hdrs dictionary with
-        the new token's value before returning the token to the calling script.
+        the new token's value before returning the token to the calling script.  If a token cache is in use, a valid
+        token found there is used instead of logging in, and a newly issued token is saved to it.
         :return: str
         """
+        if self.__cache is not None:
+            entry = self.__cached__()
+            if entry is not None:
+                self.__cache_hits += 1
+                return self.__set_token__(entry['token'], entry['issued'])
+            self.__cache_misses += 1
         url = self.__url + self.__resource
         hdrs = {}
         hdrs.update(self.bauth.hdrs)
         hdrs.update(self.ctype.hdrs)
-        resp = requests.request('POST',
-                                url,
-                                headers=hdrs,
-                                verify=self.__verify,
-                                timeout=self.__timeout)
+        if self.__pool is not None:
+            resp = self.__pool.request('POST',
+                                       url,
+                                       headers=hdrs,
+                                       verify=self.__verify,
+                                       timeout=self.__timeout)
+        else:
+            resp = requests.request('POST',
+                                    url,
+                                    headers=hdrs,
+                                    verify=self.__verify,
+                                    timeout=self.__timeout)
         if resp.status_code != requests.codes.ok:
             raise XAuthTokenError(
                 'XAuthToken: getToken: %s: %s: %i: expected %i' %
                 (INVALID_RESPONSE, url, resp.status_code, requests.codes.ok)
                                   )
-        self.__token = str(json.loads(resp.text)['Token'])
-        self.__hdrs['X-Auth-Token'] = self.__token
-        return self.__token
+        token = self.__set_token__(str(json.loads(resp.text)['Token']), time.time())
+        if self.__cache is not None:
+            try:
+                self.__cache.store(self.__url, self.__bauth.user, token, self.__issued)
+            except (OSError, TokenCacheError):
+                pass  # the token is still good for this process
+        return token
 
     # end get_token()
 
+    def __set_token__(self, token, issued):
+        """
+        A hidden method that makes token the current x-auth-token and, if auto_refresh is set, schedules its renewal.
+        :return: str
+        """
+        self.__token = token
+        self.__issued = issued
+        self.__hdrs[X_AUTH_TOKEN] = self.__token
+        self.__version += 1
+        if self.__auto_refresh:
+            self.__schedule__(self.expires - self.__refresh_margin - time.time())
+        return self.__token
+
+    # end __set_token__()
+
+    def __cached__(self):
+        """
+        A hidden method that returns the cached entry for this cluster and user if its token is not yet due for
+        renewal.  An unreadable or untrusted cache is treated as empty.
+        :return: dict, or None
+        """
+        try:
+            entry = self.__cache.load(self.__url, self.__bauth.user)
+        except (OSError, TokenCacheError):
+            return None
+        if entry is None or entry.get('token') in (None, self.__token):
+            return None
+        if time.time() >= entry.get('issued', NOT_ISSUED) + self.__lifetime - self.__refresh_margin:
+            return None
+        return entry
+
+    # end __cached__()
+
+    @property
+    def version(self):
+        """
+        Get method version returns a counter that changes every time a new token is set.
+        :return: int
+        """
+        return self.__version
+
+    # end version getter
+
+    @property
+    def cache(self):
+        """
+        Get method cache returns the TokenCache shared with other processes, or None if tokens are not cached.
+        :return: TokenCache object
+        """
+        return self.__cache
+
+    # end cache getter
+
+    @property
+    def cache_hits(self):
+        """
+        Get method cache_hits returns the number of times a cached token was used instead of logging in.
+        :return: int
+        """
+        return self.__cache_hits
+
+    # end cache_hits getter
+
+    @property
+    def cache_misses(self):
+        """
+        Get method cache_misses returns the number of times the token cache held no usable token.
+        :return: int
+        """
+        return self.__cache_misses
+
+    # end cache_misses getter
+
+    @property
+    def refreshes(self):
+        """
+        Get method refreshes returns the number of times refresh replaced the token.
+        :return: int
+        """
+        return self.__refreshes
+
+    # end refreshes getter
+
+    @property
+    def issued(self):
+        """
+        Get method issued returns when the current token was issued in seconds since the epoch, or NOT_ISSUED if no
+        token has been requested yet.
+        :return: float
+        """
+        return self.__issued
+
+    # end issued getter
+
+    @property
+    def lifetime(self):
+        """
+        Get method lifetime returns the number of seconds a token remains valid.
+        :return: int
+        """
+        return self.__lifetime
+
+    # end lifetime getter
+
+    @property
+    def refresh_margin(self):
+        """
+        Get method refresh_margin returns the number of seconds before expiry that a token is renewed.
+        :return: int
+        """
+        return self.__refresh_margin
+
+    # end refresh_margin getter
+
+    @property
+    def auto_refresh(self):
+        """
+        Get method auto_refresh indicates whether or not a background timer renews the token.
+        :return: bool
+        """
+        return self.__auto_refresh
+
+    # end auto_refresh getter
+
+    @property
+    def expires(self):
+        """
+        Get method expires returns when the current token expires in seconds since the epoch.
+        :return: float
+        """
+        return self.__issued + self.__lifetime
+
+    # end expires getter
+
+    @property
+    def expired(self):
+        """
+        Get method expired indicates whether or not the current token has outlived its lifetime.
+        :return: bool
+        """
+        return time.time() >= self.expires
+
+    # end expired getter
+
+    @property
+    def due(self):
+        """
+        Get method due indicates whether or not the current token is within refresh_margin seconds of expiring.
+        :return: bool
+        """
+        return time.time() >= self.expires - self.__refresh_margin
+
+    # end due getter
+
+    def __schedule__(self, delay):
+        """
+        A hidden method that replaces any pending background renewal with one that runs in delay seconds.
+        :return: none
+        """
+        self.cancel()
+        self.__timer = threading.Timer(max(0, delay), self.__background_refresh__)
+        self.__timer.daemon = True
+        self.__timer.start()
+
+    # end __schedule__()
+
+    def __background_refresh__(self):
+        """
+        A hidden method run by the background timer to renew the token before it expires.  If Cisco DNAC cannot be
+        reached, it tries again after REFRESH_RETRY_INTERVAL seconds for as long as the token is still valid, after
+        which the next 401 renews the token instead.
+        :return: none
+        """
+        try:
+            self.refresh(self.__token)
+        except (XAuthTokenError, requests.exceptions.RequestException):
+            if self.expires - time.time() > REFRESH_RETRY_INTERVAL:
+                self.__schedule__(REFRESH_RETRY_INTERVAL)
+
+    # end __background_refresh__()
+
+    def cancel(self):
+        """
+        Class method cancel stops any pending background renewal.  The token itself remains usable and is renewed on
+        demand from then on.
+        :return: none
+        """
+        if self.__timer is not None:
+            self.__timer.cancel()
+            self.__timer = None
+
+    # end cancel()
+
+    def refresh_if_due(self):
+        """
+        Class method refresh_if_due renews the token if it is within refresh_margin seconds of expiring and otherwise
+        does nothing.  Concurrent callers share a single renewal.
+        :return: str
+        """
+        if self.__issued != NOT_ISSUED and self.due:
+            return self.refresh(self.__token)
+        return self.__token
+
+    # end refresh_if_due()
+
+    def refresh(self, stale_token):
+        """
+        Class method refresh replaces a token that Cisco DNAC rejected.  Callers pass the token their request was
+        sent with.  Only the first caller holding a given stale token requests a new one; any callers arriving at the
+        same time wait for it and then receive the new token without contacting Cisco DNAC themselves.
+        :param stale_token: The x-auth-token that was rejected.
+            type: str
+            required: yes
+            default: none
+        :return: str
+        """
+        with self.__lock:
+            if self.__token != stale_token:
+                # another caller already refreshed the token
+                return self.__token
+            if self.__cache is not None:
+                try:
+                    self.__cache.invalidate(self.__url, self.__bauth.user, stale_token)
+                except (OSError, TokenCacheError):
+                    pass
+            token = self.get_token()
+            self.__refreshes += 1
+            return token
+
+    # end refresh()
+
+    def connect(self):
+        """
+        Class method connect requests the first token unless one is already held.  Concurrent callers share a single
+        login.
+        :return: str
+        """
+        with self.__lock:
+            if not self.__token:
+                self.get_token()
+            return self.__token
+
+    # end connect()
+
     @property
     def hdrs(self):
         """
@@ -2,7 +2,7 @@
 from dnac import Dnac
 from dnac.config_archive import ConfigArchive
 from dnac.config_archive_settings import ConfigArchiveSettings
-from dnac.networkdevice import NetworkDevice
+from dnac.inventory import InventoryIndex
 from dnac.timestamp import TimeStamp
 from dnac.dnacapi import DnacApiError
 from bottle import Bottle, run, template, request
@@ -53,8 +53,7 @@ def manage_archive():
 @archiver.route('/manage_archive_configs', method='POST')
 def manage_archive_configs():
     host = request.forms.get('host')
-    device_api.get_device_by_name(host)
-    device_archive = config_archive.archive[device_api.devices['id']]
+    device_archive = config_archive.archive[device_api.get_device_by_name(host)['id']]
     return template('manage_archive_configs', dnac=dnac, host=host, device_archive=device_archive, timestamp=timestamp)
 
 
@@ -110,8 +109,7 @@ def add_new_device_archive_version():
 @archiver.route('/delete_device_archive_versions', method='POST')
 def delete_device_archive_versions():
     host = request.forms.get('host')
-    device_api.get_device_by_name(host)
-    device_archive = config_archive.archive[device_api.devices['id']]
+    device_archive = config_archive.archive[device_api.get_device_by_name(host)['id']]
     return template('delete_device_archive_versions', dnac=dnac, host=host,
                     device_archive=device_archive, timestamp=timestamp)
 
@@ -186,7 +184,7 @@ if __name__ == '__main__':
                 passwd='P@$$w0rd',
                 content_type='application/json')
     timestamp = TimeStamp()
-    device_api = NetworkDevice(dnac, 'deviceapi')
+    device_api = InventoryIndex(dnac, 'deviceapi')
     if bool(dnac.name):
         settings = ConfigArchiveSettings(dnac, dnac.name)
         config_archive = ConfigArchive(dnac, dnac.name)
@@ -1,8 +1,9 @@
-from dnac import Dnac
+from dnac import Dnac, connect_all
 from dnac.site import Site, STUB_SITE
 from dnac.networkdevice import NetworkDevice, STUB_DEVICE
 from dnac.dnacapi import DnacApiError
-from bottle import Bottle, run, template, request
+from dnac.metrics import MetricsRegistry, CONTENT_TYPE
+from bottle import Bottle, run, template, request, response
 import sys
 import json
 
@@ -15,6 +16,7 @@ DEVICE360_URI = '/dna/assurance/home#networkDevice/'
 
 clusters = []
 finder = Bottle()
+metrics = MetricsRegistry()  # API traffic to every cluster, scraped from /metrics
 
 
 def get_cluster(cluster_id):
@@ -49,6 +51,12 @@ def select_device():
     return template('select_device', clusters=clusters, method='GET')
 
 
+@finder.route('/metrics', method='GET')
+def scrape_metrics():
+    response.content_type = CONTENT_TYPE
+    return metrics.render()
+
+
 def get_site(device, cluster):
     details = device.get_device_detail_by_name(device.devices['id'])
     location = details['location']
@@ -167,7 +175,9 @@ if __name__ == '__main__':
                     port=cluster['port'],
                     user=cluster['user'],
                     passwd=cluster['passwd'],
-                    content_type=cluster['content_type'])
+                    content_type=cluster['content_type'],
+                    lazy=True,
+                    metrics=metrics)
         # create a stub site for adding new sites
         stub_site = Site(dnac, STUB_SITE)
         stub_site.timeout = 60  # my lab's DNAC server is responding slowly; others may not need this
@@ -176,4 +186,7 @@ if __name__ == '__main__':
         # add the new Dnac instance to the global clusters list
         clusters.append(dnac)
 
+    # log into all of the clusters at once
+    connect_all(clusters)
+
     run(finder, host='localhost', port=8088, reloader=True, debug=True)
\ No newline at end of file
@@ -1,4 +1,4 @@
-from dnac import Dnac
+from dnac import Dnac, connect_all
 from dnac.site import Site, STUB_SITE, AREA, BUILDING, FLOOR
 from dnac.site_hierarchy import SiteHierarchy, SITE_HIERARCHY_NAME
 from bottle import Bottle, run, template, request
@@ -214,11 +214,15 @@ if __name__ == '__main__':
                     port=cluster['port'],
                     user=cluster['user'],
                     passwd=cluster['passwd'],
-                    content_type=cluster['content_type'])
+                    content_type=cluster['content_type'],
+                    lazy=True)
         # create a stub site for adding new sites
         stub_site = Site(dnac, STUB_SITE)
         stub_site.timeout = 60  # my lab's DNAC server is responding slowly; others may not need this
         # add the new Dnac instance to the global clusters list
         clusters.append(dnac)
 
+    # log into all of the clusters at once
+    connect_all(clusters)
+
     run(replicator, host='localhost', port=8088, reloader=True, debug=True)
\ No newline at end of file
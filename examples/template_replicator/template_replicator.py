@@ -1,5 +1,5 @@
 from bottle import Bottle, run, template, request
-from dnac import Dnac
+from dnac import Dnac, connect_all
 from dnac.project import Project, STUB_PROJECT
 from dnac.template import Template, STUB_TEMPLATE
 import copy
@@ -383,12 +383,18 @@ if __name__ == '__main__':
                     port=cluster['port'],
                     user=cluster['user'],
                     passwd=cluster['passwd'],
-                    content_type=cluster['content_type'])
-        # create stub projects and templates in the cluster
-        Project(dnac, STUB_PROJECT)
-        Template(dnac, STUB_TEMPLATE)
+                    content_type=cluster['content_type'],
+                    lazy=True)
         # add the new Dnac instance to the global clusters list
         clusters.append(dnac)
 
+    # log into all of the clusters at once
+    connect_all(clusters)
+
+    # create stub projects and templates in each cluster
+    for dnac in clusters:
+        Project(dnac, STUB_PROJECT)
+        Template(dnac, STUB_TEMPLATE)
+
     run(replicator, host='localhost', port=8080, reloader=True, debug=True)
 
@@ -26,5 +26,6 @@ setuptools.setup(
         'Intended Audience :: Information Technology',
         'Intended Audience :: Telecommunications Industry'
     ],
-    install_requires=['requests', 'multi_key_dict']
+    install_requires=['requests', 'multi_key_dict'],
+    extras_require={'speedups': ['orjson']}
 )
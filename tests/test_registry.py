@@ -0,0 +1,136 @@
+
+from dnac.registry import ApiRegistry, \
+                          RegistryPolicy, \
+                          LRU, \
+                          WEAK_POLICY
+import gc
+import unittest
+
+# globals
+
+MODULE = 'test_registry.py'
+
+NAME = 'Global/Austin'
+
+
+# stand-ins for the DnacApi classes; the registry only looks at their class names and UUID attributes
+class Site(object):
+
+    def __init__(self, id=None):
+        self.id = id
+
+# end class Site
+
+
+class Template(object):
+
+    def __init__(self, template_id=None):
+        self.template_id = template_id
+
+# end class Template
+
+
+class Task(object):
+
+    def __init__(self, id=None):
+        self.id = id
+
+# end class Task
+
+
+class CommandRunnerTask(Task):
+    pass
+
+# end class CommandRunnerTask
+
+
+class TestApiRegistryNamespaces(unittest.TestCase):
+    """
+    Objects of different classes may share a name without replacing one another.
+    """
+
+    def setUp(self):
+        self.registry = ApiRegistry()
+        self.site = Site('site-uuid')
+        self.template = Template('template-uuid')
+        self.registry[NAME] = self.site
+        self.registry[NAME] = self.template
+
+    def test_colliding_name_keeps_both_objects(self):
+        self.assertIs(self.registry.find(Site, NAME), self.site)
+        self.assertIs(self.registry.find(Template, NAME), self.template)
+        self.assertEqual(self.registry.of_type(Site), {NAME: self.site})
+        self.assertEqual(self.registry.of_type(Template), {NAME: self.template})
+
+    def test_plain_name_finds_the_newest_object(self):
+        self.assertIs(self.registry[NAME], self.template)
+        self.assertEqual(list(self.registry), [NAME])
+        self.assertEqual(len(self.registry), 1)
+
+    def test_class_and_name_key(self):
+        self.assertIs(self.registry[Site, NAME], self.site)
+        self.assertIs(self.registry['Template', NAME], self.template)
+        self.assertIn((Site, NAME), self.registry)
+        self.assertNotIn((Task, NAME), self.registry)
+
+    def test_uuid_index_covers_both_objects(self):
+        self.assertIs(self.registry.by_id('site-uuid', Site), self.site)
+        self.assertIs(self.registry.by_id('template-uuid'), self.template)
+
+    def test_same_class_replaces(self):
+        site = Site('other-uuid')
+        self.registry[NAME] = site
+        self.assertIs(self.registry.find(Site, NAME), site)
+        self.assertIsNone(self.registry.by_id('site-uuid'))
+        self.assertIs(self.registry.find(Template, NAME), self.template)
+
+    def test_delete_plain_name_removes_only_the_newest(self):
+        del self.registry[NAME]
+        self.assertIsNone(self.registry.find(Template, NAME))
+        self.assertIs(self.registry[NAME], self.site)
+        del self.registry[Site, NAME]
+        self.assertNotIn(NAME, self.registry)
+        self.assertEqual(len(self.registry), 0)
+
+    def test_subclass_found_by_base_class(self):
+        task = CommandRunnerTask('task-uuid')
+        self.registry['task_1'] = task
+        self.assertIs(self.registry.find(Task, 'task_1'), task)
+        self.assertIs(self.registry[Task, 'task_1'], task)
+
+    def test_reindex_picks_the_class(self):
+        self.site.id = 'new-site-uuid'
+        self.registry.reindex(NAME, Site)
+        self.assertIs(self.registry.by_id('new-site-uuid'), self.site)
+        self.assertIsNone(self.registry.by_id('site-uuid'))
+
+# end class TestApiRegistryNamespaces
+
+
+class TestApiRegistryPolicies(unittest.TestCase):
+    """
+    Weak and LRU policies release objects without disturbing others by the same name.
+    """
+
+    def test_weak_object_released(self):
+        registry = ApiRegistry(policies={'Task': WEAK_POLICY})
+        site = Site()
+        registry['shared'] = site
+        registry['shared'] = Task()
+        gc.collect()
+        self.assertIs(registry['shared'], site)
+        self.assertIsNone(registry.find(Task, 'shared'))
+
+    def test_lru_evicts_oldest(self):
+        registry = ApiRegistry(policies={'Site': RegistryPolicy(LRU, max_size=2)})
+        sites = [Site() for i in range(3)]
+        for i, site in enumerate(sites):
+            registry['site_%i' % i] = site
+        self.assertNotIn('site_0', registry)
+        self.assertEqual(sorted(registry), ['site_1', 'site_2'])
+
+# end class TestApiRegistryPolicies
+
+
+if __name__ == '__main__':
+    unittest.main()